@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the search request construction from search criteria.
+
+Usage: python -m pytest benchmarks [--save-baselines] [--tolerance 0.5]
+"""
+
+import pytest
+import requests
+
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+SEARCH_URL = "https://www.sharewood.tv/torrents"
+
+CRITERIA = {
+    "query": ShareWoodSearchCriteria(query="Ubuntu 22.04"),
+    "full": ShareWoodSearchCriteria(
+        query="Ubuntu 22.04",
+        description="desktop",
+        uploader="linuxfan",
+        tags="linux,iso",
+        categories={"Applications": True, "Vidéos": True},
+        subcategories={"Application Linux": True},
+        languages={"Français": True, "Anglais": True},
+        types={"freeleech": True},
+        sorting="seeders",
+        direction="desc",
+        quantity=100,
+    ),
+}
+
+
+@pytest.mark.parametrize("criteria", list(CRITERIA))
+def bench_search_request(benchmark, criteria):
+    """Criteria to prepared HTTP request of the torrents listing"""
+    search_criteria = CRITERIA[criteria]
+
+    request = benchmark(
+        lambda: requests.Request("GET", SEARCH_URL, params=search_criteria.to_query_params()).prepare()
+    )
+
+    assert request.url.startswith(f"{SEARCH_URL}?")
+
+
+@pytest.mark.parametrize("criteria", list(CRITERIA))
+def bench_cache_key(benchmark, criteria):
+    """Criteria to search results cache key"""
+    assert len(benchmark(CRITERIA[criteria].cache_key)) == 64
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of search results and torrent pages parsing, per parser backend,
+over recorded listings of 25, 50 and 100 rows and batches of torrent pages.
+
+Usage: python -m pytest benchmarks [--save-baselines] [--tolerance 0.5]
+"""
+
+import pytest
+from conftest import read_fixture
+
+from sharewoodautomator.sharewoodparser import PARSERS, get_parser
+from sharewoodautomator.sharewoodsearch import ShareWoodSearch
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+from sharewoodautomator.sharewoodtorrentscraper import ShareWoodTorrentScraper
+
+# Number of rows of the recorded listings, and of torrent pages per batch
+SIZES = (25, 50, 100)
+
+
+class RecordedPageScraper(ShareWoodTorrentScraper):
+    """Scraper serving the recorded torrent page instead of fetching it"""
+
+    def __init__(self, html: str, parser_name: str) -> None:
+        super().__init__(browser=None, parser=get_parser(parser_name))
+        self.html = html
+
+    def fetch_page(self, url: str) -> str:
+        return self.html
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("parser_name", list(PARSERS))
+def bench_parse_search_result(benchmark, parser_name, size):
+    """Listing HTML to ShareWoodTorrent list"""
+    html = read_fixture(f"search_results_{size}.html")
+    searcher = ShareWoodSearch(browser=None, search_url="", timeout=0, parser=get_parser(parser_name))
+
+    torrents = benchmark(searcher.parse_search_result, html)
+
+    assert len(torrents) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("parser_name", list(PARSERS))
+def bench_scrape(benchmark, parser_name, size):
+    """Torrent pages parsing and filling, page fetch excluded"""
+    scraper = RecordedPageScraper(read_fixture("torrent_detail.html"), parser_name)
+    torrents = [ShareWoodTorrent(url=f"https://www.sharewood.tv/torrents/torrent-{i}.{i}") for i in range(size)]
+
+    def scrape_all():
+        for torrent in torrents:
+            scraper.scrape(torrent)
+
+    benchmark(scrape_all)
+
+    assert all(torrent.hash == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0" for torrent in torrents)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the local ranking of merged search results.
+
+Usage: python -m pytest benchmarks [--save-baselines] [--tolerance 0.5]
+"""
+
+import pytest
+
+from sharewoodautomator.sharewoodresultset import ShareWoodResultSet
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+CATEGORIES = ("Films", "Séries", "Applications", "Musique")
+
+
+def make_results(size: int) -> ShareWoodResultSet:
+    """Result set of `size` torrents with spread counters, some missing"""
+    return ShareWoodResultSet.from_torrents(
+        ShareWoodTorrent(
+            url=f"https://www.sharewood.tv/torrents/torrent-{i}.{i}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            size=(i * 7919 % 4096 + 1) * 1024 ** 2,
+            seeders=i * 37 % 500 if i % 20 else None,
+            leechers=i * 11 % 40,
+        )
+        for i in range(size)
+    )
+
+
+RESULTS = {size: make_results(size) for size in (1000, 5000)}
+
+
+@pytest.mark.parametrize("size", list(RESULTS))
+def bench_rank(benchmark, size):
+    """Filter then multi-key sort of merged results"""
+    results = RESULTS[size]
+
+    ranked = benchmark(lambda: results.filter(size=(None, 2 * 1024 ** 3)).sort("-seeders", "size"))
+
+    assert 0 < len(ranked) < size
+
+
+@pytest.mark.parametrize("size", list(RESULTS))
+def bench_top(benchmark, size):
+    """Top 10 most seeded torrents of each category"""
+    results = RESULTS[size]
+
+    best = benchmark(lambda: {category: rows.top(10, "-seeders") for category, rows in results.group_by("category").items()})
+
+    assert len(best) == len(CATEGORIES)
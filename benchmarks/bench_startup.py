@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the command-line cold start, each run in a fresh interpreter.
+
+Usage: python -m pytest benchmarks [--save-baselines] [--tolerance 0.5]
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+COMMANDS = {
+    "import": ["-c", "import sharewoodautomator"],
+    "import_automator": ["-c", "from sharewoodautomator import ShareWoodAutomator"],
+    "version": ["-m", "sharewoodautomator", "--version"],
+}
+
+
+@pytest.mark.parametrize("command", list(COMMANDS))
+def bench_cold_start(benchmark, command):
+    """Interpreter start, package import and command, as a cron job runs it"""
+    args = [sys.executable, *COMMANDS[command]]
+
+    result = benchmark(subprocess.run, args, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+
+    assert result.returncode == 0
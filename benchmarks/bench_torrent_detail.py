@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of torrent page information table extraction.
+
+Compares the single-pass extractor of ShareWoodSoupParser with the previous
+extraction, which ran one select_one() from the document root per field, on
+the recorded torrent page, then the full page parsing of each installed
+parser backend.
+
+Usage: python benchmarks/bench_torrent_detail.py [repeat]
+"""
+
+import os
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sharewoodautomator.sharewoodparser import PARSERS, ShareWoodSoupParser  # noqa: E402
+
+# Recorded torrent page
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures", "torrent_detail.html")
+
+# Previous extraction: one selector from the document root per field
+ROW = "#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child({}) > td:nth-child(2)"
+LEGACY_SELECTORS = {
+    "discounts": (ROW.format(1) + " > span > i", None),
+    "fastline_credit_url": (ROW.format(2) + " > a[href]", "href"),
+    "uploader_profile": (ROW.format(3) + " > a[href]", "href"),
+    "age": (ROW.format(4), None),
+    "size": (ROW.format(5), None),
+    "ratio": (ROW.format(6), None),
+    "category": (ROW.format(7), None),
+    "subcategory": (ROW.format(8), None),
+    "tags": (ROW.format(9), None),
+    "languages": (ROW.format(10), None),
+    "resolution": (ROW.format(11), None),
+    "three_d_flag": (ROW.format(12), None),
+    "hash": (ROW.format(13), None),
+    "seeders": (ROW.format(14) + " > span.badge-extra.text-green", None),
+    "leechers": (ROW.format(15) + " > span.badge-extra.text-red", None),
+    "completed": (ROW.format(16) + " > span.badge-extra.text-info", None),
+}
+
+
+def legacy_extract(soup: BeautifulSoup) -> dict:
+    """Previous extraction, one select_one() per field"""
+    values = {}
+    for name, (selector, attribute) in LEGACY_SELECTORS.items():
+        element = soup.select_one(selector)
+        if element is None:
+            values[name] = None
+        else:
+            values[name] = element[attribute] if attribute else element.text
+    return values
+
+
+def main() -> int:
+    """Run the benchmark and print timings"""
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with open(FIXTURE, encoding="utf-8") as fixture:
+        html = fixture.read()
+    soup = BeautifulSoup(html, "html.parser")
+    parser = ShareWoodSoupParser()
+
+    # Both extractions must agree before comparing them
+    if legacy_extract(soup) != parser.parse_info_table(soup):
+        print("Extractions differ", file=sys.stderr)
+        return 1
+
+    legacy = min(timeit.repeat(lambda: legacy_extract(soup), number=repeat, repeat=5)) / repeat
+    single_pass = min(timeit.repeat(lambda: parser.parse_info_table(soup), number=repeat, repeat=5)) / repeat
+
+    print(f"select_one per field : {legacy * 1e6:8.1f} us/page")
+    print(f"single-pass          : {single_pass * 1e6:8.1f} us/page ({legacy / single_pass:.1f}x faster)")
+
+    # Full page parsing (HTML to values) per parser backend
+    for name, parser_class in PARSERS.items():
+        backend = parser_class()
+        full_parse = min(timeit.repeat(lambda: backend.parse_torrent_page(html), number=repeat, repeat=5)) / repeat
+        print(f"full parse {name:<11}: {full_parse * 1e6:8.1f} us/page")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
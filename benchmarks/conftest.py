@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Timing fixture of the benchmark suite.
+
+Each benchmark times its function with timeit, then divides the best time
+per call by the time of a fixed reference workload measured just before,
+so that scores compare across machines and busy periods. Scores are
+compared with the baselines stored in baselines.json, a benchmark slower
+than its baseline by more than the tolerance fails as a regression.
+"""
+
+import json
+import os
+import sys
+import timeit
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Stored score of each benchmark, best time per call in reference workload units
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Directory of recorded ShareWood.tv pages
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures")
+
+
+def read_fixture(name: str) -> str:
+    """Read a recorded page from the fixtures directory"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def reference_time(repeat: int) -> float:
+    """Best time of the fixed reference workload, in seconds"""
+    timer = timeit.Timer("sorted(str(i) for i in range(2000))")
+    return min(timer.repeat(repeat=repeat, number=20)) / 20
+
+
+def pytest_addoption(parser):
+    """Benchmark options"""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--save-baselines",
+        action="store_true",
+        help="Store the timings of this run as the new baselines",
+    )
+    group.addoption(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Slowdown over the baseline reported as a regression (default: 0.5, 50%%)",
+    )
+    group.addoption(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timing runs, the best one is kept (default: 5)",
+    )
+
+
+def pytest_configure(config):
+    """Load the stored baselines"""
+    config.benchmark_timings = {}
+    config.benchmark_baselines = {}
+    if os.path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE, encoding="utf-8") as baselines_file:
+            config.benchmark_baselines = json.load(baselines_file)
+
+
+@pytest.fixture
+def benchmark(request) -> Callable[..., Any]:
+    """Fixture timing a function, failing if it regressed from its baseline"""
+    config = request.config
+    name = request.node.name
+
+    def run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # First call warms up caches and gives the result to check
+        result = func(*args, **kwargs)
+
+        timer = timeit.Timer(lambda: func(*args, **kwargs))
+        # Enough calls per run to last 0.2 second
+        number, _ = timer.autorange()
+        repeat = config.getoption("repeat")
+
+        def measure() -> Tuple[float, float]:
+            reference = reference_time(repeat)
+            best = min(timer.repeat(repeat=repeat, number=number)) / number
+            return best, best / reference
+
+        best, score = measure()
+        baseline = config.benchmark_baselines.get(name)
+        limit = baseline * (1 + config.getoption("tolerance")) if baseline else None
+        # Measure again before reporting a regression, a busy machine slows a single run
+        if limit and score > limit:
+            best, score = min((best, score), measure(), key=lambda timing: timing[1])
+        config.benchmark_timings[name] = (best, score)
+
+        if limit and not config.getoption("save_baselines") and score > limit:
+            pytest.fail(f"{name} regressed: score {score:.3f}, baseline {baseline:.3f}")
+
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report timings against baselines, storing them if asked"""
+    timings: Dict[str, Tuple[float, float]] = config.benchmark_timings
+    if not timings:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, (best, score) in sorted(timings.items()):
+        baseline = config.benchmark_baselines.get(name)
+        change = f"{(score / baseline - 1) * 100:+7.1f}%" if baseline else "    new"
+        terminalreporter.write_line(f"{name:<45} {best * 1e6:12.1f} us/call {score:10.3f} {change}")
+
+    if config.getoption("save_baselines"):
+        baselines = dict(config.benchmark_baselines, **{name: score for name, (_, score) in timings.items()})
+        with open(BASELINES_FILE, "w", encoding="utf-8") as baselines_file:
+            json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write("\n")
+        terminalreporter.write_line(f"Baselines saved to {BASELINES_FILE}")
@@ -3,13 +3,87 @@
 
 """
 ShareWoodAutomator package provides classes to automate ShareWood.tv website.
+
+Classes are imported on first access, so that importing the package, or
+running a command that needs no browser, does not load Selenium.
 """
 
+import importlib
+import sys
+from typing import Any, List
+
 __version__ = "0.1.0"
 
-from .sharewoodautomator import ShareWoodAutomator
-from .sharewoodlogging import ShareWoodLogging
-from .sharewoodsearch import ShareWoodSearch
-from .sharewoodsearchcriteria import ShareWoodSearchCriteria
-from .sharewoodtorrent import ShareWoodTorrent
-from .sharewoodtorrentscraper import ShareWoodTorrentScraper
+# Module of each exported class
+_EXPORTS = {
+    "ShareWoodApi": "sharewoodapi",
+    "ShareWoodAutomator": "sharewoodautomator",
+    "ShareWoodBatchResult": "sharewoodbatch",
+    "ShareWoodDetailCache": "sharewoodcache",
+    "ShareWoodSearchCache": "sharewoodcache",
+    "ShareWoodDownloadReport": "sharewooddownloader",
+    "ShareWoodDownloadResult": "sharewooddownloader",
+    "ShareWoodTorrentDownloader": "sharewooddownloader",
+    "ShareWoodDriverPool": "sharewooddriverpool",
+    "ShareWoodDriverCache": "sharewooddriverresolver",
+    "ShareWoodDriverResolver": "sharewooddriverresolver",
+    "ShareWoodHttpSearch": "sharewoodhttpsearch",
+    "ShareWoodHttpSession": "sharewoodhttpsession",
+    "ShareWoodIndex": "sharewoodindex",
+    "ShareWoodJob": "sharewoodjobqueue",
+    "ShareWoodJobQueue": "sharewoodjobqueue",
+    "ShareWoodLogging": "sharewoodlogging",
+    "ShareWoodJsonSink": "sharewoodmetrics",
+    "ShareWoodMetrics": "sharewoodmetrics",
+    "ShareWoodPrometheusSink": "sharewoodmetrics",
+    "ShareWoodHtmlParser": "sharewoodparser",
+    "ShareWoodLxmlParser": "sharewoodparser",
+    "ShareWoodSoupParser": "sharewoodparser",
+    "ShareWoodResultSet": "sharewoodresultset",
+    "ShareWoodSearch": "sharewoodsearch",
+    "ShareWoodSearchCriteria": "sharewoodsearchcriteria",
+    "ShareWoodClient": "sharewoodserver",
+    "ShareWoodServer": "sharewoodserver",
+    "ShareWoodSessionStore": "sharewoodsessionstore",
+    "ShareWoodTorrent": "sharewoodtorrent",
+    "ShareWoodScrapeResult": "sharewoodtorrentscraper",
+    "ShareWoodTorrentScraper": "sharewoodtorrentscraper",
+    "ShareWoodWait": "sharewoodwait",
+    "ShareWoodWorker": "sharewoodworker",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import an exported class on first access
+
+    Args:
+        name: Name of the class
+
+    Returns:
+        type: Exported class, also set on the package for the next accesses
+
+    Raises:
+        AttributeError: If the name is not exported
+    """
+
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    """ Exported names, imported or not """
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+# Module __getattr__ needs Python 3.7, older versions import every class now
+if sys.version_info < (3, 7):  # pragma: no cover
+    for _name in _EXPORTS:
+        __getattr__(_name)
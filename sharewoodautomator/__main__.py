@@ -4,18 +4,39 @@
 """
 Command-line interface for ShareWoodAutomator.
 Provides functionality to search, scrape, and download torrents from ShareWood.tv.
+
+The automator is imported once the arguments are parsed, and the browser is
+only started, and logged in, by commands that need it: --version, help,
+local searches and cache commands start fast enough for cron jobs.
+
+When a server started by the serve command listens on SERVER_SOCKET, commands
+are forwarded to its logged-in automator instead of starting their own.
+
+Large crawls are queued in JOB_QUEUE_FILE by the queue command, and run by
+as many worker processes as needed, each with its own automator.
 """
 
 import argparse
 import os
+import signal
 import sys
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+from .exceptions import ShareWoodAuthenticationError, ShareWoodError
+
+# Commands answered from local files, without login
+LOCAL_COMMANDS = ("cache",)
+
+# Default socket of the serve command
+DEFAULT_SERVER_SOCKET = "~/.sharewoodautomator/automator.sock"
 
-from . import ShareWoodAutomator, ShareWoodSearchCriteria, __version__
+# Default job queue of the queue and worker commands
+DEFAULT_JOB_QUEUE_FILE = "~/.sharewoodautomator/jobs.sqlite"
 
 
-def parse_arguments() -> argparse.Namespace:
-    """Parse command-line arguments."""
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments (default: sys.argv)."""
     parser = argparse.ArgumentParser(
         prog="sharewoodautomator",
         description="Automate interactions with ShareWood.tv",
@@ -40,6 +61,54 @@ def parse_arguments() -> argparse.Namespace:
         help="Run browser in visible mode",
     )
 
+    parser.add_argument(
+        "--no-lean",
+        action="store_false",
+        dest="lean",
+        default=None,
+        help="Load images, stylesheets and fonts, and wait for complete page loads (default: BROWSER_LEAN)",
+    )
+
+    parser.add_argument(
+        "--backend",
+        choices=["api", "browser", "http"],
+        default=None,
+        help="Search backend: api (passkey API), browser (Selenium) or http (pooled HTTP session) "
+        "(default: api if SHAREWOOD_PASSKEY is set, else browser)",
+    )
+
+    parser.add_argument(
+        "--no-persist-session",
+        action="store_false",
+        dest="persist_session",
+        help="Do not reuse or save the login session between runs",
+    )
+
+    parser.add_argument(
+        "--logout",
+        action="store_true",
+        help="Log out at the end of the command, even when the login session is persisted",
+    )
+
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help=f"Unix socket of the serve command (default: SERVER_SOCKET or {DEFAULT_SERVER_SOCKET})",
+    )
+
+    parser.add_argument(
+        "--queue",
+        default=None,
+        help=f"Job queue file of the queue and worker commands (default: JOB_QUEUE_FILE or {DEFAULT_JOB_QUEUE_FILE})",
+    )
+
+    parser.add_argument(
+        "--no-server",
+        action="store_false",
+        dest="server",
+        help="Run the command in this process, even when a server is listening",
+    )
+
     # Subparsers for different commands
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     subparsers.required = True
@@ -90,19 +159,122 @@ def parse_arguments() -> argparse.Namespace:
         help="Number of results to return (default: 25)",
     )
 
+    search_parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=None,
+        help="Seconds search results stay cached (default: SEARCH_CACHE_TTL or 900)",
+    )
+    search_parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Do not read nor write the search results cache",
+    )
+    search_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results and cache the new ones",
+    )
+    search_parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Search the local index of already seen torrents, offline and without login",
+    )
+
+    # Crawl command
+    crawl_parser = subparsers.add_parser("crawl", help="List torrents uploaded since the last crawl")
+    crawl_parser.add_argument(
+        "query", nargs="?", default=None, help="Search query narrowing the crawl (default: every torrent)"
+    )
+    crawl_parser.add_argument(
+        "--max-results",
+        type=int,
+        default=100,
+        help="Maximum number of torrents of a first crawl (default: 100)",
+    )
+
+    # Cache command
+    cache_parser = subparsers.add_parser("cache", help="Inspect or clear the local caches and index")
+    cache_parser.add_argument(
+        "action", choices=["stats", "clear"], help="Print the number of entries, or delete them"
+    )
+    cache_parser.add_argument(
+        "--only",
+        choices=["search", "detail", "index"],
+        default=None,
+        help="Cache to act on (default: every cache and the index)",
+    )
+
     # Download command
-    download_parser = subparsers.add_parser("download", help="Download a torrent")
+    download_parser = subparsers.add_parser("download", help="Download torrents")
     download_parser.add_argument(
-        "url", help="URL of the torrent to download"
+        "urls", nargs="+", metavar="url", help="URL of the torrents to download"
     )
     download_parser.add_argument(
         "--output",
         "-o",
-        help="Directory to save the downloaded torrent (default: ./downloads)",
-        default="./downloads",
+        help="Directory to save the downloaded torrents (default: DOWNLOAD_PATH)",
+        default=None,
+    )
+    download_parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Number of torrents downloaded at once (default: DOWNLOAD_CONCURRENCY)",
+    )
+    download_parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Download torrents already saved in the output directory",
+    )
+
+    # Queue command
+    queue_parser = subparsers.add_parser("queue", help="Queue searches and scrapes for the workers, or inspect the queue")
+    queue_parser.add_argument(
+        "action",
+        choices=["stats", "search", "scrape", "retry", "clear"],
+        help="Print the number of jobs of each status, queue searches or scrapes, queue failed jobs again, or delete every job",
+    )
+    queue_parser.add_argument(
+        "values",
+        nargs="*",
+        metavar="value",
+        help="Queries or listing query strings (e.g. 'categories[]=Vidéos&sort=seeders') to search, or URLs to scrape",
+    )
+
+    # Worker command
+    worker_parser = subparsers.add_parser("worker", help="Run queued searches and scrapes, alongside other workers")
+    worker_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="Stop after this number of jobs (default: never)",
+    )
+    worker_parser.add_argument(
+        "--idle-exit",
+        type=float,
+        default=None,
+        help="Stop once no job was available for this number of seconds (default: never)",
+    )
+    worker_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Jobs leased at once, their scrapes run in parallel (default: BROWSER_POOL_SIZE)",
+    )
+    worker_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Scrape pages even if their cached details are fresh",
+    )
+
+    # Serve command
+    subparsers.add_parser(
+        "serve",
+        help="Keep a logged-in automator running, answering the commands of this machine through a Unix socket",
     )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def process_comma_separated_list(value: Optional[str], options: Dict[str, bool]) -> Dict[str, bool]:
@@ -119,18 +291,84 @@ def process_comma_separated_list(value: Optional[str], options: Dict[str, bool])
     return result
 
 
-def main() -> int:
-    """Main entry point for the application."""
-    args = parse_arguments()
+def needs_login(args: argparse.Namespace, search_backend: Optional[str] = None) -> bool:
+    """Whether the command talks to ShareWood.tv, and so needs to log in."""
+    if args.command in LOCAL_COMMANDS:
+        return False
+    # Passkey API searches need no login
+    if args.command in ("search", "crawl") and search_backend == "api":
+        return False
+    return not (args.command == "search" and args.local)
 
-    try:
-        # Create automator instance
-        automator = ShareWoodAutomator(headless=args.headless)
 
-        # Connect to ShareWood.tv
-        automator.connect()
+def server_socket(args: argparse.Namespace) -> str:
+    """Path of the server socket, empty if forwarding is disabled."""
+    if args.socket is not None:
+        return args.socket
+
+    # Read without importing the automator, --version must stay fast
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv("SERVER_SOCKET", DEFAULT_SERVER_SOCKET)
+
+
+def create_queue(args: argparse.Namespace) -> Any:
+    """Open the job queue of the queue and worker commands."""
+    from dotenv import load_dotenv
+
+    from .sharewoodjobqueue import ShareWoodJobQueue
+
+    load_dotenv()
+    return ShareWoodJobQueue(
+        path=args.queue or os.getenv("JOB_QUEUE_FILE", DEFAULT_JOB_QUEUE_FILE),
+        lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "300")),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+    )
+
+
+def create_automator(args: argparse.Namespace) -> Any:
+    """Create the automator of the command, the browser is started on first use."""
+    from . import ShareWoodAutomator
+
+    return ShareWoodAutomator(
+        headless=args.headless,
+        lean=args.lean,
+        search_backend=args.backend,
+        persist_session=args.persist_session,
+        search_cache=getattr(args, "use_cache", args.command in ("cache", "serve", "worker")),
+        cache_ttl=getattr(args, "cache_ttl", None),
+    )
+
 
-        if args.command == "search":
+def run_command(args: argparse.Namespace, automator: Any, relogin: bool = False) -> int:
+    """Run a command with a connected automator, printing its results.
+
+    With relogin, a command failing on an expired session logs in again and
+    runs once more, as the long-lived server session eventually expires.
+    """
+    from . import ShareWoodSearchCriteria, ShareWoodTorrent
+    from .sharewoodnormalize import format_size
+
+    try:
+        if args.command == "cache":
+            stores = {
+                "search": automator.search_cache,
+                "detail": automator.detail_cache,
+                "index": automator.index,
+            }
+            for name, store in stores.items():
+                if args.only not in (None, name):
+                    continue
+                if store is None:
+                    print(f"{name}: disabled")
+                elif args.action == "clear":
+                    store.clear()
+                    print(f"{name}: cleared")
+                else:
+                    print(f"{name}: {len(store)} entries ({store.path})")
+
+        elif args.command == "search":
             # Process category flags
             categories = process_comma_separated_list(
                 args.categories, ShareWoodSearchCriteria().categories
@@ -157,31 +395,269 @@ def main() -> int:
             )
 
             # Perform search
-            results = automator.search(criteria)
+            results = automator.search(
+                criteria,
+                use_cache=args.use_cache,
+                refresh=args.refresh,
+                source="local" if args.local else "remote",
+            )
             print(f"Found {len(results)} results for '{args.query}'")
             for i, result in enumerate(results, 1):
-                print(f"{i}. {result.title} - Seeders: {result.seeders}, Size: {result.size}")
+                print(f"{i}. {result.title} - Seeders: {result.seeders}, Size: {format_size(result.size)}")
+
+        elif args.command == "crawl":
+            # List new torrents, newest first
+            count = 0
+            for count, torrent in enumerate(
+                automator.crawl(ShareWoodSearchCriteria(query=args.query), max_results=args.max_results), 1
+            ):
+                print(f"{count}. {torrent.title} - {torrent.url}")
+            print(f"{count} new torrents")
 
         elif args.command == "download":
-            # Create output directory if it doesn't exist
-            os.makedirs(args.output, exist_ok=True)
-            
-            # Download torrent
-            automator.download(args.url)
-            print(f"Downloaded torrent to {args.output}")
-
-    except (ConnectionError, ValueError, OSError) as e:
+            # Download torrents
+            report = automator.download_many(
+                [ShareWoodTorrent(url=url) for url in args.urls],
+                download_path=args.output,
+                concurrency=args.concurrency,
+                overwrite=args.overwrite,
+            )
+            # Downloads redirected to the login page, the files saved are skipped when run again
+            expired = [result.error for result in report.results if isinstance(result.error, ShareWoodAuthenticationError)]
+            if relogin and expired:
+                raise expired[0]
+            for result in report.results:
+                if result.ok:
+                    print(f"{'Skipped' if result.skipped else 'Downloaded'} {result.path}")
+                else:
+                    print(f"Failed {result.torrent.url}: {result.error}", file=sys.stderr)
+            print(report)
+            if report.failed:
+                return 1
+
+    except ShareWoodAuthenticationError as e:
+        if not (relogin and needs_login(args, automator.search_backend)):
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        try:
+            automator.reconnect()
+        except (ShareWoodError, ConnectionError, ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return run_command(args, automator)
+
+    except (ShareWoodError, ConnectionError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def run_queue(args: argparse.Namespace) -> int:
+    """Queue jobs or inspect the queue, without automator nor login."""
+    from . import ShareWoodSearchCriteria, ShareWoodTorrent
+
+    try:
+        queue = create_queue(args)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.action == "stats":
+            for status, count in queue.stats().items():
+                print(f"{status}: {count}")
+        elif args.action == "search":
+            # Plain queries, or listing query strings for the other criteria
+            count = queue.put_searches(
+                ShareWoodSearchCriteria.from_query_params(value) if "=" in value else ShareWoodSearchCriteria(query=value)
+                for value in args.values
+            )
+            print(f"{count} search jobs queued")
+        elif args.action == "scrape":
+            count = queue.put_scrapes(ShareWoodTorrent(url=url) for url in args.values)
+            print(f"{count} scrape jobs queued")
+        elif args.action == "retry":
+            print(f"{queue.retry_failed()} failed jobs queued again")
+        else:
+            queue.clear()
+            print("queue: cleared")
+    except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
     finally:
-        # Always disconnect
+        queue.close()
+
+    return 0
+
+
+def work(args: argparse.Namespace) -> int:
+    """Run queued jobs with a logged-in automator until stopped."""
+    from .sharewoodworker import ShareWoodWorker
+
+    automator = None
+    queue = None
+
+    # Stop cleanly on kill as on Ctrl+C, leased jobs are given back
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        queue = create_queue(args)
+        automator = create_automator(args)
+        automator.connect()
+
+        worker = ShareWoodWorker(queue, automator, batch_size=args.batch_size, refresh=args.refresh)
+        print(f"Worker {worker.name} started", flush=True)
+        count = worker.run(max_jobs=args.max_jobs, idle_exit=args.idle_exit)
+        print(f"{count} jobs run")
+
+    except KeyboardInterrupt:
+        pass
+    except (ShareWoodError, ConnectionError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if queue is not None:
+            queue.close()
+        # Disconnect, unless the login session is kept for the next run
         try:
-            automator.disconnect()
+            if automator is not None and (args.logout or automator.session_store is None):
+                automator.disconnect()
+        except ShareWoodError as e:
+            print(f"Error: {e}", file=sys.stderr)
         except (ConnectionError, ValueError, OSError):
             pass
 
     return 0
 
 
+def serve(args: argparse.Namespace, path: str) -> int:
+    """Serve commands with one logged-in automator until interrupted."""
+    from .sharewoodserver import ShareWoodServer
+
+    automator = None
+    server = None
+
+    # Stop cleanly on kill as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        # Log in once, commands reuse the session and the started browsers
+        automator = create_automator(args)
+        automator.connect()
+
+        # Forwarded global options are ignored, the server ones apply
+        server = ShareWoodServer(
+            path,
+            handler=lambda argv: run_command(parse_arguments(argv), automator, relogin=True),
+            metrics=automator.metrics,
+        )
+        print(f"Serving on {server.path}", flush=True)
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
+    except (ShareWoodError, ConnectionError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if server is not None:
+            server.server_close()
+        # Disconnect, unless the login session is kept for the next run
+        try:
+            if automator is not None and (args.logout or automator.session_store is None):
+                automator.disconnect()
+        except ShareWoodError as e:
+            print(f"Error: {e}", file=sys.stderr)
+        except (ConnectionError, ValueError, OSError):
+            pass
+
+    return 0
+
+
+def forwarded_argv(args: argparse.Namespace, argv: List[str]) -> List[str]:
+    """Command line for the server, with the paths resolved as on this client.
+
+    The server runs in its own directory and environment, a download is saved
+    to the directory of the client, or its DOWNLOAD_PATH.
+    """
+    if args.command != "download":
+        return list(argv)
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    output = args.output or os.getenv("DOWNLOAD_PATH", "~/Downloads/Sharewood")
+    # The last --output given wins
+    return [*argv, "--output", os.path.abspath(os.path.expanduser(output))]
+
+
+def forward(argv: List[str], path: str) -> Optional[int]:
+    """Run a command on the server listening on path, None if there is none."""
+    from .sharewoodserver import ShareWoodClient
+
+    try:
+        response = ShareWoodClient(path).run(argv)
+    except ConnectionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if response is None:
+        return None
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["code"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the application."""
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_arguments(argv)
+    path = server_socket(args)
+
+    if args.command == "serve":
+        return serve(args, path)
+
+    # Queue commands only touch the queue file, workers own their automator
+    if args.command == "queue":
+        return run_queue(args)
+    if args.command == "worker":
+        return work(args)
+
+    # Forward to the running server, which is already logged in
+    if path and args.server:
+        code = forward(forwarded_argv(args, argv), path)
+        if code is not None:
+            return code
+
+    automator = None
+    connected = False
+
+    try:
+        # Imported once the arguments are valid, --version and help never load it
+        automator = create_automator(args)
+
+        # Connect to ShareWood.tv, unless the command is answered locally
+        if needs_login(args, automator.search_backend):
+            automator.connect()
+            connected = True
+
+        return run_command(args, automator)
+
+    except (ShareWoodError, ConnectionError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        # Disconnect, unless the login session is kept for the next run
+        try:
+            if connected and (args.logout or automator.session_store is None):
+                automator.disconnect()
+        except ShareWoodError as e:
+            print(f"Error: {e}", file=sys.stderr)
+        except (ConnectionError, ValueError, OSError):
+            pass
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -38,6 +38,11 @@ class ShareWoodConfig:
         # Expand user directory in download path
         if self.download_path:
             self.download_path = os.path.expanduser(self.download_path)
+
+        # Chromedriver settings
+        self.driver_path = os.getenv("CHROMEDRIVER_PATH") or None
+        self.driver_cache_file = os.getenv("CHROMEDRIVER_CACHE_FILE", "~/.sharewoodautomator/drivers.sqlite")
+        self.driver_offline = os.getenv("CHROMEDRIVER_OFFLINE", "false").lower() in ("1", "true", "yes")
         
         # Validate required settings
         self._validate_config()
@@ -66,4 +71,7 @@ class ShareWoodConfig:
             "PSEUDO": self.username or "",
             "PASSWORD": self.password or "",
             "DOWNLOAD_PATH": self.download_path,
+            "CHROMEDRIVER_PATH": self.driver_path or "",
+            "CHROMEDRIVER_CACHE_FILE": self.driver_cache_file,
+            "CHROMEDRIVER_OFFLINE": "true" if self.driver_offline else "false",
         }
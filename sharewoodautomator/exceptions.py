@@ -117,3 +117,45 @@ class ShareWoodTorrentError(ShareWoodError):
             original_exception: The original exception that caused this error
         """
         super().__init__(message, original_exception)
+
+
+class ShareWoodPoolError(ShareWoodError):
+    """Raised when no WebDriver can be obtained from the pool."""
+    
+    def __init__(self, message="No WebDriver available in pool", original_exception=None):
+        """
+        Initialize a WebDriver pool error.
+
+        Args:
+            message: Error message describing the pool issue
+            original_exception: The original exception that caused this error
+        """
+        super().__init__(message, original_exception)
+
+
+class ShareWoodDriverError(ShareWoodError):
+    """Raised when no chromedriver can be found or installed."""
+    
+    def __init__(self, message="Failed to resolve chromedriver", original_exception=None):
+        """
+        Initialize a chromedriver resolution error.
+
+        Args:
+            message: Error message describing the resolution issue
+            original_exception: The original exception that caused this error
+        """
+        super().__init__(message, original_exception)
+
+
+class ShareWoodPageError(ShareWoodError):
+    """Raised when ShareWood.tv answers an error page instead of the expected one."""
+    
+    def __init__(self, message="ShareWood.tv answered an error page", original_exception=None):
+        """
+        Initialize an error page error.
+
+        Args:
+            message: Error message describing the error page
+            original_exception: The original exception that caused this error
+        """
+        super().__init__(message, original_exception)
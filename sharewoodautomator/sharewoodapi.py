@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from .exceptions import ShareWoodAuthenticationError, ShareWoodParsingError, ShareWoodSearchError
+from .sharewoodhttpsession import ShareWoodHttpSession
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodsearchcriteria import SORT_FIELDS, ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+# API ID of each ShareWoodSearchCriteria category
+CATEGORY_IDS = {
+    "Vidéos": 1,
+    "Audios": 2,
+    "Applications": 3,
+    "Ebooks": 4,
+    "Jeux-Vidéos": 5,
+    "Formations": 6,
+}
+
+# API ID of each ShareWoodSearchCriteria subcategory, GPS has no API counterpart
+SUBCATEGORY_IDS = {
+    "Application Windows": 20,
+    "Application Mac": 21,
+    "Application Linux": 22,
+    "Application Smartphone/Tablette": 23,
+}
+
+# Criteria the API cannot filter by, only the torrents listing can
+UNSUPPORTED_CRITERIA = ("description", "uploader", "tags")
+
+# Format of the API upload dates, in the site time zone
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class ShareWoodApi:
+    """ ShareWood.tv passkey API client, searching and listing torrents without browser nor login """
+
+    # Pages are not fetched ahead, a search is a single request
+    supports_prefetch = False
+
+    def __init__(
+        self,
+        api_url: str,
+        passkey: str,
+        torrents_url: str,
+        session: Optional[ShareWoodHttpSession] = None,
+        timeout: int = 10,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new ShareWood.tv API client
+
+        Args:
+            api_url: Base URL of the ShareWood.tv API, "https://www.sharewood.tv/api/"
+            passkey: Passkey of the ShareWood.tv account, from the profile page
+            torrents_url: URL of the torrents listing, torrent pages URLs are built from it
+            session: Pooled HTTP session, no cookie needed (default: new session)
+            timeout: Timeout in seconds of each request (default: 10)
+            metrics: Timers and counters of the requests (default: disabled)
+        """
+
+        self.api_url = api_url.rstrip("/")
+        self.passkey = passkey
+        self.torrents_url = torrents_url.rstrip("/")
+        self.session = session if session is not None else ShareWoodHttpSession(timeout=timeout)
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+        self._categories = {category_id: name for name, category_id in CATEGORY_IDS.items()}
+        self._subcategories = {subcategory_id: name for name, subcategory_id in SUBCATEGORY_IDS.items()}
+
+    def _get(self, endpoint: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Request an API endpoint
+
+        Args:
+            endpoint: Endpoint path after the passkey
+            params: Query parameters
+
+        Returns:
+            list[dict]: Torrents of the response
+
+        Raises:
+            ShareWoodAuthenticationError: If the passkey is rejected
+            ShareWoodSearchError: If the API cannot be reached
+            ShareWoodParsingError: If the response is not a list of torrents
+        """
+
+        try:
+            with self.metrics.timer("api.request"):
+                response = self.session.get(f"{self.api_url}/{self.passkey}/{endpoint}", params=params, timeout=self.timeout)
+            if response.status_code in (401, 403):
+                raise ShareWoodAuthenticationError("ShareWood.tv passkey was rejected")
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise ShareWoodSearchError(original_exception=e) from e
+
+        try:
+            items = response.json()
+        except ValueError as e:
+            raise ShareWoodParsingError(original_exception=e) from e
+        if not isinstance(items, list):
+            raise ShareWoodParsingError(f"Unexpected ShareWood.tv API response: {str(items)[:200]}")
+
+        self.metrics.increment("api.results", len(items))
+
+        return items
+
+    def to_torrent(self, item: Dict[str, Any]) -> ShareWoodTorrent:
+        """
+        Map a torrent of an API response
+
+        Args:
+            item: Torrent of an API response
+
+        Returns:
+            ShareWoodTorrent: Torrent with its page URL and passkey download link
+        """
+
+        created_at = item.get("created_at")
+
+        return ShareWoodTorrent(
+            url=f"{self.torrents_url}/{item['slug']}.{item['id']}",
+            title=item.get("name"),
+            hash=item.get("info_hash"),
+            size=item.get("size"),
+            age=time.mktime(time.strptime(created_at, DATE_FORMAT)) if created_at else None,
+            seeders=item.get("seeders"),
+            leechers=item.get("leechers"),
+            completed=item.get("times_completed"),
+            category=self._categories.get(item.get("category_id")),
+            subcategory=self._subcategories.get(item.get("subcategory_id")),
+            languages=item.get("language"),
+            discounts=bool(item.get("free") or item.get("doubleup")),
+            download_link=self.download_link(item["id"]),
+        )
+
+    def download_link(self, torrent_id: int) -> str:
+        """
+        Passkey download link of a torrent, fetched without login
+
+        Args:
+            torrent_id: ID of the torrent, ending its page URL
+
+        Returns:
+            str: URL of the torrent file
+        """
+
+        return f"{self.api_url}/{self.passkey}/{torrent_id}/download"
+
+    def search(self, search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+        """
+        Search for torrents with the ShareWood.tv API
+
+        The API filters by query, categories and subcategories. Languages,
+        freeleech and doubleupload types, sorting and quantity are applied to
+        the response. Description, uploader and tags are not available from
+        the API, searches using them need the http or browser backend.
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+
+        Returns:
+            list[ShareWoodTorrent]: Torrents found, sorted and limited as the listing
+
+        Raises:
+            ShareWoodAuthenticationError: If the passkey is rejected
+            ShareWoodSearchError: If the API cannot be reached, or the criteria filter by description, uploader or tags
+        """
+
+        # Unfiltered results would look like filtered ones
+        unsupported = [name for name in UNSUPPORTED_CRITERIA if getattr(search_criteria, name)]
+        if unsupported:
+            raise ShareWoodSearchError(
+                f"The ShareWood.tv API cannot filter by {', '.join(unsupported)}, use the http or browser search backend"
+            )
+
+        params = []
+        if search_criteria.query:
+            params.append(("name", search_criteria.query))
+        params.extend(
+            ("category", str(CATEGORY_IDS[name]))
+            for name, checked in (search_criteria.categories or {}).items()
+            if checked and name in CATEGORY_IDS
+        )
+        params.extend(
+            ("subcategory", str(SUBCATEGORY_IDS[name]))
+            for name, checked in (search_criteria.subcategories or {}).items()
+            if checked and name in SUBCATEGORY_IDS
+        )
+
+        torrents = [self.to_torrent(item) for item in self._get("search", params)]
+
+        return self._filter(torrents, search_criteria)
+
+    def iter_search(self, search_criteria: ShareWoodSearchCriteria, max_results: Optional[int] = None) -> Iterator[ShareWoodTorrent]:
+        """
+        Iterate over search results of the ShareWood.tv API
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+            max_results: Maximum number of torrents to yield (default: None, all)
+
+        Yields:
+            ShareWoodTorrent: Search results, in listing order
+        """
+
+        # Nothing to yield, the API is not even asked
+        if max_results is not None and max_results < 1:
+            return
+
+        # The API answers a search in a single response
+        torrents = self.search(search_criteria)
+
+        yield from (torrents[:max_results] if max_results is not None else torrents)
+
+    def latest(self, limit: Optional[int] = None, category: Optional[str] = None) -> List[ShareWoodTorrent]:
+        """
+        List the last uploaded torrents, the ShareWood.tv feed
+
+        Args:
+            limit: Number of torrents (default: API default)
+            category: Category name, as in ShareWoodSearchCriteria.categories (default: every category)
+
+        Returns:
+            list[ShareWoodTorrent]: Last uploaded torrents, newest first
+        """
+
+        params = []
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        if category is not None:
+            params.append(("category", str(CATEGORY_IDS[category])))
+
+        return [self.to_torrent(item) for item in self._get("last-torrents", params)]
+
+    @staticmethod
+    def _filter(torrents: List[ShareWoodTorrent], search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+        """
+        Apply the criteria the API does not filter by
+
+        Args:
+            torrents: Torrents of the API response
+            search_criteria: Search criteria for ShareWood.tv
+
+        Returns:
+            list[ShareWoodTorrent]: Matching torrents, sorted and limited as the listing
+        """
+
+        languages = [name for name, checked in (search_criteria.languages or {}).items() if checked]
+        if languages:
+            torrents = [
+                torrent for torrent in torrents
+                if torrent.languages and any(language in torrent.languages for language in languages)
+            ]
+
+        types = search_criteria.types or {}
+        if types.get("freeleech") or types.get("doubleupload"):
+            torrents = [torrent for torrent in torrents if torrent.discounts]
+
+        # Listing default order is the most recent first, missing values last
+        name = SORT_FIELDS.get(search_criteria.sorting or "created_at", "age")
+        present = [torrent for torrent in torrents if getattr(torrent, name) is not None]
+        missing = [torrent for torrent in torrents if getattr(torrent, name) is None]
+        torrents = sorted(present, key=lambda torrent: getattr(torrent, name), reverse=search_criteria.direction != "asc") + missing
+
+        return torrents[:search_criteria.quantity] if search_criteria.quantity else torrents
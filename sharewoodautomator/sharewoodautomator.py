@@ -2,64 +2,216 @@
 # -*- coding: utf-8 -*-
 
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, TypeVar, Union
 
+import requests
 from dotenv import load_dotenv
-from selenium.webdriver import Chrome, ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.webdriver import WebDriver
-from webdriver_manager.chrome import ChromeDriverManager
 
-from .sharewoodlogging import ShareWoodLogging
+from .exceptions import ShareWoodAuthenticationError, ShareWoodConnectionError
+from .sharewoodapi import ShareWoodApi
+from .sharewoodbatch import ShareWoodBatchResult
+from .sharewoodcache import ShareWoodDetailCache, ShareWoodSearchCache
+from .sharewoodcrawler import ShareWoodCrawlState, ShareWoodDeltaCrawler, torrent_id
+from .sharewooddownloader import ShareWoodDownloadReport, ShareWoodDownloadResult, ShareWoodTorrentDownloader
+from .sharewooddriverpool import ShareWoodDriverPool, is_driver_alive
+from .sharewooddriverresolver import ShareWoodDriverCache, ShareWoodDriverResolver
+from .sharewoodhttpsearch import ShareWoodHttpSearch
+from .sharewoodhttpsession import ShareWoodHttpSession
+from .sharewoodindex import ShareWoodIndex
+from .sharewoodmetrics import NULL_METRICS, SINKS, ShareWoodMetrics
 from .sharewoodsearch import ShareWoodSearch
 from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodsessionstore import ShareWoodSessionStore
 from .sharewoodtorrent import ShareWoodTorrent
-from .sharewoodtorrentscraper import ShareWoodTorrentScraper
+from .sharewoodtorrentscraper import ShareWoodScrapeResult, ShareWoodTorrentScraper
+
+if TYPE_CHECKING:  # pragma: no cover - Selenium is imported when the first browser starts
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+    from .sharewoodlogging import ShareWoodLogging
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Requests blocked by the lean browsing profile, searches and scrapes only need the DOM
+LEAN_BLOCKED_URLS = (
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    # Stylesheets and fonts
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+)
+
+# Chrome preferences of the lean browsing profile, images blocked even when not matched by URL
+LEAN_PREFERENCES = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
 
 
 class ShareWoodAutomator:
     """ Automates interactions with ShareWood.tv """
 
-    def __init__(self, headless: Optional[bool] = True) -> None:
+    # Available search backends
+    SEARCH_BACKENDS = ("api", "browser", "http")
+
+    # Available search sources, ShareWood.tv or the local index
+    SEARCH_SOURCES = ("remote", "local")
+
+    def __init__(
+        self,
+        headless: Optional[bool] = True,
+        search_backend: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        persist_session: Optional[bool] = True,
+        search_cache: Optional[bool] = True,
+        cache_ttl: Optional[int] = None,
+        detail_cache: Optional[bool] = True,
+        index: Optional[bool] = True,
+        metrics: Optional[ShareWoodMetrics] = None,
+        lean: Optional[bool] = None,
+    ) -> None:
         """
         Initialize a new ShareWood.tv automator
 
         Args:
             headless: Run browser in headless mode
+            search_backend: Search backend, "api" (passkey API), "browser" (Selenium) or "http" (pooled HTTP session)
+                (default: api if SHAREWOOD_API_URL and SHAREWOOD_PASSKEY are set, else browser)
+            pool_size: Number of browsers used by parallel operations (default: BROWSER_POOL_SIZE)
+            persist_session: Save login cookies encrypted in SESSION_FILE and restore them on connect
+            search_cache: Cache search results in SEARCH_CACHE_FILE
+            cache_ttl: Seconds search results stay cached, 0 disables the cache (default: SEARCH_CACHE_TTL)
+            detail_cache: Cache scraped torrent pages in DETAIL_CACHE_FILE
+            index: Index searched and scraped torrents in INDEX_FILE, for local searches
+            metrics: Timers and counters of every phase (default: written to METRICS_FILE if set, else disabled)
+            lean: Block images, stylesheets, fonts and trackers, and return from page loads once the DOM is ready
+                (default: BROWSER_LEAN)
+
+        Raises:
+            ValueError: If search backend is unknown, or api without passkey
         """
 
+        # Browser is started on first use, the api and http backends and local commands may never need it
+        self._browser = None
+        self._logging = None
+
         # Load environment variables
         self.env = self._load_env()
+
+        # Prefer the passkey API, no browser nor login needed to search
+        has_api = bool(self.env["SHAREWOOD_API_URL"] and self.env["SHAREWOOD_PASSKEY"])
+        if search_backend is None:
+            search_backend = "api" if has_api else "browser"
+
+        # Check search backend
+        if search_backend not in self.SEARCH_BACKENDS:
+            raise ValueError(f"Unknown search backend: {search_backend}")
+        if search_backend == "api" and not has_api:
+            raise ValueError("The api search backend needs SHAREWOOD_API_URL and SHAREWOOD_PASSKEY")
+        self.search_backend = search_backend
+
+        # Timers and counters of every phase
+        self.metrics = metrics if metrics is not None else self._init_metrics()
+        # Run browsers in headless mode
+        self.headless = headless
+        # Run browsers with the lean browsing profile
+        self.lean = self.env["BROWSER_LEAN"] if lean is None else lean
         
-        # Create selenium driver instance
-        self.browser = self._init_driver(
-            headless, 
-            timeout=self.env["BROWSER_TIMEOUT"]
-        )
-        # ShareWood logging
-        self.logging = ShareWoodLogging(
-            browser=self.browser, 
-            home_url=self.env["SHAREWOOD_URL"],
-            login_url=self.env["SHAREWOOD_LOGIN_URL"], 
-            logout_url=self.env["SHAREWOOD_LOGOUT_URL"], 
-            timeout=self.env["BROWSER_WAIT_TIMEOUT"]
+        # Chromedriver of the installed Chrome, resolved once per Chrome version
+        self.driver_resolver = ShareWoodDriverResolver(
+            cache=ShareWoodDriverCache(path=self.env["CHROMEDRIVER_CACHE_FILE"]) if self.env["CHROMEDRIVER_CACHE_FILE"] else None,
+            driver_path=self.env["CHROMEDRIVER_PATH"] or None,
+            offline=self.env["CHROMEDRIVER_OFFLINE"],
+            metrics=self.metrics,
         )
-        # ShareWood search
-        self.searcher = ShareWoodSearch(
-            browser=self.browser, 
-            search_url=self.env["SHAREWOOD_TORRENTS_URL"], 
-            timeout=self.env["BROWSER_WAIT_TIMEOUT"]
+        # Pool of logged-in browsers for parallel operations, filled on demand
+        self.pool = ShareWoodDriverPool(
+            driver_factory=self._init_logged_in_driver,
+            size=pool_size or self.env["BROWSER_POOL_SIZE"],
+            health_check=self._is_driver_healthy,
         )
-        # ShareWood torrents scraper
-        self.scraper = ShareWoodTorrentScraper(browser=self.browser)
-    
+        # Encrypted store of the login cookies, reused between runs
+        self.session_store = None
+        if persist_session and self.env["SESSION_FILE"]:
+            self.session_store = ShareWoodSessionStore(
+                path=self.env["SESSION_FILE"],
+                secret=self.env["SESSION_KEY"] or self.env["PASSWORD"],
+            )
+        # On-disk cache of search results
+        self.search_cache = None
+        cache_ttl = self.env["SEARCH_CACHE_TTL"] if cache_ttl is None else cache_ttl
+        if search_cache and cache_ttl > 0 and self.env["SEARCH_CACHE_FILE"]:
+            self.search_cache = ShareWoodSearchCache(
+                path=self.env["SEARCH_CACHE_FILE"],
+                ttl=cache_ttl,
+                max_entries=self.env["SEARCH_CACHE_SIZE"],
+            )
+        # On-disk cache of scraped torrent pages
+        self.detail_cache = None
+        if detail_cache and self.env["DETAIL_CACHE_FILE"]:
+            self.detail_cache = ShareWoodDetailCache(
+                path=self.env["DETAIL_CACHE_FILE"],
+                max_age=self.env["DETAIL_CACHE_MAX_AGE"],
+            )
+        # Local index of every searched and scraped torrent
+        self.index = None
+        if index and self.env["INDEX_FILE"]:
+            self.index = ShareWoodIndex(path=self.env["INDEX_FILE"])
+        # Pooled HTTP session sharing the browser cookies (api and http backends)
+        self.session = None
+        if search_backend != "browser":
+            self.session = ShareWoodHttpSession(timeout=self.env["BROWSER_WAIT_TIMEOUT"])
+        # ShareWood search and torrents scrapers, single page and pooled, created on first use
+        self._searcher = None
+        self._scraper = None
+        self._pool_scraper = None
+
     def __del__(self) -> None:
         """
         Cleanup ShareWood.tv automator
+
+        Attributes are missing when the constructor failed, e.g. on an invalid environment.
         """
 
-        # Close browser window
-        self.browser.quit()
+        # Close browser window, if started
+        if getattr(self, "_browser", None) is not None:
+            self._browser.quit()
+
+        # Close pooled browsers
+        if getattr(self, "pool", None) is not None:
+            self.pool.close()
+
+        # Stop parsing processes
+        for scraper in (getattr(self, "_scraper", None), getattr(self, "_pool_scraper", None)):
+            if scraper is not None:
+                scraper.close()
+
+        # Close resolved drivers cache
+        if getattr(self, "driver_resolver", None) is not None and self.driver_resolver.cache is not None:
+            self.driver_resolver.cache.close()
+
+        # Close search results cache
+        if getattr(self, "search_cache", None) is not None:
+            self.search_cache.close()
+
+        # Close torrent pages cache
+        if getattr(self, "detail_cache", None) is not None:
+            self.detail_cache.close()
+
+        # Close local index
+        if getattr(self, "index", None) is not None:
+            self.index.close()
+
+        # Close HTTP session pooled connections
+        if getattr(self, "session", None) is not None:
+            self.session.close()
+
+        # Write collected metrics
+        if getattr(self, "metrics", None) is not None:
+            self.metrics.flush()
     
     def _load_env(self) -> Dict[str, str]:
         """
@@ -75,10 +227,30 @@ class ShareWoodAutomator:
             "SHAREWOOD_LOGIN_URL": os.getenv("SHAREWOOD_LOGIN_URL"),
             "SHAREWOOD_LOGOUT_URL": os.getenv("SHAREWOOD_LOGOUT_URL"),
             "SHAREWOOD_TORRENTS_URL": os.getenv("SHAREWOOD_TORRENTS_URL"),
+            "SHAREWOOD_API_URL": os.getenv("SHAREWOOD_API_URL", ""),
+            "SHAREWOOD_PASSKEY": os.getenv("SHAREWOOD_PASSKEY", ""),
             "BROWSER_TIMEOUT": int(os.getenv("BROWSER_TIMEOUT", "10")),
             "BROWSER_WAIT_TIMEOUT": int(os.getenv("BROWSER_WAIT_TIMEOUT", "10")),
+            "BROWSER_POOL_SIZE": int(os.getenv("BROWSER_POOL_SIZE", "2")),
+            "BROWSER_LEAN": os.getenv("BROWSER_LEAN", "true").lower() in ("1", "true", "yes"),
+            "CHROMEDRIVER_PATH": os.getenv("CHROMEDRIVER_PATH", ""),
+            "CHROMEDRIVER_CACHE_FILE": os.getenv("CHROMEDRIVER_CACHE_FILE", "~/.sharewoodautomator/drivers.sqlite"),
+            "CHROMEDRIVER_OFFLINE": os.getenv("CHROMEDRIVER_OFFLINE", "false").lower() in ("1", "true", "yes"),
             "PSEUDO": os.getenv("PSEUDO"),
             "PASSWORD": os.getenv("PASSWORD"),
+            "SESSION_FILE": os.getenv("SESSION_FILE", "~/.sharewoodautomator/session"),
+            "SESSION_KEY": os.getenv("SESSION_KEY", ""),
+            "SEARCH_CACHE_FILE": os.getenv("SEARCH_CACHE_FILE", "~/.sharewoodautomator/search_cache.sqlite"),
+            "SEARCH_CACHE_TTL": int(os.getenv("SEARCH_CACHE_TTL", "900")),
+            "SEARCH_CACHE_SIZE": int(os.getenv("SEARCH_CACHE_SIZE", "256")),
+            "DETAIL_CACHE_FILE": os.getenv("DETAIL_CACHE_FILE", "~/.sharewoodautomator/detail_cache.sqlite"),
+            "DETAIL_CACHE_MAX_AGE": int(os.getenv("DETAIL_CACHE_MAX_AGE", "3600")),
+            "INDEX_FILE": os.getenv("INDEX_FILE", "~/.sharewoodautomator/index.sqlite"),
+            "CRAWL_STATE_FILE": os.getenv("CRAWL_STATE_FILE", "~/.sharewoodautomator/crawl.sqlite"),
+            "DOWNLOAD_PATH": os.getenv("DOWNLOAD_PATH", "~/Downloads/Sharewood"),
+            "DOWNLOAD_CONCURRENCY": int(os.getenv("DOWNLOAD_CONCURRENCY", "4")),
+            "METRICS_FILE": os.getenv("METRICS_FILE", ""),
+            "METRICS_FORMAT": os.getenv("METRICS_FORMAT", "json"),
         }
         
         # Check if all required environment variables are set
@@ -87,81 +259,737 @@ class ShareWoodAutomator:
                 raise ValueError(f"Missing environment variable: {key}")
         return env_vars
     
-    def _init_driver(self, headless: bool, timeout: int) -> WebDriver:
+    def _init_metrics(self) -> ShareWoodMetrics:
+        """
+        Initialize metrics written to METRICS_FILE in METRICS_FORMAT
+
+        Returns:
+            ShareWoodMetrics: Metrics flushed to METRICS_FILE, disabled metrics if not set
+        Raises:
+            ValueError: If METRICS_FORMAT is unknown
+        """
+
+        if not self.env["METRICS_FILE"]:
+            return NULL_METRICS
+
+        if self.env["METRICS_FORMAT"] not in SINKS:
+            raise ValueError(f"Unknown metrics format: {self.env['METRICS_FORMAT']}")
+
+        return ShareWoodMetrics(sinks=[SINKS[self.env["METRICS_FORMAT"]](self.env["METRICS_FILE"])])
+
+    @property
+    def browser(self) -> "WebDriver":
+        """
+        Main browser, started on first use
+
+        A browser started after the HTTP session was logged in shares its cookies.
+
+        Returns:
+            WebDriver: Chrome WebDriver instance
+        """
+
+        if self._browser is None:
+            self._browser = self._init_driver(self.headless, timeout=self.env["BROWSER_TIMEOUT"], lean=self.lean)
+            if self.session is not None and self.session.cookies:
+                self._init_logging(self._browser).load_cookies(self.session.get_cookies())
+
+        return self._browser
+
+    @property
+    def logging(self) -> "ShareWoodLogging":
+        """
+        ShareWood logging of the main browser, starting it on first use
+
+        Returns:
+            ShareWoodLogging: Logging manager bound to the main browser
+        """
+
+        if self._logging is None:
+            self._logging = self._init_logging(self.browser)
+
+        return self._logging
+
+    @property
+    def searcher(self) -> Union[ShareWoodApi, ShareWoodHttpSearch, ShareWoodSearch]:
+        """
+        ShareWood search of the search backend, created on first use
+
+        Returns:
+            ShareWoodApi, ShareWoodHttpSearch or ShareWoodSearch: Searcher of the search backend
+        """
+
+        if self._searcher is None:
+            if self.search_backend == "api":
+                self._searcher = ShareWoodApi(
+                    api_url=self.env["SHAREWOOD_API_URL"],
+                    passkey=self.env["SHAREWOOD_PASSKEY"],
+                    torrents_url=self.env["SHAREWOOD_TORRENTS_URL"],
+                    session=self.session,
+                    timeout=self.env["BROWSER_WAIT_TIMEOUT"],
+                    metrics=self.metrics,
+                )
+            elif self.search_backend == "http":
+                self._searcher = ShareWoodHttpSearch(
+                    session=self.session,
+                    search_url=self.env["SHAREWOOD_TORRENTS_URL"],
+                    timeout=self.env["BROWSER_WAIT_TIMEOUT"],
+                    login_url=self.env["SHAREWOOD_LOGIN_URL"],
+                    metrics=self.metrics,
+                )
+            else:
+                self._searcher = ShareWoodSearch(
+                    browser=self.browser,
+                    search_url=self.env["SHAREWOOD_TORRENTS_URL"],
+                    timeout=self.env["BROWSER_WAIT_TIMEOUT"],
+                    metrics=self.metrics,
+                )
+
+        return self._searcher
+
+    @property
+    def scraper(self) -> ShareWoodTorrentScraper:
+        """
+        ShareWood torrents scraper, created on first use
+
+        Pages are fetched over HTTP with the api and http backends.
+
+        Returns:
+            ShareWoodTorrentScraper: Scraper sharing the detail cache
+        """
+
+        if self._scraper is None:
+            self._scraper = self._init_scraper()
+
+        return self._scraper
+
+    def _init_scraper(self, pool: Optional[ShareWoodDriverPool] = None) -> ShareWoodTorrentScraper:
+        """
+        Create a torrents scraper fetching pages with the HTTP session, else the pool, else the main browser
+
+        The main browser is only started when the scraper has nothing else to load pages with.
+
+        Args:
+            pool: Pool of logged-in browsers, unused with an HTTP session (default: None)
+
+        Returns:
+            ShareWoodTorrentScraper: Scraper sharing the detail cache
+        """
+
+        if self.session is not None:
+            pool = None
+
+        # Torrent pages are not served by the passkey API
+        if self.search_backend == "api" and not self.session.cookies:
+            self._login()
+
+        return ShareWoodTorrentScraper(
+            browser=self.browser if self.session is None and pool is None else None,
+            session=self.session,
+            pool=pool,
+            detail_cache=self.detail_cache,
+            login_url=self.env["SHAREWOOD_LOGIN_URL"],
+            metrics=self.metrics,
+        )
+
+    def _init_driver(self, headless: bool, timeout: int, lean: Optional[bool] = False) -> "WebDriver":
         """ 
         Initialize Chrome WebDriver with security optimizations
-        Install Chrome WebDriver if not found
+        Install Chrome WebDriver if not cached for the installed Chrome version
 
         Args:
             headless: Run browser in headless mode
-            timeout: Timeout for WebDriverWait
+            timeout: Page load and script timeout, elements are waited for explicitly by ShareWoodWait
+            lean: Block LEAN_BLOCKED_URLS and use the eager page load strategy (default: False)
         Returns:
             WebDriver: Chrome WebDriver instance
         Raises:
-            Exception: If Chrome WebDriver cannot be installed
-        """
-
-        # Configure Chrome WebDriver with security optimizations
-        options = ChromeOptions()
-        if headless:
-            options.add_argument("--headless") # Run browser in headless mode
-        options.add_argument("--disable-blink-features=AutomationControlled") # Disable automation controlled flag
-        options.add_argument("--no-sandbox") # Disable sandbox mode
-        options.add_argument("--disable-dev-shm-usage") # Disable dev-shm usage
-
-        # Initialize Chrome WebDriver
-        driver = Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
-        # Set default timeout for WebDriver
-        driver.implicitly_wait(timeout)
-        # Set default page load timeout for WebDriver
-        driver.set_page_load_timeout(timeout)
-        # Set default script timeout for WebDriver
-        driver.set_script_timeout(timeout)
-        
+            ShareWoodDriverError: If Chrome WebDriver cannot be found nor installed
+        """
+
+        # Selenium is only imported when a browser is needed
+        from selenium.webdriver import Chrome, ChromeOptions
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
+        # Browser startup time, chromedriver resolution included
+        with self.metrics.timer("browser.start"):
+            # Configure Chrome WebDriver with security optimizations
+            options = ChromeOptions()
+            if headless:
+                options.add_argument("--headless") # Run browser in headless mode
+            options.add_argument("--disable-blink-features=AutomationControlled") # Disable automation controlled flag
+            options.add_argument("--no-sandbox") # Disable sandbox mode
+            options.add_argument("--disable-dev-shm-usage") # Disable dev-shm usage
+            if lean:
+                options.page_load_strategy = "eager" # Return from page loads once the DOM is ready
+                options.add_experimental_option("prefs", LEAN_PREFERENCES) # Disable images and notifications
+
+            # Initialize Chrome WebDriver
+            driver = Chrome(service=ChromeService(self.driver_resolver.resolve()), options=options)
+            # Block non-essential resources of every page
+            if lean:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(LEAN_BLOCKED_URLS)})
+            # Set default page load timeout for WebDriver
+            driver.set_page_load_timeout(timeout)
+            # Set default script timeout for WebDriver
+            driver.set_script_timeout(timeout)
+
+        return driver
+
+    def _init_logged_in_driver(self) -> "WebDriver":
+        """
+        Initialize a new Chrome WebDriver logged in to ShareWood.tv
+
+        Returns:
+            WebDriver: Logged-in Chrome WebDriver instance
+        Raises:
+            ShareWoodAuthenticationError: If login fails
+        """
+
+        # Create a new browser
+        driver = self._init_driver(self.headless, timeout=self.env["BROWSER_TIMEOUT"], lean=self.lean)
+
+        # Log the new browser in
+        logging = self._init_logging(driver)
+        if not logging.connect(self.env["PSEUDO"], self.env["PASSWORD"]):
+            driver.quit()
+            raise ShareWoodAuthenticationError()
+
         return driver
 
+    def _init_logging(self, browser: "WebDriver") -> "ShareWoodLogging":
+        """
+        Initialize ShareWood logging for a browser
+
+        Args:
+            browser: Selenium WebDriver instance
+        Returns:
+            ShareWoodLogging: Logging manager bound to the browser
+        """
+
+        from .sharewoodlogging import ShareWoodLogging
+
+        return ShareWoodLogging(
+            browser=browser, 
+            home_url=self.env["SHAREWOOD_URL"],
+            login_url=self.env["SHAREWOOD_LOGIN_URL"], 
+            logout_url=self.env["SHAREWOOD_LOGOUT_URL"], 
+            timeout=self.env["BROWSER_WAIT_TIMEOUT"],
+            metrics=self.metrics,
+        )
+
+    def _is_driver_healthy(self, driver: "WebDriver") -> bool:
+        """
+        Check that a pooled browser answers and is still logged in
+
+        Args:
+            driver: Selenium WebDriver instance
+        Returns:
+            True if the browser can be reused, False otherwise
+        """
+
+        return is_driver_alive(driver) and not driver.current_url.startswith(self.env["SHAREWOOD_LOGIN_URL"])
+
+    def _map_on_pool(self, func: Callable[["WebDriver", T], R], items: List[T]) -> List[R]:
+        """
+        Apply a function to items in parallel, each call borrowing a pooled browser
+
+        Args:
+            func: Function called with a logged-in browser and an item
+            items: Items to process
+        Returns:
+            list: Results, in items order
+        """
+
+        def run(item: T) -> R:
+            with self.pool.driver() as driver:
+                return func(driver, item)
+
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            return list(executor.map(run, items))
+
+    def _restore_session(self) -> bool:
+        """
+        Restore the saved ShareWood.tv session, if any
+
+        The api and http backends check the session with a single HTTP
+        request, without starting the browser, the browser backend with a
+        single page load.
+
+        Returns:
+            True if a valid session was restored, False if a login is needed
+        """
+
+        # Load saved cookies
+        if self.session_store is None:
+            return False
+        cookies = self.session_store.load()
+        if not cookies:
+            return False
+
+        # Browser backend: restore into the browser
+        if self.session is None:
+            return self.logging.restore(cookies)
+
+        # API and HTTP backends: restore into the HTTP session and check it without the browser
+        self.session.load_cookies(cookies)
+        if not self.session.is_logged_in(self.env["SHAREWOOD_URL"], self.env["SHAREWOOD_LOGIN_URL"]):
+            self.session.cookies.clear()
+            return False
+
+        # A browser started later shares the restored session
+        return True
+
     def connect(self) -> None:
         """
-        Connect to ShareWood.tv
+        Connect to ShareWood.tv, reusing the saved session when still valid
+
+        The api backend needs no login, searches and passkey downloads only
+        use the passkey, so neither the browser nor the login form are used.
+        It logs in on the first torrent page scrape instead.
+        """
+
+        # Passkey is the only credential of the api backend
+        if self.search_backend == "api":
+            return
+
+        self._login()
+
+    def _login(self) -> None:
+        """
+        Log in to ShareWood.tv, reusing the saved session when still valid
         """
 
-        self.logging.connect(
+        # Skip the login form when the saved session is still valid
+        if self._restore_session():
+            return
+
+        connected = self.logging.connect(
             self.env["PSEUDO"], self.env["PASSWORD"]
         )
 
+        # Save authenticated cookies for the next run
+        if connected and self.session_store is not None:
+            self.session_store.save(self.browser.get_cookies())
+
+        # Share authenticated cookies with the HTTP session
+        if self.session is not None:
+            self.session.load_browser_cookies(self.browser)
+
+    def reconnect(self) -> None:
+        """
+        Log in again once the session expired, forgetting its cookies
+        """
+
+        if self.session is not None:
+            self.session.cookies.clear()
+        if self.session_store is not None:
+            self.session_store.clear()
+
+        # Torrent pages need a login, even with the api backend
+        self._login()
+
     def disconnect(self) -> None:
         """
-        Disconnect from ShareWood.tv
+        Disconnect from ShareWood.tv and forget the saved session
+
+        The session is forgotten even if the logout request fails.
+
+        Raises:
+            ShareWoodConnectionError: If the logout request fails
         """
         
-        self.logging.disconnect()
+        error = None
+
+        # Log out over HTTP when the browser was never needed, api backend sessions may never have logged in
+        if self._browser is None and self.session is not None:
+            if self.session.cookies:
+                try:
+                    self.session.get(self.env["SHAREWOOD_LOGOUT_URL"])
+                except requests.RequestException as e:
+                    error = ShareWoodConnectionError("Logout failed", original_exception=e)
+            self.session.cookies.clear()
+        else:
+            self.logging.disconnect()
+
+        # Saved cookies are no longer valid once logged out
+        if self.session_store is not None:
+            self.session_store.clear()
+
+        if error is not None:
+            raise error
     
-    def search(self, search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+    def search(
+        self,
+        search_criteria: ShareWoodSearchCriteria,
+        use_cache: Optional[bool] = True,
+        refresh: Optional[bool] = False,
+        source: Optional[str] = "remote",
+    ) -> List[ShareWoodTorrent]:
         """
         Search for a torrent on ShareWood.tv
         
         Args:
             search_criteria: Search criteria
+            use_cache: Read and write the search results cache (default: True)
+            refresh: Ignore cached results but cache the new ones (default: False)
+            source: "remote" searches ShareWood.tv, "local" the index of already seen torrents, offline (default: remote)
             
         Returns:
             list[ShareWoodTorrent]: List of torrents found
+
+        Raises:
+            ValueError: If source is unknown, or local while the index is disabled
+        """
+
+        if source not in self.SEARCH_SOURCES:
+            raise ValueError(f"Unknown search source: {source}")
+
+        # Answer from already seen torrents, without requests
+        if source == "local":
+            if self.index is None:
+                raise ValueError("Local search needs the index, INDEX_FILE is not set")
+            with self.metrics.timer("search.local"):
+                return self.index.search(search_criteria)
+
+        use_cache = use_cache and self.search_cache is not None
+
+        # Serve cached results
+        if use_cache and not refresh:
+            torrents = self.search_cache.get(search_criteria)
+            if torrents is not None:
+                self.metrics.increment("search.cache_hits")
+                return torrents
+
+        with self.metrics.timer("search.total"):
+            torrents = self.searcher.search(search_criteria)
+
+        self._store_results(search_criteria, torrents, use_cache)
+
+        return torrents
+
+    def _store_results(self, search_criteria: ShareWoodSearchCriteria, torrents: List[ShareWoodTorrent], use_cache: bool) -> None:
+        """
+        Keep the results of a remote search in the caches and the index
+
+        Args:
+            search_criteria: Search criteria
+            torrents: Torrents found
+            use_cache: Write the search results cache
+        """
+
+        # Listings carry current counters of already scraped torrents
+        if self.detail_cache is not None:
+            self.detail_cache.update_counters(torrents)
+
+        # Index new torrents and current counters
+        if self.index is not None:
+            self.index.upsert(torrents)
+
+        # Cache new results
+        if use_cache:
+            self.search_cache.put(search_criteria, torrents)
+
+    def search_batch(
+        self,
+        search_criteria_list: List[ShareWoodSearchCriteria],
+        parallel: Optional[bool] = True,
+        use_cache: Optional[bool] = True,
+        refresh: Optional[bool] = False,
+    ) -> ShareWoodBatchResult:
+        """
+        Run a batch of related searches on ShareWood.tv, deduplicating torrents across them
+
+        Identical criteria are searched once and cached results are served
+        without request. The remaining searches run in parallel, as
+        search_many(), or one after the other in the main logged-in session.
+
+        Args:
+            search_criteria_list: Search criteria of each search
+            parallel: Spread searches over the pool, else run them in the main session (default: True)
+            use_cache: Read and write the search results cache (default: True)
+            refresh: Ignore cached results but cache the new ones (default: False)
+
+        Returns:
+            ShareWoodBatchResult: Torrents found by each search, and every torrent once
+        """
+
+        use_cache = use_cache and self.search_cache is not None
+
+        with self.metrics.timer("search.batch"):
+            # Each distinct search once
+            unique: Dict[str, ShareWoodSearchCriteria] = {}
+            for search_criteria in search_criteria_list:
+                unique.setdefault(search_criteria.cache_key(), search_criteria)
+
+            # Serve cached results
+            found: Dict[str, List[ShareWoodTorrent]] = {}
+            if use_cache and not refresh:
+                for key, search_criteria in unique.items():
+                    torrents = self.search_cache.get(search_criteria)
+                    if torrents is not None:
+                        self.metrics.increment("search.cache_hits")
+                        found[key] = torrents
+
+            # Search the others
+            missing = [(key, search_criteria) for key, search_criteria in unique.items() if key not in found]
+            if parallel and len(missing) > 1:
+                results = self.search_many([search_criteria for _, search_criteria in missing])
+            else:
+                results = [self.searcher.search(search_criteria) for _, search_criteria in missing]
+            for (key, search_criteria), torrents in zip(missing, results):
+                self._store_results(search_criteria, torrents, use_cache)
+                found[key] = torrents
+
+            batch = ShareWoodBatchResult.merge(
+                search_criteria_list,
+                [found[search_criteria.cache_key()] for search_criteria in search_criteria_list],
+            )
+
+        self.metrics.increment("search.batch_duplicates", batch.duplicates)
+
+        return batch
+
+    def iter_search(self, search_criteria: ShareWoodSearchCriteria, max_results: Optional[int] = None) -> Iterator[ShareWoodTorrent]:
+        """
+        Iterate over every page of search results on ShareWood.tv
+
+        Pages are fetched as the iteration goes, the http backend prefetches
+        the next page while the current one is consumed. Torrents found are
+        indexed a page at a time, as by search.
+        
+        Args:
+            search_criteria: Search criteria
+            max_results: Maximum number of torrents to yield (default: None, all)
+            
+        Yields:
+            ShareWoodTorrent: Torrents found, in listing order
+        """
+
+        page_size = search_criteria.quantity or min(search_criteria.quantity_values)
+        page: List[ShareWoodTorrent] = []
+
+        try:
+            for torrent in self.searcher.iter_search(search_criteria, max_results=max_results):
+                page.append(torrent)
+                if len(page) >= page_size:
+                    self._store_results(search_criteria, page, use_cache=False)
+                    page = []
+                yield torrent
+        finally:
+            # Last page, or torrents yielded before the caller stopped
+            if page:
+                self._store_results(search_criteria, page, use_cache=False)
+
+    def crawl(
+        self,
+        search_criteria: Optional[ShareWoodSearchCriteria] = None,
+        max_results: Optional[int] = None,
+    ) -> Iterator[ShareWoodTorrent]:
+        """
+        Iterate over the torrents uploaded since the last crawl on ShareWood.tv
+
+        The newest torrents listing is walked until the torrent marked by the
+        previous crawl (CRAWL_STATE_FILE) is reached, so a crawl costs a
+        handful of pages. New torrents are added to the local index.
+
+        Args:
+            search_criteria: Criteria narrowing the crawl, sorting is replaced (default: every torrent)
+            max_results: Maximum number of torrents of a first crawl (default: None, all)
+
+        Yields:
+            ShareWoodTorrent: New torrents, newest first
+        """
+
+        state = ShareWoodCrawlState(path=self.env["CRAWL_STATE_FILE"])
+        crawler = ShareWoodDeltaCrawler(searcher=self.searcher, state=state, metrics=self.metrics)
+
+        try:
+            for torrent in crawler.crawl(search_criteria, max_results=max_results):
+                if self.index is not None:
+                    self.index.upsert([torrent])
+                yield torrent
+        finally:
+            state.close()
+
+    def search_many(self, search_criteria_list: List[ShareWoodSearchCriteria]) -> List[List[ShareWoodTorrent]]:
+        """
+        Run several searches in parallel on ShareWood.tv
+
+        The browser backend runs one search per pooled browser, the http
+        backend shares the pooled HTTP session between searches.
+
+        Args:
+            search_criteria_list: Search criteria of each search
+            
+        Returns:
+            list[list[ShareWoodTorrent]]: Torrents found, in search criteria order
+        """
+
+        # HTTP session is thread safe, no browser needed
+        if self.session is not None:
+            with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+                return list(executor.map(self.searcher.search, search_criteria_list))
+
+        def search(driver: "WebDriver", search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+            searcher = ShareWoodSearch(
+                browser=driver,
+                search_url=self.env["SHAREWOOD_TORRENTS_URL"],
+                timeout=self.env["BROWSER_WAIT_TIMEOUT"],
+                metrics=self.metrics,
+            )
+            return searcher.search(search_criteria)
+
+        return self._map_on_pool(search, search_criteria_list)
+
+    def scrape_many(self, torrents: List[ShareWoodTorrent], refresh: Optional[bool] = False) -> Iterator[ShareWoodScrapeResult]:
+        """
+        Scrape several torrents pages in parallel
+
+        The browser backend loads one page per pooled browser, the http
+        backend fetches pages with the pooled HTTP session. Torrents with
+        fresh counters in the detail cache are not loaded again.
+        
+        Args:
+            torrents: Torrents to scrape information of
+            refresh: Load every page even if cached (default: False)
+
+        Yields:
+            ShareWoodScrapeResult: Scraped torrent and error, in completion order
+        """
+
+        # Parsing processes are kept for the next batches
+        if self._pool_scraper is None:
+            self._pool_scraper = self._init_scraper(self.pool)
+
+        results = self._pool_scraper.scrape_many(torrents, concurrency=self.pool.size, refresh=refresh)
+        try:
+            for result in results:
+                # Index scraped details
+                if result.ok and self.index is not None:
+                    self.index.upsert([result.torrent])
+                yield result
+        finally:
+            # Cancel pending pages when the caller stops early
+            results.close()
+
+    def _downloader(self, concurrency: int, download_path: Optional[str] = None) -> ShareWoodTorrentDownloader:
+        """
+        Create a torrent files downloader sharing the login session
+
+        Args:
+            concurrency: Number of files downloaded at once
+            download_path: Directory torrent files are saved to (default: DOWNLOAD_PATH)
+
+        Returns:
+            ShareWoodTorrentDownloader: Downloader saving to download_path
         """
 
-        return self.searcher.search(search_criteria)
+        # Browser backend has no HTTP session, borrow the browser cookies
+        session = self.session
+        if session is None:
+            session = ShareWoodHttpSession(timeout=self.env["BROWSER_TIMEOUT"], pool_size=concurrency)
+            session.load_browser_cookies(self.browser)
+
+        return ShareWoodTorrentDownloader(
+            session=session,
+            download_path=download_path or self.env["DOWNLOAD_PATH"],
+            login_url=self.env["SHAREWOOD_LOGIN_URL"],
+            metrics=self.metrics,
+        )
 
-    def download(self, url: str) -> None:
+    def download(
+        self,
+        url: str,
+        download_path: Optional[str] = None,
+        overwrite: Optional[bool] = False,
+    ) -> ShareWoodDownloadResult:
         """
         Download a torrent from ShareWood.tv
         
         Args:
             url: Torrent page URL
+            download_path: Directory the torrent file is saved to (default: DOWNLOAD_PATH)
+            overwrite: Download the torrent file even if already on disk (default: False)
+
+        Returns:
+            ShareWoodDownloadResult: Path and size of the torrent file
+
+        Raises:
+            ShareWoodDownloadError: If the torrent file cannot be downloaded
         """
         
         # Create ShareWoodTorrent instance
-        ShareWoodTorrent(url=url)
+        torrent = ShareWoodTorrent(url=url)
 
-        # Scrape torrent information
-        self.scraper.scrape(ShareWoodTorrent)
+        # Scrape torrent information, unless the passkey download link is known
+        self._set_passkey_links([torrent])
+        if not torrent.download_link:
+            self.scraper.scrape(torrent)
+            if self.index is not None:
+                self.index.upsert([torrent])
 
         # Download torrent
-        self.browser.get(ShareWoodTorrent.download_link)
+        downloader = self._downloader(concurrency=1, download_path=download_path)
+        try:
+            return downloader.download(torrent, overwrite=overwrite)
+        finally:
+            if downloader.session is not self.session:
+                downloader.session.close()
+
+    def _set_passkey_links(self, torrents: List[ShareWoodTorrent]) -> None:
+        """
+        Set the passkey download link of torrents without one, from their page URL
+
+        The api backend downloads torrent files without scraping their page nor logging in.
+
+        Args:
+            torrents: Torrents to download
+        """
+
+        if self.search_backend != "api":
+            return
+
+        for torrent in torrents:
+            if not torrent.download_link and torrent_id(torrent.url) is not None:
+                torrent.download_link = self.searcher.download_link(torrent_id(torrent.url))
+
+    def download_many(
+        self,
+        torrents: List[ShareWoodTorrent],
+        download_path: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        overwrite: Optional[bool] = False,
+    ) -> ShareWoodDownloadReport:
+        """
+        Download several torrent files concurrently
+
+        Torrents without download link are scraped first, the api backend uses
+        their passkey download link instead. Files already on
+        disk are skipped, errors are reported per torrent.
+
+        Args:
+            torrents: Torrents to download
+            download_path: Directory torrent files are saved to (default: DOWNLOAD_PATH)
+            concurrency: Number of files downloaded at once (default: DOWNLOAD_CONCURRENCY)
+            overwrite: Download torrent files even if already on disk (default: False)
+
+        Returns:
+            ShareWoodDownloadReport: Result of each torrent and batch throughput
+        """
+
+        concurrency = concurrency or self.env["DOWNLOAD_CONCURRENCY"]
+
+        # Find download links, failures are reported by the download
+        self._set_passkey_links(torrents)
+        to_scrape = [torrent for torrent in torrents if not torrent.download_link]
+        if to_scrape:
+            for _ in self.scrape_many(to_scrape):
+                pass
+
+        downloader = self._downloader(concurrency, download_path=download_path)
+        try:
+            return downloader.download_many(torrents, concurrency=concurrency, overwrite=overwrite)
+        finally:
+            if downloader.session is not self.session:
+                downloader.session.close()
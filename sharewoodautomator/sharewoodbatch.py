@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+
+def torrent_keys(torrent: ShareWoodTorrent) -> List[str]:
+    """
+    Identities of a torrent across search results
+
+    Args:
+        torrent: Torrent of a search result
+
+    Returns:
+        list[str]: Info hash when known and page URL when known, empty if the torrent has neither
+    """
+
+    keys = []
+    if torrent.hash:
+        keys.append(f"hash:{torrent.hash.lower()}")
+    if torrent.url:
+        keys.append(f"url:{torrent.url}")
+
+    return keys
+
+
+@dataclass
+class ShareWoodBatchResult:
+    """Outcome of a batch of searches, torrents deduplicated across searches"""
+
+    criteria: List[ShareWoodSearchCriteria] = field(
+        default_factory=list,
+        metadata={"description": "Search criteria of each search, in batch order"}
+    )
+    results: List[List[ShareWoodTorrent]] = field(
+        default_factory=list,
+        metadata={"description": "Torrents found by each search, in batch order"}
+    )
+    merged: List[ShareWoodTorrent] = field(
+        default_factory=list,
+        metadata={"description": "Every torrent found, once, in order of first appearance"}
+    )
+    duplicates: int = field(
+        default=0,
+        metadata={"description": "Number of results already found by a previous search of the batch"}
+    )
+
+    def __getitem__(self, search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+        """
+        Torrents found by a search of the batch
+
+        Args:
+            search_criteria: Search criteria of the search
+
+        Returns:
+            list[ShareWoodTorrent]: Torrents found
+
+        Raises:
+            KeyError: If the criteria are not part of the batch
+        """
+
+        key = search_criteria.cache_key()
+        for criteria, torrents in zip(self.criteria, self.results):
+            if criteria.cache_key() == key:
+                return torrents
+
+        raise KeyError(search_criteria.query)
+
+    def __iter__(self) -> Iterator[Tuple[ShareWoodSearchCriteria, List[ShareWoodTorrent]]]:
+        """ Search criteria and torrents found of each search, in batch order """
+        return iter(zip(self.criteria, self.results))
+
+    def __len__(self) -> int:
+        """ Number of searches """
+        return len(self.criteria)
+
+    @classmethod
+    def merge(
+        cls,
+        criteria: List[ShareWoodSearchCriteria],
+        results: List[List[ShareWoodTorrent]],
+    ) -> "ShareWoodBatchResult":
+        """
+        Deduplicate the torrents of several searches
+
+        A torrent found by several searches, same info hash or same page
+        URL, is the same ShareWoodTorrent instance in every result list.
+
+        Args:
+            criteria: Search criteria of each search
+            results: Torrents found by each search
+
+        Returns:
+            ShareWoodBatchResult: Deduplicated results and merged torrents
+        """
+
+        seen: Dict[str, ShareWoodTorrent] = {}
+        merged: List[ShareWoodTorrent] = []
+        duplicates = 0
+        deduplicated = []
+
+        for torrents in results:
+            unique = []
+            for torrent in torrents:
+                keys = torrent_keys(torrent)
+                # A listing row has no hash, its URL identifies it as well
+                first = next((seen[key] for key in keys if key in seen), None)
+                if first is None:
+                    merged.append(torrent)
+                else:
+                    torrent = first
+                    duplicates += 1
+                for key in keys:
+                    seen.setdefault(key, torrent)
+                unique.append(torrent)
+            deduplicated.append(unique)
+
+        return cls(criteria=list(criteria), results=deduplicated, merged=merged, duplicates=duplicates)
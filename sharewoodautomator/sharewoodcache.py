@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+
+class ShareWoodSQLiteCache:
+    """ Base of the on-disk caches, a thread safe SQLite connection """
+
+    # Statements creating the cache tables
+    SCHEMA: Tuple[str, ...] = ()
+    # Seconds to wait for another process writing the file
+    TIMEOUT = 5.0
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the cache file, creating it if needed
+
+        Args:
+            path: Path of the SQLite cache file
+        """
+
+        self.path = os.path.expanduser(path)
+
+        # Create cache file and tables
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=self.TIMEOUT, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self) -> None:
+        """
+        Close the cache file
+        """
+
+        self._connection.close()
+
+
+class ShareWoodSearchCache(ShareWoodSQLiteCache):
+    """ On-disk cache of ShareWood.tv search results, with TTL and LRU eviction """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS searches (
+            key TEXT PRIMARY KEY,
+            results TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS searches_accessed_at ON searches (accessed_at)",
+    )
+
+    def __init__(self, path: str, ttl: int, max_entries: Optional[int] = 256) -> None:
+        """
+        Initialize a new search results cache
+
+        Args:
+            path: Path of the SQLite cache file
+            ttl: Seconds a cached search stays valid
+            max_entries: Maximum number of cached searches, least recently used are evicted (default: 256)
+        """
+
+        super().__init__(path)
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def __len__(self) -> int:
+        """ Number of cached searches, expired included """
+
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+
+    def get(self, search_criteria: ShareWoodSearchCriteria) -> Optional[List[ShareWoodTorrent]]:
+        """
+        Get cached results of a search
+
+        Args:
+            search_criteria: Search criteria
+
+        Returns:
+            list[ShareWoodTorrent]: Cached results, None if not cached or expired
+        """
+
+        key = search_criteria.cache_key()
+        now = time.time()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT results, created_at FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Drop expired search
+            results, created_at = row
+            if now - created_at >= self.ttl:
+                self._connection.execute("DELETE FROM searches WHERE key = ?", (key,))
+                return None
+
+            # Mark search as recently used
+            self._connection.execute("UPDATE searches SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return [ShareWoodTorrent.from_dict(values) for values in json.loads(results)]
+
+    def put(self, search_criteria: ShareWoodSearchCriteria, torrents: List[ShareWoodTorrent]) -> None:
+        """
+        Cache results of a search, evicting least recently used searches over max_entries
+
+        Args:
+            search_criteria: Search criteria
+            torrents: Search results
+        """
+
+        results = json.dumps([torrent.to_dict() for torrent in torrents], ensure_ascii=False)
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO searches (key, results, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (search_criteria.cache_key(), results, now, now),
+            )
+            if self.max_entries is not None:
+                self._connection.execute(
+                    """
+                    DELETE FROM searches WHERE key NOT IN (
+                        SELECT key FROM searches ORDER BY accessed_at DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        """
+        Delete every cached search
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM searches")
+
+
+class ShareWoodDetailCache(ShareWoodSQLiteCache):
+    """ On-disk cache of ShareWood.tv torrent pages values, keyed by torrent URL """
+
+    # Values changing over the life of a torrent, refreshed once older than max_age
+    VOLATILE_FIELDS = ("seeders", "leechers", "completed")
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS details (
+            url TEXT PRIMARY KEY,
+            fields TEXT NOT NULL,
+            seeders INTEGER,
+            leechers INTEGER,
+            completed INTEGER,
+            counters_at REAL NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path: str, max_age: int) -> None:
+        """
+        Initialize a new torrent pages cache
+
+        Immutable values are kept forever, volatile counters are considered
+        stale once older than max_age.
+
+        Args:
+            path: Path of the SQLite cache file
+            max_age: Seconds volatile counters stay fresh
+        """
+
+        super().__init__(path)
+
+        self.max_age = max_age
+
+    def __len__(self) -> int:
+        """ Number of cached torrent pages, stale included """
+
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached values of a torrent page
+
+        Args:
+            url: URL of the torrent page
+
+        Returns:
+            dict: Cached values, None if not cached or if its counters are stale
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fields, seeders, leechers, completed, counters_at FROM details WHERE url = ?", (url,)
+            ).fetchone()
+
+        if row is None or time.time() - row[4] >= self.max_age:
+            return None
+
+        values = json.loads(row[0])
+        values.update(zip(self.VOLATILE_FIELDS, row[1:4]))
+
+        return values
+
+    def put(self, url: str, values: Dict[str, Any]) -> None:
+        """
+        Cache values of a freshly scraped torrent page
+
+        Args:
+            url: URL of the torrent page
+            values: Scraped values by field name
+        """
+
+        fields = {name: value for name, value in values.items() if name not in self.VOLATILE_FIELDS}
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO details (url, fields, seeders, leechers, completed, counters_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    json.dumps(fields, ensure_ascii=False),
+                    *(values.get(name) for name in self.VOLATILE_FIELDS),
+                    time.time(),
+                ),
+            )
+
+    def update_counters(self, torrents: List[ShareWoodTorrent]) -> None:
+        """
+        Refresh volatile counters of cached torrents from up to date torrents,
+        such as search results, without loading their pages
+
+        Args:
+            torrents: Torrents with current seeders, leechers and completed counters
+        """
+
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE details SET seeders = ?, leechers = ?, completed = ?, counters_at = ? WHERE url = ?",
+                [
+                    (*(getattr(torrent, name) for name in self.VOLATILE_FIELDS), now, torrent.url)
+                    for torrent in torrents
+                    if torrent.url and all(getattr(torrent, name) is not None for name in self.VOLATILE_FIELDS)
+                ],
+            )
+
+    def clear(self) -> None:
+        """
+        Delete every cached torrent page
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM details")
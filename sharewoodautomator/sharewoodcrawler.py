@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from dataclasses import dataclass, field, replace
+from typing import Iterator, Optional
+
+from .sharewoodcache import ShareWoodSQLiteCache
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodsearch import ShareWoodSearch
+from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+# Torrent pages URLs end with the torrent ID, "/torrents/<slug>.<id>"
+TORRENT_ID_PATTERN = re.compile(r"\.(\d+)/?$")
+
+
+def torrent_id(url: Optional[str]) -> Optional[int]:
+    """
+    ID of a torrent from its page URL
+
+    Args:
+        url: URL of the torrent page
+
+    Returns:
+        int: Torrent ID, None if the URL has none
+    """
+
+    match = TORRENT_ID_PATTERN.search(url or "")
+
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class ShareWoodHighWaterMark:
+    """Newest torrent seen by a crawl"""
+
+    url: str = field(
+        metadata={"description": "URL of the newest torrent seen"}
+    )
+    id: Optional[int] = field(
+        default=None,
+        metadata={"description": "ID of the newest torrent seen, IDs grow with uploads"}
+    )
+    age: Optional[float] = field(
+        default=None,
+        metadata={"description": "Upload timestamp of the newest torrent seen"}
+    )
+
+    def reached(self, torrent: ShareWoodTorrent, slack: float) -> bool:
+        """
+        Whether a torrent is at or below the mark, so was already seen
+
+        Args:
+            torrent: Torrent of the newest first listing
+            slack: Seconds an upload timestamp may be off, listing ages are rounded
+
+        Returns:
+            bool: True if the torrent was already seen
+        """
+
+        if torrent.url == self.url:
+            return True
+
+        # IDs are reliable even if the marked torrent was deleted
+        current_id = torrent_id(torrent.url)
+        if current_id is not None and self.id is not None:
+            return current_id <= self.id
+
+        return torrent.age is not None and self.age is not None and torrent.age < self.age - slack
+
+
+class ShareWoodCrawlState(ShareWoodSQLiteCache):
+    """ On-disk high-water marks of the delta crawls, keyed by search criteria """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS marks (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            id INTEGER,
+            age REAL,
+            updated_at REAL NOT NULL
+        )
+        """,
+    )
+
+    def get(self, search_criteria: ShareWoodSearchCriteria) -> Optional[ShareWoodHighWaterMark]:
+        """
+        Get the high-water mark of a crawl
+
+        Args:
+            search_criteria: Search criteria of the crawl
+
+        Returns:
+            ShareWoodHighWaterMark: Newest torrent seen, None if never crawled
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, id, age FROM marks WHERE key = ?", (search_criteria.cache_key(),)
+            ).fetchone()
+
+        return ShareWoodHighWaterMark(*row) if row is not None else None
+
+    def put(self, search_criteria: ShareWoodSearchCriteria, mark: ShareWoodHighWaterMark) -> None:
+        """
+        Store the high-water mark of a crawl
+
+        Args:
+            search_criteria: Search criteria of the crawl
+            mark: Newest torrent seen
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO marks (key, url, id, age, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (search_criteria.cache_key(), mark.url, mark.id, mark.age, time.time()),
+            )
+
+    def clear(self) -> None:
+        """
+        Forget every high-water mark
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM marks")
+
+
+class ShareWoodDeltaCrawler:
+    """ Crawls the newest torrents listing, yielding only torrents uploaded since the last crawl """
+
+    def __init__(
+        self,
+        searcher: ShareWoodSearch,
+        state: ShareWoodCrawlState,
+        slack: float = 86400,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new delta crawler
+
+        Args:
+            searcher: Search walking the listing pages, browser or HTTP
+            state: Store of the high-water marks
+            slack: Seconds listing ages may be off, only used when torrent IDs are unknown (default: 1 day)
+            metrics: Counters of the crawls (default: disabled)
+        """
+
+        self.searcher = searcher
+        self.state = state
+        self.slack = slack
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+    def crawl(
+        self,
+        search_criteria: Optional[ShareWoodSearchCriteria] = None,
+        max_results: Optional[int] = None,
+    ) -> Iterator[ShareWoodTorrent]:
+        """
+        Yield the torrents uploaded since the last crawl, newest first
+
+        The listing is sorted by upload date and pages are fetched until a
+        torrent at or below the high-water mark is reached. The mark moves
+        to the newest torrent once the iteration completes, a crawl stopped
+        early yields the same torrents again next time.
+
+        Args:
+            search_criteria: Criteria narrowing the crawl, sorting is replaced (default: every torrent)
+            max_results: Maximum number of torrents of a first crawl, or of a crawl far behind, older ones are skipped for good (default: None, all)
+
+        Yields:
+            ShareWoodTorrent: New torrents, newest first
+        """
+
+        criteria = replace(search_criteria or ShareWoodSearchCriteria(), sorting="created_at", direction="desc")
+        mark = self.state.get(criteria)
+        newest: Optional[ShareWoodTorrent] = None
+        seen = set()
+
+        torrents = self.searcher.iter_search(criteria, max_results=max_results)
+        try:
+            for torrent in torrents:
+                if mark is not None and mark.reached(torrent, self.slack):
+                    break
+
+                # Uploads during the crawl shift the listing, torrents may be listed twice
+                if torrent.url in seen:
+                    continue
+                seen.add(torrent.url)
+
+                if newest is None:
+                    newest = torrent
+                self.metrics.increment("crawl.new")
+                yield torrent
+        finally:
+            # Do not prefetch pages past the mark
+            torrents.close()
+
+        # Move the mark once every new torrent was yielded
+        if newest is not None:
+            self.state.put(criteria, ShareWoodHighWaterMark(url=newest.url, id=torrent_id(newest.url), age=newest.age))
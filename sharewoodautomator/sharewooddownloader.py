@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+import requests
+
+from .exceptions import ShareWoodAuthenticationError, ShareWoodDownloadError
+from .sharewoodcrawler import torrent_id
+from .sharewoodhttpsession import ShareWoodHttpSession
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodtorrent import ShareWoodTorrent
+
+
+@dataclass
+class ShareWoodDownloadResult:
+    """Outcome of downloading one torrent file"""
+
+    torrent: ShareWoodTorrent = field(
+        metadata={"description": "Downloaded torrent"}
+    )
+    path: Optional[str] = field(
+        default=None,
+        metadata={"description": "Path of the torrent file"}
+    )
+    size: int = field(
+        default=0,
+        metadata={"description": "Number of bytes downloaded, 0 if skipped"}
+    )
+    skipped: bool = field(
+        default=False,
+        metadata={"description": "Torrent file was already on disk"}
+    )
+    error: Optional[Exception] = field(
+        default=None,
+        metadata={"description": "Error raised while downloading, None on success"}
+    )
+
+    @property
+    def ok(self) -> bool:
+        """ True if the torrent file is on disk """
+        return self.error is None
+
+
+@dataclass
+class ShareWoodDownloadReport:
+    """Outcome of downloading a batch of torrent files"""
+
+    results: List[ShareWoodDownloadResult] = field(
+        default_factory=list,
+        metadata={"description": "Result of each torrent, in completion order"}
+    )
+    elapsed: float = field(
+        default=0.0,
+        metadata={"description": "Duration of the batch in seconds"}
+    )
+
+    @property
+    def downloaded(self) -> int:
+        """ Number of torrent files downloaded """
+        return sum(1 for result in self.results if result.ok and not result.skipped)
+
+    @property
+    def skipped(self) -> int:
+        """ Number of torrent files already on disk """
+        return sum(1 for result in self.results if result.skipped)
+
+    @property
+    def failed(self) -> int:
+        """ Number of torrent files not downloaded """
+        return sum(1 for result in self.results if not result.ok)
+
+    @property
+    def bytes(self) -> int:
+        """ Number of bytes downloaded """
+        return sum(result.size for result in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """ Downloaded bytes per second """
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """ Downloaded files per second """
+        return self.downloaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.downloaded} downloaded, {self.skipped} skipped, {self.failed} failed "
+            f"in {self.elapsed:.2f}s ({self.files_per_second:.1f} files/s, {self.throughput / 1024:.1f} KiB/s)"
+        )
+
+
+class ShareWoodTorrentDownloader:
+    """ Downloads torrent files from ShareWood.tv over a pooled HTTP session """
+
+    # Size of the chunks streamed to disk
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        session: ShareWoodHttpSession,
+        download_path: str,
+        login_url: Optional[str] = None,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new torrent files downloader
+
+        Args:
+            session: Pooled HTTP session logged in to ShareWood.tv
+            download_path: Directory torrent files are saved to
+            login_url: Login page URL, downloads redirected to it need a new login (default: None)
+            metrics: Timers and counters of the downloads (default: disabled)
+        """
+
+        self.session = session
+        self.download_path = os.path.expanduser(download_path)
+        self.login_url = login_url
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+    def target_path(self, torrent: ShareWoodTorrent) -> str:
+        """
+        Path a torrent file is saved to
+
+        Args:
+            torrent: Torrent to download
+
+        Returns:
+            str: Path of the torrent file, named after the torrent title and ID, torrents may share a title
+        """
+
+        name = torrent.title
+        if name and torrent_id(torrent.url) is not None:
+            name = f"{name}.{torrent_id(torrent.url)}"
+        elif not name:
+            # Page URL ends with "<slug>.<id>"
+            name = (torrent.url or torrent.download_link).rstrip("/").rsplit("/", 1)[-1]
+
+        # Path separators and control characters are not allowed in file names
+        name = re.sub(r"[\x00-\x1f/\\]", "_", name)
+
+        return os.path.join(self.download_path, f"{name}.torrent")
+
+    def download(self, torrent: ShareWoodTorrent, overwrite: bool = False) -> ShareWoodDownloadResult:
+        """
+        Download a torrent file, streamed to a temporary file renamed once complete
+
+        Args:
+            torrent: Torrent to download
+            overwrite: Download the torrent file even if already on disk (default: False)
+
+        Returns:
+            ShareWoodDownloadResult: Path and size of the torrent file
+
+        Raises:
+            ShareWoodDownloadError: If the torrent has no download link, cannot be downloaded or is not a torrent file
+            ShareWoodAuthenticationError: If the session is redirected to the login page
+        """
+
+        # Check if download link is available
+        if not torrent.download_link:
+            raise ShareWoodDownloadError(f"No download link available for {torrent.url}")
+
+        path = self.target_path(torrent)
+
+        # Files are only renamed to their final path once complete
+        if not overwrite and os.path.exists(path):
+            torrent.downloaded = True
+            torrent.downloaded_path = path
+            self.metrics.increment("download.skipped")
+            return ShareWoodDownloadResult(torrent=torrent, path=path, skipped=True)
+
+        os.makedirs(self.download_path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.download_path, prefix=".download-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as torrent_file, self.metrics.timer("download.file"):
+                with self.session.get(torrent.download_link, stream=True) as response:
+                    response.raise_for_status()
+                    # An expired session is redirected to the login page, served as 200
+                    if self.login_url and response.url.startswith(self.login_url):
+                        raise ShareWoodAuthenticationError("ShareWood.tv session is not logged in")
+                    # Torrent files are also served as application/octet-stream or without content type
+                    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+                    if content_type == "text/html":
+                        raise ShareWoodDownloadError(f"{torrent.download_link} is an HTML page, not a torrent file")
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        # Torrent files are bencoded dictionaries
+                        if not size and not chunk.startswith(b"d"):
+                            raise ShareWoodDownloadError(f"{torrent.download_link} is not a torrent file")
+                        torrent_file.write(chunk)
+                        size += len(chunk)
+                    if not size:
+                        raise ShareWoodDownloadError(f"{torrent.download_link} is an empty file")
+            os.replace(tmp_path, path)
+        except BaseException as e:
+            os.unlink(tmp_path)
+            if isinstance(e, (requests.RequestException, OSError)):
+                raise ShareWoodDownloadError(original_exception=e) from e
+            raise
+
+        torrent.downloaded = True
+        torrent.downloaded_path = path
+        self.metrics.increment("download.files")
+        self.metrics.increment("download.bytes", size)
+
+        return ShareWoodDownloadResult(torrent=torrent, path=path, size=size)
+
+    def download_many(
+        self,
+        torrents: Iterable[ShareWoodTorrent],
+        concurrency: int = 4,
+        overwrite: bool = False,
+    ) -> ShareWoodDownloadReport:
+        """
+        Download several torrent files concurrently
+
+        Errors are reported per torrent instead of being raised.
+
+        Args:
+            torrents: Torrents to download
+            concurrency: Number of files downloaded at once (default: 4)
+            overwrite: Download torrent files even if already on disk (default: False)
+
+        Returns:
+            ShareWoodDownloadReport: Result of each torrent and batch throughput
+        """
+
+        report = ShareWoodDownloadReport()
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(self.download, torrent, overwrite): torrent for torrent in torrents}
+
+            for future in as_completed(futures):
+                try:
+                    report.results.append(future.result())
+                except Exception as e:
+                    # Report error for this torrent only
+                    self.metrics.increment("download.errors")
+                    report.results.append(ShareWoodDownloadResult(torrent=futures[future], error=e))
+
+        report.elapsed = time.perf_counter() - start
+
+        return report
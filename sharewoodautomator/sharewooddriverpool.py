@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from .exceptions import ShareWoodPoolError
+
+if TYPE_CHECKING:  # pragma: no cover - Selenium is only imported by the browser backend
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def is_driver_alive(driver: "WebDriver") -> bool:
+    """
+    Check that a WebDriver still answers commands
+
+    Args:
+        driver: Selenium WebDriver instance
+
+    Returns:
+        True if the driver answers, False otherwise
+    """
+
+    try:
+        return driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+class ShareWoodDriverPool:
+    """ Bounded pool of logged-in WebDriver instances """
+
+    def __init__(
+        self,
+        driver_factory: Callable[[], "WebDriver"],
+        size: int,
+        health_check: Optional[Callable[["WebDriver"], bool]] = None,
+        checkout_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize a new WebDriver pool, drivers are created on first checkout
+
+        Args:
+            driver_factory: Callable creating a new logged-in WebDriver
+            size: Maximum number of WebDriver instances
+            health_check: Callable checking a driver before checkout (default: is_driver_alive)
+            checkout_timeout: Seconds to wait for a free driver, None waits forever (default: None)
+
+        Raises:
+            ValueError: If size is lower than 1
+        """
+
+        # Check pool size
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}")
+
+        self.driver_factory = driver_factory
+        self.size = size
+        self.health_check = health_check or is_driver_alive
+        self.checkout_timeout = checkout_timeout
+
+        # Idle drivers, last checked in is checked out first (warmest)
+        self._idle: "queue.LifoQueue[WebDriver]" = queue.LifoQueue()
+        # One slot per driver, checked out or creatable
+        self._slots = threading.BoundedSemaphore(size)
+        # Every driver created and not discarded
+        self._drivers: List["WebDriver"] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __len__(self) -> int:
+        """ Number of live WebDriver instances """
+        return len(self._drivers)
+
+    def checkout(self, timeout: Optional[float] = None) -> "WebDriver":
+        """
+        Check out a healthy driver, creating one if no idle driver is available
+
+        Args:
+            timeout: Seconds to wait for a free driver (default: checkout_timeout)
+
+        Returns:
+            WebDriver: Logged-in WebDriver instance, to be checked in after use
+
+        Raises:
+            ShareWoodPoolError: If the pool is closed or no driver is freed in time
+        """
+
+        if self._closed:
+            raise ShareWoodPoolError("WebDriver pool is closed")
+
+        # Wait for a free slot
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise ShareWoodPoolError(f"No WebDriver available after {timeout} seconds")
+
+        try:
+            # Reuse an idle driver if it passes the health check
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self.health_check(driver):
+                    return driver
+                self._discard(driver)
+
+            # Otherwise create a new one
+            driver = self.driver_factory()
+            with self._lock:
+                self._drivers.append(driver)
+            return driver
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver: "WebDriver", discard: Optional[bool] = False) -> None:
+        """
+        Check in a driver previously checked out
+
+        Args:
+            driver: WebDriver instance to give back to the pool
+            discard: Quit the driver instead of keeping it (default: False)
+        """
+
+        if discard or self._closed:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+        self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator["WebDriver"]:
+        """
+        Borrow a driver for the duration of a with block
+
+        A driver raising a WebDriverException is discarded instead of being checked in.
+
+        Args:
+            timeout: Seconds to wait for a free driver (default: checkout_timeout)
+
+        Yields:
+            WebDriver: Logged-in WebDriver instance
+        """
+
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        except WebDriverException:
+            self.checkin(driver, discard=True)
+            raise
+        except BaseException:
+            self.checkin(driver)
+            raise
+        else:
+            self.checkin(driver)
+
+    def close(self) -> None:
+        """
+        Quit every idle driver, drivers still checked out are quit on checkin
+        """
+
+        self._closed = True
+
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _discard(self, driver: "WebDriver") -> None:
+        """
+        Quit a driver and forget it
+
+        Args:
+            driver: WebDriver instance to quit
+        """
+
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
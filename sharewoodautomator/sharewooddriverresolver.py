@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from typing import Optional, Tuple
+
+from .exceptions import ShareWoodDriverError
+from .sharewoodcache import ShareWoodSQLiteCache
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+
+# Commands printing the installed Chrome version, first found is used
+CHROME_VERSION_COMMANDS: Tuple[Tuple[str, ...], ...] = {
+    "darwin": (
+        ("/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"),
+        ("/Applications/Chromium.app/Contents/MacOS/Chromium", "--version"),
+    ),
+    "win32": (
+        ("reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"),
+        ("reg", "query", r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon", "/v", "version"),
+    ),
+}.get(sys.platform, (
+    ("google-chrome", "--version"),
+    ("google-chrome-stable", "--version"),
+    ("chromium", "--version"),
+    ("chromium-browser", "--version"),
+))
+
+# Version number in the output of CHROME_VERSION_COMMANDS
+CHROME_VERSION_PATTERN = re.compile(r"\b(\d+\.\d+\.\d+\.\d+)\b")
+
+# Name of the driver executable looked up in PATH when offline
+DRIVER_EXECUTABLE = "chromedriver.exe" if sys.platform == "win32" else "chromedriver"
+
+
+def is_executable(path: Optional[str]) -> bool:
+    """ Whether a path is an executable file """
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def chrome_version(timeout: float = 5) -> Optional[str]:
+    """
+    Detect the installed Chrome version, without network
+
+    Args:
+        timeout: Seconds each version command may run (default: 5)
+
+    Returns:
+        str: Full Chrome version, "120.0.6099.109", None if Chrome is not found
+    """
+
+    for command in CHROME_VERSION_COMMANDS:
+        try:
+            output = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                universal_newlines=True,
+                timeout=timeout,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = CHROME_VERSION_PATTERN.search(output)
+        if match:
+            return match.group(1)
+
+    return None
+
+
+class ShareWoodDriverCache(ShareWoodSQLiteCache):
+    """ On-disk cache of the resolved chromedriver paths, keyed by Chrome version """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS drivers (
+            chrome_version TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            resolved_at REAL NOT NULL
+        )
+        """,
+    )
+
+    def get(self, version: str) -> Optional[str]:
+        """
+        Get the driver resolved for a Chrome version
+
+        Args:
+            version: Full Chrome version
+
+        Returns:
+            str: Path of the driver, None if never resolved
+        """
+
+        with self._lock:
+            row = self._connection.execute("SELECT path FROM drivers WHERE chrome_version = ?", (version,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def put(self, version: str, path: str) -> None:
+        """
+        Store the driver resolved for a Chrome version
+
+        Args:
+            version: Full Chrome version
+            path: Path of the driver
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO drivers (chrome_version, path, resolved_at) VALUES (?, ?, ?)",
+                (version, path, time.time()),
+            )
+
+    def clear(self) -> None:
+        """
+        Forget every resolved driver
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM drivers")
+
+
+class ShareWoodDriverResolver:
+    """ Finds the chromedriver matching the installed Chrome, installing it only when needed """
+
+    def __init__(
+        self,
+        cache: Optional[ShareWoodDriverCache] = None,
+        driver_path: Optional[str] = None,
+        offline: Optional[bool] = False,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new chromedriver resolver
+
+        Args:
+            cache: Resolved drivers cache (default: disabled, every resolution installs)
+            driver_path: Driver to use as is, nothing is detected nor installed (default: None)
+            offline: Never download a driver, use the cached one or the one in PATH (default: False)
+            metrics: Timers and counters of the resolutions (default: disabled)
+        """
+
+        self.cache = cache
+        self.driver_path = driver_path
+        self.offline = offline
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+    def resolve(self) -> str:
+        """
+        Resolve the chromedriver to start Chrome with
+
+        The driver path override is used as is. Otherwise the driver cached
+        for the installed Chrome version is reused while it exists. On a
+        cache miss the driver is installed by webdriver_manager, or looked
+        up in PATH when offline.
+
+        Returns:
+            str: Path of the driver executable
+
+        Raises:
+            ShareWoodDriverError: If no driver can be found or installed
+        """
+
+        with self.metrics.timer("driver.resolve"):
+            # Explicit driver, nothing to detect
+            if self.driver_path:
+                path = os.path.expanduser(self.driver_path)
+                if not is_executable(path):
+                    raise ShareWoodDriverError(f"Chromedriver override is not an executable: {path}")
+                return path
+
+            # Driver already resolved for this Chrome version
+            version = chrome_version() if self.cache is not None else None
+            if version is not None:
+                path = self.cache.get(version)
+                if is_executable(path):
+                    self.metrics.increment("driver.cache_hits")
+                    return path
+
+            path = self._find_offline() if self.offline else self._install()
+
+            if version is not None:
+                self.cache.put(version, path)
+
+            return path
+
+    def _find_offline(self) -> str:
+        """
+        Find a driver in PATH, without network
+
+        Returns:
+            str: Path of the driver executable
+
+        Raises:
+            ShareWoodDriverError: If no driver is in PATH
+        """
+
+        path = shutil.which(DRIVER_EXECUTABLE)
+        if path is None:
+            raise ShareWoodDriverError(
+                "No cached chromedriver for this Chrome version and none in PATH, set CHROMEDRIVER_PATH or go online once"
+            )
+
+        return path
+
+    def _install(self) -> str:
+        """
+        Install the driver matching Chrome with webdriver_manager, a network request
+
+        Returns:
+            str: Path of the driver executable
+
+        Raises:
+            ShareWoodDriverError: If the driver cannot be installed
+        """
+
+        # webdriver_manager is only imported when a driver has to be installed
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        self.metrics.increment("driver.installs")
+        try:
+            with self.metrics.timer("driver.install"):
+                return ChromeDriverManager().install()
+        except Exception as e:
+            raise ShareWoodDriverError(original_exception=e) from e
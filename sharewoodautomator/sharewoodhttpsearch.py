@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional
+
+import requests
+
+from .exceptions import ShareWoodAuthenticationError, ShareWoodSearchError
+from .sharewoodhttpsession import ShareWoodHttpSession
+from .sharewoodmetrics import ShareWoodMetrics
+from .sharewoodparser import ShareWoodHtmlParser
+from .sharewoodsearch import ShareWoodSearch
+from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+
+class ShareWoodHttpSearch(ShareWoodSearch):
+    """Searches for torrents on ShareWood.tv without a browser"""
+
+    # Pooled HTTP session fetches the next page while the current one is consumed
+    supports_prefetch = True
+
+    def __init__(
+        self,
+        session: ShareWoodHttpSession,
+        search_url: str,
+        timeout: int,
+        login_url: Optional[str] = None,
+        ignore_parsing_errors: Optional[bool] = False,
+        parser: Optional[ShareWoodHtmlParser] = None,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new browserless search on ShareWood.tv
+
+        Args:
+            session: Pooled HTTP session holding ShareWood.tv authenticated cookies
+            search_url: URL of ShareWood.tv torrents listing
+            timeout: Timeout in seconds for HTTP requests
+            login_url: URL of ShareWood.tv login page, used to detect expired sessions
+            ignore_parsing_errors: Ignore parsing errors (default: False)
+            parser: HTML parser of search results (default: fastest installed)
+            metrics: Timers and counters of the search phases (default: disabled)
+        """
+
+        super().__init__(
+            browser=None,
+            search_url=search_url,
+            timeout=timeout,
+            ignore_parsing_errors=ignore_parsing_errors,
+            parser=parser,
+            metrics=metrics,
+        )
+
+        # Pooled HTTP session
+        self.session = session
+        # URL of ShareWood.tv login page
+        self.login_url = login_url
+
+    def search(self, search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+        """
+        Search for torrents on ShareWood.tv by requesting the torrents listing directly
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+
+        Returns:
+            List of parsed search results as ShareWoodTorrent
+
+        Raises:
+            ShareWoodAuthenticationError: If the session is not logged in
+            ShareWoodSearchError: If the torrents listing cannot be fetched
+        """
+
+        return self.fetch_page(search_criteria, 1)
+
+    def fetch_page(self, search_criteria: ShareWoodSearchCriteria, page: int) -> List[ShareWoodTorrent]:
+        """
+        Fetch one page of the torrents listing on ShareWood.tv
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+            page: Page number, starting at 1
+
+        Returns:
+            List of parsed search results as ShareWoodTorrent
+
+        Raises:
+            ShareWoodAuthenticationError: If the session is not logged in
+            ShareWoodSearchError: If the torrents listing cannot be fetched
+        """
+
+        try:
+            # Request torrents listing, criteria and page number as query string
+            with self.metrics.timer("search.request"):
+                response = self.session.get(
+                    search_criteria.to_url(self.search_url, page),
+                    timeout=self.timeout,
+                )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise ShareWoodSearchError(original_exception=e) from e
+
+        # Expired or missing session cookies redirect to the login page
+        if self.login_url and response.url.startswith(self.login_url):
+            raise ShareWoodAuthenticationError("ShareWood.tv session is not logged in")
+
+        # Return parsed search results
+        return self.parse_search_result(response.text)
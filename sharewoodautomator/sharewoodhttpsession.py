@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:  # pragma: no cover - Selenium is only imported by the browser backend
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class ShareWoodHttpSession(requests.Session):
+    """ Pooled HTTP session reusing ShareWood.tv authenticated cookies """
+
+    def __init__(self, timeout: int, pool_size: Optional[int] = 10) -> None:
+        """
+        Initialize a new pooled HTTP session
+
+        Args:
+            timeout: Timeout in seconds applied to every request
+            pool_size: Maximum number of kept-alive connections per host (default: 10)
+        """
+
+        super().__init__()
+
+        # Default timeout for every request
+        self.timeout = timeout
+
+        # Keep connections alive and reuse them between requests
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request, applying the session timeout when none is given
+
+        Args:
+            method: HTTP method
+            url: Requested URL
+            **kwargs: Extra arguments passed to requests.Session.request
+
+        Returns:
+            requests.Response: Response of the request
+        """
+
+        kwargs.setdefault("timeout", self.timeout)
+
+        return super().request(method, url, **kwargs)
+
+    def load_cookies(self, cookies: Iterable[Dict[str, Any]]) -> None:
+        """
+        Load cookies into the session
+
+        Args:
+            cookies: Cookies as dictionaries (Selenium get_cookies() format)
+        """
+
+        for cookie in cookies:
+            self.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        """
+        Cookies of the session
+
+        Returns:
+            list[dict]: Cookies as dictionaries (Selenium get_cookies() format)
+        """
+
+        cookies = []
+        for cookie in self.cookies:
+            values = {"name": cookie.name, "value": cookie.value, "path": cookie.path}
+            # Host-only cookies have no domain, browsers set them for the current page
+            if cookie.domain:
+                values["domain"] = cookie.domain
+            cookies.append(values)
+
+        return cookies
+
+    def load_browser_cookies(self, browser: "WebDriver") -> None:
+        """
+        Reuse the authenticated cookies and user agent of a browser
+
+        Args:
+            browser: Selenium WebDriver instance logged in to ShareWood.tv
+        """
+
+        # Copy authenticated cookies
+        self.load_cookies(browser.get_cookies())
+
+        # Use the same user agent as the browser session the cookies belong to
+        user_agent = browser.execute_script("return navigator.userAgent")
+        if user_agent:
+            self.headers["User-Agent"] = user_agent
+
+    def is_logged_in(self, home_url: str, login_url: str) -> bool:
+        """
+        Check whether the session cookies are logged in to ShareWood.tv
+
+        Requests the home page without following redirects, logged out
+        sessions are redirected to the login page.
+
+        Args:
+            home_url: URL of ShareWood.tv home page
+            login_url: URL of ShareWood.tv login page
+        Returns:
+            True if logged in, False otherwise
+        """
+
+        try:
+            response = self.get(home_url, allow_redirects=False)
+        except requests.RequestException:
+            return False
+
+        if response.is_redirect:
+            return not urljoin(home_url, response.headers["Location"]).startswith(login_url)
+
+        return response.ok
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .sharewoodcache import ShareWoodSQLiteCache
+from .sharewoodsearchcriteria import SORT_FIELDS, ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+# SQLite type of the ShareWoodTorrent fields types, flags are stored as 0/1
+SQL_TYPES = {
+    Optional[bool]: "INTEGER",
+    Optional[int]: "INTEGER",
+    Optional[float]: "REAL",
+    Optional[str]: "TEXT",
+}
+
+# Indexed ShareWoodTorrent fields, local state of a torrent (downloaded, path) is not indexed
+COLUMNS = tuple(
+    (torrent_field.name, SQL_TYPES[torrent_field.type])
+    for torrent_field in fields(ShareWoodTorrent)
+    if torrent_field.init
+)
+
+# Fields read back as flags
+FLAG_COLUMNS = tuple(torrent_field.name for torrent_field in fields(ShareWoodTorrent) if torrent_field.type == Optional[bool])
+
+# Full-text indexed fields, criteria field matched against each
+TEXT_COLUMNS = (("query", "title"), ("description", "description"), ("tags", "tags"))
+
+# Listing types answerable from indexed fields, others are ignored by local searches
+TYPE_CONDITIONS = {
+    "freeleech": "discounts = 1",
+    "doubleupload": "discounts = 1",
+}
+
+# Number of results of a listing page when the criteria have no quantity
+DEFAULT_QUANTITY = 25
+
+
+def fts_phrase(text: str, separator: Optional[str] = None) -> str:
+    """
+    Quote the words of a text as an FTS5 query matching all of them
+
+    Args:
+        text: Words typed by the user
+        separator: Separator of the words (default: whitespace)
+
+    Returns:
+        str: FTS5 query, each word quoted so that FTS5 operators are matched literally
+    """
+
+    words = [word.strip() for word in text.split(separator)]
+
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in words if word)
+
+
+class ShareWoodIndex(ShareWoodSQLiteCache):
+    """ Persistent local index of ShareWood.tv torrents, searchable offline """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS torrents ({}, indexed_at REAL NOT NULL)".format(
+            ", ".join(f"{name} {sql_type}" + (" PRIMARY KEY" if name == "url" else "") for name, sql_type in COLUMNS)
+        ),
+        "CREATE INDEX IF NOT EXISTS torrents_seeders ON torrents (seeders)",
+        "CREATE INDEX IF NOT EXISTS torrents_size ON torrents (size)",
+        "CREATE INDEX IF NOT EXISTS torrents_age ON torrents (age)",
+        "CREATE INDEX IF NOT EXISTS torrents_category ON torrents (category, subcategory)",
+        # Full-text index kept in sync with the torrents table by triggers
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS torrents_fts USING fts5(
+            title, description, tags,
+            content='torrents', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS torrents_ai AFTER INSERT ON torrents BEGIN
+            INSERT INTO torrents_fts (rowid, title, description, tags)
+            VALUES (new.rowid, new.title, new.description, new.tags);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS torrents_ad AFTER DELETE ON torrents BEGIN
+            INSERT INTO torrents_fts (torrents_fts, rowid, title, description, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.tags);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS torrents_au AFTER UPDATE ON torrents BEGIN
+            INSERT INTO torrents_fts (torrents_fts, rowid, title, description, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.tags);
+            INSERT INTO torrents_fts (rowid, title, description, tags)
+            VALUES (new.rowid, new.title, new.description, new.tags);
+        END
+        """,
+    )
+
+    # Known values are kept when a newer source lacks them, a listing row has no description
+    UPSERT = "INSERT INTO torrents ({names}, indexed_at) VALUES ({placeholders}, ?) ON CONFLICT (url) DO UPDATE SET {updates}, indexed_at = excluded.indexed_at".format(
+        names=", ".join(name for name, _ in COLUMNS),
+        placeholders=", ".join("?" for _ in COLUMNS),
+        updates=", ".join(f"{name} = COALESCE(excluded.{name}, {name})" for name, _ in COLUMNS if name != "url"),
+    )
+
+    def __len__(self) -> int:
+        """ Number of indexed torrents """
+
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM torrents").fetchone()[0]
+
+    def upsert(self, torrents: Iterable[ShareWoodTorrent]) -> None:
+        """
+        Add torrents to the index, or complete the indexed ones
+
+        Args:
+            torrents: Torrents from search results or scraped pages, torrents without URL are skipped
+        """
+
+        now = time.time()
+        rows = [
+            (*(getattr(torrent, name) for name, _ in COLUMNS), now)
+            for torrent in torrents
+            if torrent.url
+        ]
+
+        with self._lock, self._connection:
+            self._connection.executemany(self.UPSERT, rows)
+
+    def get(self, url: str) -> Optional[ShareWoodTorrent]:
+        """
+        Get an indexed torrent
+
+        Args:
+            url: URL of the torrent page
+
+        Returns:
+            ShareWoodTorrent: Indexed torrent, None if not indexed
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT {} FROM torrents WHERE url = ?".format(", ".join(name for name, _ in COLUMNS)), (url,)
+            ).fetchone()
+
+        return self._torrent(row) if row is not None else None
+
+    def search(self, search_criteria: ShareWoodSearchCriteria) -> List[ShareWoodTorrent]:
+        """
+        Search indexed torrents as ShareWood.tv would list them
+
+        Query, description and tags are matched by the full-text index,
+        accents and case ignored. Listing types other than freeleech and
+        doubleupload are not indexed and are ignored.
+
+        Args:
+            search_criteria: Search criteria
+
+        Returns:
+            list[ShareWoodTorrent]: Matching torrents, sorted and limited as the listing
+        """
+
+        sql, params = self._query(search_criteria)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        return [self._torrent(row) for row in rows]
+
+    def clear(self) -> None:
+        """
+        Delete every indexed torrent
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM torrents")
+
+    def _query(self, search_criteria: ShareWoodSearchCriteria) -> Tuple[str, List[Any]]:
+        """
+        SQL query of search criteria
+
+        Args:
+            search_criteria: Search criteria
+
+        Returns:
+            tuple: SQL query and its parameters
+        """
+
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        # Full-text criteria, each restricted to its column
+        phrases = []
+        for criteria_name, column in TEXT_COLUMNS:
+            value = getattr(search_criteria, criteria_name)
+            phrase = fts_phrase(value, "," if criteria_name == "tags" else None) if value else ""
+            if phrase:
+                phrases.append(f"{column} : ({phrase})")
+        if phrases:
+            conditions.append("rowid IN (SELECT rowid FROM torrents_fts WHERE torrents_fts MATCH ?)")
+            params.append(" AND ".join(phrases))
+
+        if search_criteria.uploader:
+            conditions.append("uploader LIKE ?")
+            params.append(f"%{search_criteria.uploader}%")
+
+        # Checked options, any of them matches
+        for column, options in (("category", search_criteria.categories), ("subcategory", search_criteria.subcategories)):
+            checked = [option for option, selected in (options or {}).items() if selected]
+            if checked:
+                conditions.append("{} IN ({})".format(column, ", ".join("?" for _ in checked)))
+                params.extend(checked)
+
+        languages = [option for option, selected in (search_criteria.languages or {}).items() if selected]
+        if languages:
+            conditions.append("({})".format(" OR ".join("languages LIKE ?" for _ in languages)))
+            params.extend(f"%{language}%" for language in languages)
+
+        for option, selected in (search_criteria.types or {}).items():
+            if selected and option in TYPE_CONDITIONS:
+                conditions.append(TYPE_CONDITIONS[option])
+
+        # Listing default order is the most recent first, missing values last
+        column = SORT_FIELDS.get(search_criteria.sorting or "created_at", "age")
+        direction = "ASC" if search_criteria.direction == "asc" else "DESC"
+
+        sql = "SELECT {} FROM torrents{} ORDER BY {} IS NULL, {} {} LIMIT ?".format(
+            ", ".join(name for name, _ in COLUMNS),
+            " WHERE " + " AND ".join(conditions) if conditions else "",
+            column,
+            column,
+            direction,
+        )
+        params.append(search_criteria.quantity or DEFAULT_QUANTITY)
+
+        return sql, params
+
+    @staticmethod
+    def _torrent(row: Tuple[Any, ...]) -> ShareWoodTorrent:
+        """ Torrent of an indexed row """
+
+        values: Dict[str, Any] = dict(zip((name for name, _ in COLUMNS), row))
+        for name in FLAG_COLUMNS:
+            if values[name] is not None:
+                values[name] = bool(values[name])
+
+        return ShareWoodTorrent(**values)
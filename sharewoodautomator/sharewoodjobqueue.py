@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from .sharewoodcache import ShareWoodSQLiteCache
+from .sharewoodsearchcriteria import ShareWoodSearchCriteria
+from .sharewoodtorrent import ShareWoodTorrent
+
+# Kinds of jobs, a search of the listing or a scrape of a torrent page
+JOB_KINDS = ("search", "scrape")
+
+# Statuses of jobs
+JOB_STATUSES = ("pending", "leased", "done", "failed")
+
+
+@dataclass
+class ShareWoodJob:
+    """Job leased from a ShareWoodJobQueue"""
+
+    id: int = field(
+        metadata={"description": "Job ID"}
+    )
+    kind: str = field(
+        metadata={"description": "Kind of job, search or scrape"}
+    )
+    target: str = field(
+        metadata={"description": "Listing query string of a search, page URL of a scrape"}
+    )
+    attempts: int = field(
+        default=1,
+        metadata={"description": "Number of leases of the job, this one included"}
+    )
+    lease: Optional[str] = field(
+        default=None,
+        metadata={"description": "Lease token, only its holder may complete, fail or release the job"}
+    )
+
+    @property
+    def search_criteria(self) -> ShareWoodSearchCriteria:
+        """ Search criteria of a search job """
+        return ShareWoodSearchCriteria.from_query_params(self.target)
+
+
+class ShareWoodJobQueue(ShareWoodSQLiteCache):
+    """ Durable queue of search and scrape jobs, shared by worker processes through one SQLite file """
+
+    # Workers of several processes wait for each other's leases and results
+    TIMEOUT = 30.0
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            target TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease TEXT,
+            worker TEXT,
+            error TEXT,
+            result TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            UNIQUE (kind, target)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS jobs_status_available_at ON jobs (status, available_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        retry_delay: float = 30,
+    ) -> None:
+        """
+        Initialize a new job queue
+
+        Args:
+            path: Path of the SQLite queue file, on a filesystem with working locks when shared between machines
+            lease_seconds: Seconds a worker holds a job, an expired lease is handed to another worker (default: 300)
+            max_attempts: Leases of a job before it is failed for good (default: 3)
+            retry_delay: Seconds before a failed job is retried, doubled at each attempt (default: 30)
+        """
+
+        super().__init__(path)
+
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def __len__(self) -> int:
+        """ Number of jobs, finished included """
+
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def put(self, kind: str, targets: Iterable[str]) -> int:
+        """
+        Add jobs, a job already queued is not added twice
+
+        A finished or failed job is queued again.
+
+        Args:
+            kind: Kind of the jobs, search or scrape
+            targets: Listing query string of each search, or page URL of each scrape
+
+        Returns:
+            int: Number of jobs added or queued again
+
+        Raises:
+            ValueError: If the kind is unknown
+        """
+
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        now = time.time()
+        rows = [(kind, target, now, now, now) for target in targets]
+
+        with self._lock, self._connection:
+            changes = self._connection.total_changes
+            self._connection.executemany(
+                """
+                INSERT INTO jobs (kind, target, status, available_at, created_at, updated_at)
+                VALUES (?, ?, 'pending', ?, ?, ?)
+                ON CONFLICT (kind, target) DO UPDATE SET
+                    status = 'pending', attempts = 0, available_at = excluded.available_at,
+                    lease = NULL, worker = NULL, error = NULL, result = NULL, updated_at = excluded.updated_at
+                WHERE status IN ('done', 'failed')
+                """,
+                rows,
+            )
+
+            return self._connection.total_changes - changes
+
+    def put_searches(self, search_criteria_list: Iterable[ShareWoodSearchCriteria]) -> int:
+        """
+        Add search jobs
+
+        Args:
+            search_criteria_list: Search criteria of each search
+
+        Returns:
+            int: Number of jobs added or queued again
+        """
+
+        # Sorted parameters, criteria listing the same torrents are one job
+        return self.put("search", (urlencode(sorted(criteria.to_query_params())) for criteria in search_criteria_list))
+
+    def put_scrapes(self, torrents: Iterable[ShareWoodTorrent]) -> int:
+        """
+        Add scrape jobs
+
+        Args:
+            torrents: Torrents to scrape the page of, torrents without URL are skipped
+
+        Returns:
+            int: Number of jobs added or queued again
+        """
+
+        return self.put("scrape", (torrent.url for torrent in torrents if torrent.url))
+
+    def lease(self, worker: str, limit: int = 1, kinds: Optional[Iterable[str]] = None) -> List[ShareWoodJob]:
+        """
+        Lease the oldest available jobs
+
+        Pending jobs are available once their retry delay is over, leased
+        jobs once their lease expired, their worker being presumably dead.
+
+        Args:
+            worker: Name of the worker, for the record
+            limit: Maximum number of jobs to lease (default: 1)
+            kinds: Kinds of jobs to lease (default: every kind)
+
+        Returns:
+            list[ShareWoodJob]: Leased jobs, empty if none is available
+        """
+
+        kinds = list(kinds or JOB_KINDS)
+        lease = uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock, self._connection:
+            # Expired leases of a last attempt are not retried
+            self._connection.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = 'Lease expired', lease = NULL, updated_at = ?
+                WHERE status = 'leased' AND available_at <= ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+
+            # A single statement, two workers never lease the same job
+            self._connection.execute(
+                """
+                UPDATE jobs SET status = 'leased', attempts = attempts + 1, available_at = ?,
+                    lease = ?, worker = ?, updated_at = ?
+                WHERE id IN (
+                    SELECT id FROM jobs
+                    WHERE status IN ('pending', 'leased') AND available_at <= ?
+                        AND kind IN ({})
+                    ORDER BY id LIMIT ?
+                )
+                """.format(", ".join("?" for _ in kinds)),
+                (now + self.lease_seconds, lease, worker, now, now, *kinds, limit),
+            )
+
+            rows = self._connection.execute(
+                "SELECT id, kind, target, attempts FROM jobs WHERE lease = ? ORDER BY id", (lease,)
+            ).fetchall()
+
+        return [ShareWoodJob(*row, lease=lease) for row in rows]
+
+    def complete(self, job: ShareWoodJob, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a leased job as done
+
+        Args:
+            job: Leased job
+            result: Summary of the job outcome, JSON serializable (default: None)
+
+        Returns:
+            bool: False if the lease expired and the job was handed to another worker
+        """
+
+        return self._finish(
+            job,
+            "UPDATE jobs SET status = 'done', lease = NULL, error = NULL, result = ?, updated_at = ? WHERE id = ? AND lease = ?",
+            (json.dumps(result, ensure_ascii=False) if result is not None else None, time.time()),
+        )
+
+    def fail(self, job: ShareWoodJob, error: str) -> bool:
+        """
+        Mark a leased job as failed, to be retried after a delay unless it was its last attempt
+
+        Args:
+            job: Leased job
+            error: Error message
+
+        Returns:
+            bool: False if the lease expired and the job was handed to another worker
+        """
+
+        now = time.time()
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+
+        return self._finish(
+            job,
+            "UPDATE jobs SET status = ?, available_at = ?, lease = NULL, error = ?, updated_at = ? WHERE id = ? AND lease = ?",
+            (status, now + self.retry_delay * 2 ** (job.attempts - 1), error, now),
+        )
+
+    def renew(self, job: ShareWoodJob) -> bool:
+        """
+        Extend the lease of a job still running by lease_seconds
+
+        Args:
+            job: Leased job
+
+        Returns:
+            bool: False if the lease expired and the job was handed to another worker
+        """
+
+        now = time.time()
+
+        return self._finish(
+            job,
+            "UPDATE jobs SET available_at = ?, updated_at = ? WHERE status = 'leased' AND id = ? AND lease = ?",
+            (now + self.lease_seconds, now),
+        )
+
+    def release(self, job: ShareWoodJob) -> bool:
+        """
+        Give a leased job back without counting the attempt, e.g. when the worker stops
+
+        Args:
+            job: Leased job
+
+        Returns:
+            bool: False if the lease expired and the job was handed to another worker
+        """
+
+        now = time.time()
+
+        return self._finish(
+            job,
+            "UPDATE jobs SET status = 'pending', attempts = attempts - 1, available_at = ?, lease = NULL, updated_at = ? WHERE id = ? AND lease = ?",
+            (now, now),
+        )
+
+    def _finish(self, job: ShareWoodJob, sql: str, params: tuple) -> bool:
+        """ Update a job if its lease is still held """
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(sql, (*params, job.id, job.lease))
+
+        return cursor.rowcount == 1
+
+    def retry_failed(self) -> int:
+        """
+        Queue the failed jobs again, with all their attempts
+
+        Returns:
+            int: Number of jobs queued again
+        """
+
+        now = time.time()
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'failed'",
+                (now, now),
+            )
+
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of jobs of each status
+
+        Returns:
+            dict: Number of pending, leased, done and failed jobs
+        """
+
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+
+        return {**{status: 0 for status in JOB_STATUSES}, **dict(rows)}
+
+    def clear(self) -> None:
+        """
+        Delete every job
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM jobs")
@@ -1,17 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from typing import Any, Dict, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from .exceptions import ShareWoodPageError
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodwait import ShareWoodWait
 
 
 class ShareWoodLogging:
     """Centralized logging facility for ShareWood.tv"""
 
-    def __init__(self, browser: WebDriver, home_url: str, login_url: str, logout_url: str, timeout: int) -> None:
+    def __init__(
+        self,
+        browser: WebDriver,
+        home_url: str,
+        login_url: str,
+        logout_url: str,
+        timeout: int,
+        metrics: Optional[ShareWoodMetrics] = None,
+        wait: Optional[ShareWoodWait] = None,
+    ) -> None:
         """
         ShareWood.tv logging manager
 
@@ -20,7 +33,9 @@ class ShareWoodLogging:
             home_url: URL for ShareWood.tv home page
             login_url: URL for ShareWood.tv login page
             logout_url: URL for ShareWood.tv logout page
-            timeout: Timeout for WebDriverWait
+            timeout: Seconds allowed to each login phase
+            metrics: Timers and counters of the login phases (default: disabled)
+            wait: Wait engine of the browser (default: new engine with timeout)
         """
 
         self.browser = browser
@@ -28,6 +43,8 @@ class ShareWoodLogging:
         self.login_url = login_url
         self.logout_url = logout_url
         self.timeout = timeout
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.wait = wait if wait is not None else ShareWoodWait(browser, timeout, metrics=self.metrics)
 
     def connect(self, pseudo: str, password: str) -> bool:
         """
@@ -41,38 +58,30 @@ class ShareWoodLogging:
         """
 
         try:
-            self.browser.get(self.login_url)
+            with self.metrics.timer("login.navigate"):
+                self.browser.get(self.login_url)
 
-            # Wait for the page to load
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.url_contains(self.login_url)
-            )
+                # Wait for the page to load
+                self.wait.url_contains(self.login_url, "login.navigate")
             print("Accessed ShareWood.tv login page")
 
-            # Enter credentials and submit form
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.visibility_of_element_located((By.NAME, "username"))
-            )
-            self.browser.find_element(By.NAME, "username").send_keys(pseudo)
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.visibility_of_element_located((By.NAME, "password"))
-            )
-            self.browser.find_element(By.NAME, "password").send_keys(password)
-
-            # Click on the login button
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.visibility_of_element_located((By.ID, "login-button"))
-            )
-            self.browser.find_element(By.ID, "login-button").click()
-
-            # Verify successful redirect to home_url
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.url_contains(self.home_url)
-            )
+            # Fields share one budget, a missing field fails the form once
+            with self.metrics.timer("login.form"), self.wait.budget("login.form"):
+                # Enter credentials and submit form
+                self.wait.visible((By.NAME, "username"), "login.username").send_keys(pseudo)
+                self.wait.visible((By.NAME, "password"), "login.password").send_keys(password)
+
+                # Click on the login button
+                self.wait.visible((By.ID, "login-button"), "login.button").click()
+
+            with self.metrics.timer("login.redirect"):
+                # Verify successful redirect to home_url
+                self.wait.url_contains(self.home_url, "login.redirect")
 
             print("Successfully logged in to ShareWood.tv")
-        except (TimeoutException, NoSuchElementException) as e:
+        except (TimeoutException, NoSuchElementException, ShareWoodPageError) as e:
             print(f"Login failed: {e}")
+            self.metrics.increment("login.failures")
             return False
 
         return True
@@ -85,17 +94,75 @@ class ShareWoodLogging:
             True if logout successful, False otherwise
         """
         try:
-            # Navigate to logout page
-            self.browser.get(self.logout_url)
+            with self.metrics.timer("logout"):
+                # Navigate to logout page
+                self.browser.get(self.logout_url)
 
-            # Verify successful logout
-            WebDriverWait(self.browser, self.timeout).until(
-                EC.url_contains(self.login_url)
-            )
+                # Verify successful logout
+                self.wait.url_contains(self.login_url, "logout")
             print("Successfully logged out of ShareWood.tv")
 
-        except (TimeoutException, NoSuchElementException) as e:
+        except (TimeoutException, NoSuchElementException, ShareWoodPageError) as e:
             print(f"Logout failed: {e}")
             return False
 
         return True
+
+    def is_connected(self) -> bool:
+        """
+        Check whether the browser session is logged in to ShareWood.tv
+
+        Loads the home page once, logged out sessions are redirected to the login page.
+
+        Returns:
+            True if logged in, False otherwise
+        """
+
+        try:
+            with self.metrics.timer("session.check"):
+                self.browser.get(self.home_url)
+        except (TimeoutException, WebDriverException) as e:
+            print(f"Session check failed: {e}")
+            return False
+
+        return not self.browser.current_url.startswith(self.login_url)
+
+    def load_cookies(self, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        Replace the browser cookies for ShareWood.tv
+
+        Args:
+            cookies: Cookies saved from a logged-in browser (get_cookies() format)
+        Returns:
+            True if cookies were loaded, False otherwise
+        """
+
+        try:
+            with self.metrics.timer("session.load_cookies"):
+                # Cookies can only be set for the domain currently loaded
+                self.browser.get(self.login_url)
+                self.browser.delete_all_cookies()
+                for cookie in cookies:
+                    self.browser.add_cookie(cookie)
+        except (TimeoutException, WebDriverException) as e:
+            print(f"Loading session cookies failed: {e}")
+            return False
+
+        return True
+
+    def restore(self, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        Restore a previously saved ShareWood.tv session into the browser
+
+        Args:
+            cookies: Cookies saved from a logged-in browser (get_cookies() format)
+        Returns:
+            True if the restored session is logged in, False otherwise
+        """
+
+        # Load cookies and check restored session is still valid
+        if not self.load_cookies(cookies) or not self.is_connected():
+            return False
+
+        print("Restored ShareWood.tv session")
+        return True
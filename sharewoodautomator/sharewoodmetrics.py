@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Snapshot of the collected metrics:
+# {"timers": {phase: {"count", "total", "min", "max"}}, "counters": {name: value}}
+Snapshot = Dict[str, Dict[str, Any]]
+
+# Sink receiving snapshots when metrics are flushed
+Sink = Callable[[Snapshot], None]
+
+
+def _write_atomically(path: str, text: str) -> None:
+    """
+    Write a text file through a temporary file moved over it
+
+    Args:
+        path: Path of the file
+        text: Content of the file
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _Timer:
+    """ Context manager adding its duration to a phase """
+
+    __slots__ = ("metrics", "phase", "start")
+
+    def __init__(self, metrics: "ShareWoodMetrics", phase: str) -> None:
+        self.metrics = metrics
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.metrics.observe(self.phase, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    """ Context manager doing nothing, shared by every disabled timer """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class ShareWoodMetrics:
+    """ Thread safe timers and counters of ShareWood.tv operations phases """
+
+    # Metrics are collected
+    enabled = True
+
+    def __init__(self, sinks: Optional[Iterable[Sink]] = None) -> None:
+        """
+        Initialize a new metrics collector
+
+        Args:
+            sinks: Callables receiving a snapshot on each flush (default: None)
+        """
+
+        self.sinks = list(sinks or ())
+        self._timers: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def timer(self, phase: str) -> _Timer:
+        """
+        Time a phase
+
+        Args:
+            phase: Phase name, "<operation>.<phase>"
+
+        Returns:
+            Context manager adding its duration to the phase
+        """
+
+        return _Timer(self, phase)
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """
+        Add a duration to a phase
+
+        Args:
+            phase: Phase name, "<operation>.<phase>"
+            seconds: Duration of the phase
+        """
+
+        with self._lock:
+            timer = self._timers.get(phase)
+            if timer is None:
+                self._timers[phase] = {"count": 1, "total": seconds, "min": seconds, "max": seconds}
+                return
+            timer["count"] += 1
+            timer["total"] += seconds
+            timer["min"] = min(timer["min"], seconds)
+            timer["max"] = max(timer["max"], seconds)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Increment a counter
+
+        Args:
+            name: Counter name, "<operation>.<event>"
+            value: Increment (default: 1)
+        """
+
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Snapshot:
+        """
+        Copy of the collected metrics
+
+        Returns:
+            dict: Timers and counters collected so far
+        """
+
+        with self._lock:
+            return {
+                "timers": {phase: dict(timer) for phase, timer in self._timers.items()},
+                "counters": dict(self._counters),
+            }
+
+    def flush(self) -> None:
+        """
+        Send a snapshot of the collected metrics to every sink
+        """
+
+        if not self.sinks:
+            return
+
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink(snapshot)
+
+    def reset(self) -> None:
+        """
+        Forget the collected metrics
+        """
+
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+
+class ShareWoodNullMetrics(ShareWoodMetrics):
+    """ Disabled metrics, every operation is a no-op """
+
+    enabled = False
+
+    def timer(self, phase: str) -> _NullTimer:
+        """ See ShareWoodMetrics.timer """
+        return _NULL_TIMER
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """ See ShareWoodMetrics.observe """
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """ See ShareWoodMetrics.increment """
+
+    def flush(self) -> None:
+        """ See ShareWoodMetrics.flush """
+
+
+# Shared disabled metrics, default of every instrumented class
+NULL_METRICS = ShareWoodNullMetrics()
+
+
+class ShareWoodJsonSink:
+    """ Writes metrics snapshots to a JSON file """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Path of the JSON file, replaced on each flush
+        """
+
+        self.path = os.path.expanduser(path)
+
+    def __call__(self, snapshot: Snapshot) -> None:
+        _write_atomically(self.path, json.dumps(snapshot, indent=2, sort_keys=True) + "\n")
+
+
+class ShareWoodPrometheusSink:
+    """ Writes metrics snapshots in the Prometheus text format, for the node exporter textfile collector """
+
+    def __init__(self, path: str, prefix: str = "sharewood") -> None:
+        """
+        Args:
+            path: Path of the .prom file, replaced on each flush
+            prefix: Prefix of the metric names (default: sharewood)
+        """
+
+        self.path = os.path.expanduser(path)
+        self.prefix = prefix
+
+    def __call__(self, snapshot: Snapshot) -> None:
+        seconds = f"{self.prefix}_phase_seconds"
+        events = f"{self.prefix}_events_total"
+
+        lines = [
+            f"# HELP {seconds} Time spent in each phase of ShareWood.tv operations",
+            f"# TYPE {seconds} summary",
+        ]
+        for phase, timer in sorted(snapshot["timers"].items()):
+            lines.append(f'{seconds}_count{{phase="{phase}"}} {timer["count"]}')
+            lines.append(f'{seconds}_sum{{phase="{phase}"}} {timer["total"]:.6f}')
+
+        lines += [
+            f"# HELP {events} Events counted during ShareWood.tv operations",
+            f"# TYPE {events} counter",
+        ]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f'{events}{{event="{name}"}} {value:g}')
+
+        _write_atomically(self.path, "\n".join(lines) + "\n")
+
+
+# Sinks selectable by name, see METRICS_FORMAT
+SINKS = {
+    "json": ShareWoodJsonSink,
+    "prometheus": ShareWoodPrometheusSink,
+}
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Normalization of ShareWood.tv scraped texts into typed values.
+
+Every function accepts either the scraped text or an already normalized
+value, which is returned unchanged, so that values can be normalized again
+safely when they come back from a cache.
+"""
+
+import re
+import time
+from typing import Any, Optional, Union
+
+# Bytes per size unit, French (octet) and English (byte) units
+SIZE_UNITS = {
+    "": 1, "b": 1, "o": 1,
+    "k": 1024, "kb": 1024, "kib": 1024, "ko": 1024, "kio": 1024,
+    "m": 1024 ** 2, "mb": 1024 ** 2, "mib": 1024 ** 2, "mo": 1024 ** 2, "mio": 1024 ** 2,
+    "g": 1024 ** 3, "gb": 1024 ** 3, "gib": 1024 ** 3, "go": 1024 ** 3, "gio": 1024 ** 3,
+    "t": 1024 ** 4, "tb": 1024 ** 4, "tib": 1024 ** 4, "to": 1024 ** 4, "tio": 1024 ** 4,
+    "p": 1024 ** 5, "pb": 1024 ** 5, "pib": 1024 ** 5, "po": 1024 ** 5, "pio": 1024 ** 5,
+}
+
+# Seconds per age unit, French and English units
+AGE_UNITS = {
+    **dict.fromkeys(("s", "sec", "seconde", "secondes", "second", "seconds"), 1),
+    **dict.fromkeys(("mn", "min", "minute", "minutes"), 60),
+    **dict.fromkeys(("h", "heure", "heures", "hour", "hours"), 3600),
+    **dict.fromkeys(("j", "d", "jour", "jours", "day", "days"), 86400),
+    **dict.fromkeys(("semaine", "semaines", "week", "weeks"), 7 * 86400),
+    **dict.fromkeys(("mois", "month", "months"), 30 * 86400),
+    **dict.fromkeys(("an", "ans", "année", "années", "year", "years"), 365 * 86400),
+}
+
+# Texts of yes/no flags
+TRUE_TEXTS = frozenset(("oui", "yes", "true", "1", "o", "y"))
+FALSE_TEXTS = frozenset(("non", "no", "false", "0", "n"))
+
+# Texts of a discounts cell without discount
+NO_DISCOUNT_TEXTS = frozenset(("", "aucune", "aucun", "none", "non", "no"))
+
+SIZE_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*([kmgtp]?i?[bo]?)\b", re.IGNORECASE)
+AGE_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*([^\W\d_]+)", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"-?\d+(?:[.,]\d+)?")
+
+
+def normalize_text(value: Any) -> Optional[str]:
+    """
+    Strips a scraped text
+
+    Args:
+        value: Scraped text
+
+    Returns:
+        str: Text without surrounding whitespace, None if empty
+    """
+
+    if value is None:
+        return None
+
+    value = str(value).strip()
+
+    return value or None
+
+
+def parse_int(value: Union[str, int, None]) -> Optional[int]:
+    """
+    Parses a counter, "1 893", "1,893" and "1893" giving 1893
+
+    Args:
+        value: Scraped text or integer
+
+    Returns:
+        int: Counter, None if the text holds no digit
+    """
+
+    if value is None or isinstance(value, int):
+        return value
+
+    digits = re.sub(r"[^\d-]", "", str(value))
+
+    try:
+        return int(digits)
+    except ValueError:
+        return None
+
+
+def parse_float(value: Union[str, float, None]) -> Optional[float]:
+    """
+    Parses a decimal number, "1.25" and "1,25" giving 1.25
+
+    Args:
+        value: Scraped text or number
+
+    Returns:
+        float: Number, None if the text holds no number
+    """
+
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        return float(value)
+
+    match = NUMBER_PATTERN.search(str(value))
+
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def parse_size(value: Union[str, int, None]) -> Optional[int]:
+    """
+    Parses a size, "1.4 GiB" and "1,4 Go" giving 1503238554
+
+    Args:
+        value: Scraped text or number of bytes
+
+    Returns:
+        int: Size in bytes, None if the text holds no size
+    """
+
+    if value is None or isinstance(value, int):
+        return value
+
+    match = SIZE_PATTERN.search(str(value))
+    if match is None:
+        return None
+
+    factor = SIZE_UNITS.get(match.group(2).lower())
+    if factor is None:
+        return None
+
+    return int(round(float(match.group(1).replace(",", ".")) * factor))
+
+
+def parse_age(value: Union[str, float, None], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parses an age into the upload timestamp, "3 jours" giving now minus 3 days
+
+    Args:
+        value: Scraped text or timestamp
+        now: Timestamp the age is relative to (default: current time)
+
+    Returns:
+        float: Upload timestamp in seconds since the epoch, None if the text holds no age
+    """
+
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        return float(value)
+
+    # Ages may have several parts, "1 jour 3 heures"
+    seconds = 0.0
+    found = False
+    for amount, unit in AGE_PATTERN.findall(str(value)):
+        factor = AGE_UNITS.get(unit.lower())
+        if factor is not None:
+            seconds += float(amount.replace(",", ".")) * factor
+            found = True
+
+    if not found:
+        return None
+
+    return (time.time() if now is None else now) - seconds
+
+
+def parse_flag(value: Union[str, bool, None]) -> Optional[bool]:
+    """
+    Parses a yes/no flag, "Oui" giving True and "Non" False
+
+    Args:
+        value: Scraped text or flag
+
+    Returns:
+        bool: Flag, None if the text is not a yes/no value
+    """
+
+    if value is None or isinstance(value, bool):
+        return value
+
+    text = str(value).strip().lower()
+    if text in TRUE_TEXTS:
+        return True
+    if text in FALSE_TEXTS:
+        return False
+
+    return None
+
+
+def parse_discounts(value: Union[str, bool, None]) -> Optional[bool]:
+    """
+    Parses a discounts cell, any discount ("Freeleech", "Double upload") giving True
+
+    Args:
+        value: Scraped text or flag
+
+    Returns:
+        bool: Whether the torrent is discounted, None if unknown
+    """
+
+    if value is None or isinstance(value, bool):
+        return value
+
+    return str(value).strip().lower() not in NO_DISCOUNT_TEXTS
+
+
+def format_size(size: Optional[int]) -> str:
+    """
+    Formats a size in bytes for display, 1503238554 giving "1.4 GiB"
+
+    Args:
+        size: Size in bytes
+
+    Returns:
+        str: Human readable size, "N/A" if unknown
+    """
+
+    if size is None:
+        return "N/A"
+
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if value < 1024 or unit == "TiB":
+            break
+        value /= 1024
+
+    return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - bs4 is imported by ShareWoodSoupParser on first parse
+    from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+except ImportError:  # pragma: no cover - lxml is an install requirement
+    lxml = None
+
+# Fields of a search result row: field name, span class
+SEARCH_RESULT_SPANS: Tuple[Tuple[str, str], ...] = (
+    ("age", "age"),
+    ("size", "size"),
+    ("comments", "comments"),
+    ("seeders", "seeders"),
+    ("leechers", "leechers"),
+    ("downloads", "downloads"),
+)
+
+# Rows of the torrent page information table:
+# field name, row position, row labels, cell value kind
+# - text: text of the cell
+# - link: URL of the first link of the cell
+# - icon: text of the icon (span > i) of the cell
+# - badge-extra.<color>: text of the colored badge of the cell
+INFO_TABLE_ROWS: Tuple[Tuple[str, int, Tuple[str, ...], str], ...] = (
+    ("discounts", 1, ("réductions", "réduction", "discounts"), "icon"),
+    ("fastline_credit_url", 2, ("crédit fastline", "fastline"), "link"),
+    ("uploader_profile", 3, ("uploader", "uploadé par"), "link"),
+    ("age", 4, ("âge", "age"), "text"),
+    ("size", 5, ("taille", "size"), "text"),
+    ("ratio", 6, ("ratio estimé", "ratio"), "text"),
+    ("category", 7, ("catégorie", "category"), "text"),
+    ("subcategory", 8, ("sous-catégorie", "subcategory"), "text"),
+    ("tags", 9, ("tags",), "text"),
+    ("languages", 10, ("langues", "langue", "languages"), "text"),
+    ("resolution", 11, ("résolution", "resolution"), "text"),
+    ("three_d_flag", 12, ("3d",), "text"),
+    ("hash", 13, ("hash", "info hash"), "text"),
+    ("seeders", 14, ("seeders",), "badge-extra.text-green"),
+    ("leechers", 15, ("leechers",), "badge-extra.text-red"),
+    ("completed", 16, ("complétés", "completed"), "badge-extra.text-info"),
+)
+
+# Every known information table label
+INFO_TABLE_LABELS = frozenset(label for row in INFO_TABLE_ROWS for label in row[2])
+
+# Path of the torrent file download links
+DOWNLOAD_LINK_PATH = "/download/"
+
+
+def normalize_label(text: str) -> str:
+    """ Normalizes an information table label for lookup """
+    return " ".join(text.split()).lower().rstrip(" :")
+
+
+class ShareWoodHtmlParser(ABC):
+    """ Parses ShareWood.tv pages into ShareWoodTorrent fields values """
+
+    # Name of the parser backend
+    name = None
+
+    @abstractmethod
+    def parse_search_result(self, html: str) -> List[Dict[str, Optional[str]]]:
+        """
+        Parses the rows of a torrents listing
+
+        Args:
+            html: HTML source of search results
+
+        Returns:
+            list[dict]: Per row: url, title and SEARCH_RESULT_SPANS fields values
+        """
+
+    @abstractmethod
+    def parse_torrent_page(self, html: str) -> Dict[str, Optional[str]]:
+        """
+        Parses the information table of a torrent page
+
+        Rows are matched by their label, rows with an unknown label fall
+        back to their position in the table.
+
+        Args:
+            html: HTML source of the torrent page
+
+        Returns:
+            dict: INFO_TABLE_ROWS fields values and download_link, None when missing
+        """
+
+    @abstractmethod
+    def _cell_value(self, cell: object, kind: str) -> Optional[str]:
+        """
+        Extracts the value of an information table cell
+
+        Args:
+            cell: Value cell
+            kind: Kind of value, see INFO_TABLE_ROWS
+
+        Returns:
+            str: Cell value, None if missing
+        """
+
+    @staticmethod
+    def _match_info_table(rows: List[Tuple[str, object]]) -> Dict[str, object]:
+        """
+        Maps each INFO_TABLE_ROWS field to its value cell
+
+        Args:
+            rows: (label, value cell) of each table row, in table order
+
+        Returns:
+            dict: Value cell of each field found
+        """
+
+        # Split cells between known labels and positions
+        cells_by_label = {}
+        cells_by_position = {}
+        for position, (label, cell) in enumerate(rows, 1):
+            label = normalize_label(label)
+            if label in INFO_TABLE_LABELS:
+                cells_by_label[label] = cell
+            else:
+                cells_by_position[position] = cell
+
+        # Find cell of each field
+        cells = {}
+        for name, position, labels, _ in INFO_TABLE_ROWS:
+            cell = next((cells_by_label[label] for label in labels if label in cells_by_label), None)
+            if cell is None:
+                cell = cells_by_position.get(position)
+            if cell is not None:
+                cells[name] = cell
+
+        return cells
+
+
+class ShareWoodSoupParser(ShareWoodHtmlParser):
+    """ Parses ShareWood.tv pages with BeautifulSoup and Python's html.parser, bs4 is imported on first parse """
+
+    name = "html.parser"
+
+    def parse_search_result(self, html: str) -> List[Dict[str, Optional[str]]]:
+        """ See ShareWoodHtmlParser.parse_search_result """
+
+        from bs4 import BeautifulSoup
+
+        # Parse HTML source of search results
+        soup = BeautifulSoup(html, "html.parser")
+
+        rows = []
+
+        # Find all torrents rows
+        for row in soup.select("div.row.table-responsive-line"):
+            # Find link to torrent page (a with name="torrent")
+            link = row.find("a", attrs={"name": "torrent"})
+
+            values = {
+                "url": link["href"] if link else None,
+                "title": link.text.strip() if link else None,
+            }
+            for name, span_class in SEARCH_RESULT_SPANS:
+                span = row.find("span", class_=span_class)
+                values[name] = span.text if span else None
+
+            rows.append(values)
+
+        return rows
+
+    def parse_torrent_page(self, html: str) -> Dict[str, Optional[str]]:
+        """ See ShareWoodHtmlParser.parse_torrent_page """
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+
+        values = self.parse_info_table(soup)
+
+        # Find link to the torrent file
+        link = soup.select_one(f"a[href*='{DOWNLOAD_LINK_PATH}']")
+        values["download_link"] = link["href"] if link else None
+
+        return values
+
+    def parse_info_table(self, soup: "BeautifulSoup") -> Dict[str, Optional[str]]:
+        """
+        Parses the information table of a parsed torrent page in a single pass
+
+        Args:
+            soup: BeautifulSoup instance of the torrent page
+
+        Returns:
+            dict: INFO_TABLE_ROWS fields values, None when missing
+        """
+
+        values = dict.fromkeys((row[0] for row in INFO_TABLE_ROWS), None)
+
+        # Find information table once
+        table = soup.select_one("#app > div.row > div > div:nth-child(1) > table")
+        if table is None:
+            return values
+
+        # Walk table rows once
+        rows = []
+        for row in (table.tbody or table).find_all("tr", recursive=False):
+            cells = row.find_all("td", recursive=False)
+            if len(cells) >= 2:
+                rows.append((cells[0].get_text(), cells[1]))
+
+        # Extract each field from its cell
+        kinds = {row[0]: row[3] for row in INFO_TABLE_ROWS}
+        for name, cell in self._match_info_table(rows).items():
+            values[name] = self._cell_value(cell, kinds[name])
+
+        return values
+
+    def _cell_value(self, cell: "Tag", kind: str) -> Optional[str]:
+        """ See ShareWoodHtmlParser._cell_value """
+
+        if kind == "text":
+            return cell.text
+        if kind == "link":
+            link = cell.find("a", href=True)
+            return link["href"] if link else None
+        if kind == "icon":
+            element = cell.select_one("span > i")
+        else:
+            element = cell.select_one(f"span.{kind}")
+
+        return element.text if element else None
+
+
+class ShareWoodLxmlParser(ShareWoodHtmlParser):
+    """ Parses ShareWood.tv pages with lxml, producing the same values as ShareWoodSoupParser """
+
+    name = "lxml"
+
+    @staticmethod
+    def _has_class(name: str) -> str:
+        """ XPath predicate matching elements having a class """
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    def _document(self, html: str) -> Optional["lxml.html.HtmlElement"]:
+        """
+        Parses an HTML document or fragment
+
+        Args:
+            html: HTML source
+
+        Returns:
+            HtmlElement: Root element, None if the document is empty
+        """
+
+        try:
+            return lxml.html.fromstring(html)
+        except ParserError:
+            return None
+
+    def parse_search_result(self, html: str) -> List[Dict[str, Optional[str]]]:
+        """ See ShareWoodHtmlParser.parse_search_result """
+
+        document = self._document(html)
+        if document is None:
+            return []
+
+        rows = []
+
+        # Find all torrents rows
+        row_xpath = f"descendant-or-self::div[{self._has_class('row')} and {self._has_class('table-responsive-line')}]"
+        for row in document.xpath(row_xpath):
+            # Find link to torrent page (a with name="torrent")
+            link = next(iter(row.xpath(".//a[@name='torrent']")), None)
+
+            values = {
+                "url": link.get("href") if link is not None else None,
+                "title": link.text_content().strip() if link is not None else None,
+            }
+            for name, span_class in SEARCH_RESULT_SPANS:
+                span = next(iter(row.xpath(f".//span[{self._has_class(span_class)}]")), None)
+                values[name] = span.text_content() if span is not None else None
+
+            rows.append(values)
+
+        return rows
+
+    def parse_torrent_page(self, html: str) -> Dict[str, Optional[str]]:
+        """ See ShareWoodHtmlParser.parse_torrent_page """
+
+        values = dict.fromkeys((row[0] for row in INFO_TABLE_ROWS), None)
+        values["download_link"] = None
+
+        document = self._document(html)
+        if document is None:
+            return values
+
+        # Find link to the torrent file
+        links = document.xpath(f"descendant-or-self::a[contains(@href, '{DOWNLOAD_LINK_PATH}')]")
+        if links:
+            values["download_link"] = links[0].get("href")
+
+        # Find information table once (#app > div.row > div > div:nth-child(1) > table)
+        tables = document.xpath(
+            f"descendant-or-self::*[@id='app']/div[{self._has_class('row')}]/div/*[1][self::div]/table"
+        )
+        if not tables:
+            return values
+        table = tables[0]
+
+        # Walk table rows once
+        body = table.find("tbody")
+        rows = []
+        for row in (body if body is not None else table).findall("tr"):
+            cells = row.findall("td")
+            if len(cells) >= 2:
+                rows.append((cells[0].text_content(), cells[1]))
+
+        # Extract each field from its cell
+        kinds = {row[0]: row[3] for row in INFO_TABLE_ROWS}
+        for name, cell in self._match_info_table(rows).items():
+            values[name] = self._cell_value(cell, kinds[name])
+
+        return values
+
+    def _cell_value(self, cell: "lxml.html.HtmlElement", kind: str) -> Optional[str]:
+        """ See ShareWoodHtmlParser._cell_value """
+
+        if kind == "text":
+            return cell.text_content()
+        if kind == "link":
+            links = cell.xpath(".//a[@href]")
+            return links[0].get("href") if links else None
+        if kind == "icon":
+            elements = cell.xpath(".//span/i")
+        else:
+            classes = " and ".join(self._has_class(name) for name in kind.split("."))
+            elements = cell.xpath(f".//span[{classes}]")
+
+        return elements[0].text_content() if elements else None
+
+
+# Available parser backends, fastest first
+PARSERS = {
+    parser.name: parser for parser in (ShareWoodLxmlParser, ShareWoodSoupParser)
+    if parser is not ShareWoodLxmlParser or lxml is not None
+}
+
+
+def get_parser(name: Optional[str] = None) -> ShareWoodHtmlParser:
+    """
+    Gets a ShareWood.tv pages parser
+
+    Args:
+        name: Parser backend name, None selects the fastest installed one (default: None)
+
+    Returns:
+        ShareWoodHtmlParser: Parser instance
+
+    Raises:
+        ValueError: If the parser backend is unknown or not installed
+    """
+
+    if name is None:
+        return next(iter(PARSERS.values()))()
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown or not installed HTML parser: {name}")
+
+    return PARSERS[name]()
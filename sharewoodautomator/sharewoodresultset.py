@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+import math
+from array import array
+from dataclasses import fields
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .sharewoodtorrent import ShareWoodTorrent
+
+# Array typecode of the numeric columns, the other fields are stored in lists
+NUMERIC_COLUMNS = {
+    "size": "q",
+    "age": "d",
+    "seeders": "q",
+    "leechers": "q",
+    "completed": "q",
+    "nb_comments": "q",
+    "ratio": "d",
+}
+
+# Missing integers are stored as the smallest 64 bits integer, missing floats as NaN
+MISSING_INT = -2 ** 63
+MISSING_FLOAT = math.nan
+
+# Condition of filter(): value, (low, high) inclusive range with None bounds, or predicate
+Condition = Union[Any, Tuple[Any, Any], Callable[[Any], bool]]
+
+
+class ShareWoodResultSet:
+    """ Columnar ShareWood.tv search results, for fast local filtering, sorting and ranking """
+
+    COLUMNS = tuple(torrent_field.name for torrent_field in fields(ShareWoodTorrent))
+
+    def __init__(self, columns: Optional[Dict[str, Sequence[Any]]] = None) -> None:
+        """
+        Initialize a new result set from its columns
+
+        Args:
+            columns: Values of each ShareWoodTorrent field, missing columns are filled with None (default: empty)
+        """
+
+        columns = columns or {}
+        length = len(next(iter(columns.values()), ()))
+
+        self._columns: Dict[str, Union[array, List[Any]]] = {}
+        for name in self.COLUMNS:
+            values = columns.get(name)
+            if values is None:
+                values = [None] * length
+            elif len(values) != length:
+                raise ValueError(f"Column {name} has {len(values)} values, expected {length}")
+
+            typecode = NUMERIC_COLUMNS.get(name)
+            if typecode is None:
+                self._columns[name] = list(values)
+            elif isinstance(values, array) and values.typecode == typecode:
+                self._columns[name] = values
+            else:
+                missing = MISSING_INT if typecode == "q" else MISSING_FLOAT
+                self._columns[name] = array(typecode, (missing if value is None else value for value in values))
+
+        self._length = length
+
+    @classmethod
+    def from_torrents(cls, torrents: Iterable[ShareWoodTorrent]) -> "ShareWoodResultSet":
+        """
+        Create a result set from torrents
+
+        Args:
+            torrents: Torrents, such as search() results
+
+        Returns:
+            ShareWoodResultSet: Columns of the torrents fields
+        """
+
+        torrents = list(torrents)
+
+        return cls({name: [getattr(torrent, name) for torrent in torrents] for name in cls.COLUMNS})
+
+    def to_torrents(self) -> List[ShareWoodTorrent]:
+        """
+        Convert the result set back to torrents
+
+        Returns:
+            list: ShareWoodTorrent of each row, in the result set order
+        """
+
+        return [ShareWoodTorrent.from_dict(row) for row in self.rows()]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[ShareWoodTorrent]:
+        return iter(self.to_torrents())
+
+    def __add__(self, other: "ShareWoodResultSet") -> "ShareWoodResultSet":
+        """ Result set of the rows of both result sets, such as merged searches """
+        return ShareWoodResultSet({name: self._columns[name] + other._columns[name] for name in self.COLUMNS})
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Values of a column
+
+        Args:
+            name: ShareWoodTorrent field name
+
+        Returns:
+            list: Value of each row, None if missing
+        """
+
+        typecode = NUMERIC_COLUMNS.get(name)
+        if typecode == "q":
+            return [None if value == MISSING_INT else value for value in self._columns[name]]
+        if typecode == "d":
+            # NaN is the only value not equal to itself
+            return [None if value != value else value for value in self._columns[name]]
+
+        return list(self._columns[name])
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the rows
+
+        Yields:
+            dict: Values of a row by field name, None if missing
+        """
+
+        columns = [(name, self.column(name)) for name in self.COLUMNS]
+        for index in range(self._length):
+            yield {name: values[index] for name, values in columns}
+
+    def take(self, indices: Iterable[int]) -> "ShareWoodResultSet":
+        """
+        Select rows by index
+
+        Args:
+            indices: Indices of the selected rows, in their new order
+
+        Returns:
+            ShareWoodResultSet: Selected rows
+        """
+
+        indices = list(indices)
+        columns = {}
+        for name, values in self._columns.items():
+            selected = [values[index] for index in indices]
+            typecode = NUMERIC_COLUMNS.get(name)
+            columns[name] = array(typecode, selected) if typecode is not None else selected
+
+        return ShareWoodResultSet(columns)
+
+    def filter(self, **conditions: Condition) -> "ShareWoodResultSet":
+        """
+        Select the rows matching every condition, missing values never match
+
+        Args:
+            conditions: Condition by field name, either a value to be equal to,
+                a (low, high) inclusive range whose bounds may be None,
+                or a predicate called with each present value
+
+        Returns:
+            ShareWoodResultSet: Matching rows, in the same order
+
+        Examples:
+            results.filter(seeders=(10, None), size=(None, 4 * 1024 ** 3), category="Films")
+        """
+
+        # Each condition only checks the rows matching the previous ones, on the stored values
+        indices: Iterable[int] = range(self._length)
+        for name, condition in conditions.items():
+            match = self._match(name, condition)
+            values = self._columns[name]
+            indices = [index for index in indices if match(values[index])]
+
+        return self.take(indices)
+
+    def sort(self, *keys: str) -> "ShareWoodResultSet":
+        """
+        Sort rows by several keys, missing values last
+
+        Args:
+            keys: Field names, prefixed by "-" for descending order
+
+        Returns:
+            ShareWoodResultSet: Sorted rows
+
+        Examples:
+            results.sort("-seeders", "size")
+        """
+
+        order = list(range(self._length))
+
+        # Stable sorts from the least significant key
+        for key in reversed(keys):
+            name, descending = self._parse_key(key)
+            values = self._columns[name]
+            present, missing = self._split(name, order)
+            order = sorted(present, key=values.__getitem__, reverse=descending) + missing
+
+        return self.take(order)
+
+    def top(self, k: int, key: str) -> "ShareWoodResultSet":
+        """
+        Select the k best rows by a key, without sorting every row
+
+        Args:
+            k: Number of rows
+            key: Field name, prefixed by "-" to select the largest values
+
+        Returns:
+            ShareWoodResultSet: k best rows, best first, rows with missing values are never selected
+
+        Examples:
+            results.top(10, "-seeders")
+        """
+
+        name, descending = self._parse_key(key)
+        present, _ = self._split(name, range(self._length))
+        select = heapq.nlargest if descending else heapq.nsmallest
+
+        return self.take(select(k, present, key=self._columns[name].__getitem__))
+
+    def group_by(self, name: str) -> Dict[Any, "ShareWoodResultSet"]:
+        """
+        Split rows by the value of a column
+
+        Args:
+            name: Field name, such as "category"
+
+        Returns:
+            dict: Rows of each value, in order of first appearance
+        """
+
+        groups: Dict[Any, List[int]] = {}
+        for index, value in enumerate(self.column(name)):
+            groups.setdefault(value, []).append(index)
+
+        return {value: self.take(indices) for value, indices in groups.items()}
+
+    @staticmethod
+    def _parse_key(key: str) -> Tuple[str, bool]:
+        """ Field name and descending order of a sort key """
+
+        name = key.lstrip("-")
+        if name not in ShareWoodResultSet.COLUMNS:
+            raise ValueError(f"Unknown column: {name}")
+
+        return name, key.startswith("-")
+
+    @staticmethod
+    def _present(name: str) -> Callable[[Any], bool]:
+        """ Whether a stored value of a column is present """
+
+        typecode = NUMERIC_COLUMNS.get(name)
+        if typecode == "q":
+            return lambda value: value != MISSING_INT
+        if typecode == "d":
+            # NaN is the only value not equal to itself
+            return lambda value: value == value
+
+        return lambda value: value is not None
+
+    def _split(self, name: str, indices: Iterable[int]) -> Tuple[List[int], List[int]]:
+        """ Indices of the rows with a present value and of the rows with a missing one """
+
+        values = self._columns[name]
+        present_value = self._present(name)
+        present: List[int] = []
+        missing: List[int] = []
+        for index in indices:
+            (present if present_value(values[index]) else missing).append(index)
+
+        return present, missing
+
+    def _match(self, name: str, condition: Condition) -> Callable[[Any], bool]:
+        """ Whether a stored value of a column matches a filter condition """
+
+        if name not in self._columns:
+            raise ValueError(f"Unknown column: {name}")
+        present = self._present(name)
+
+        if callable(condition):
+            return lambda value: present(value) and bool(condition(value))
+
+        if isinstance(condition, tuple):
+            low, high = condition
+            return lambda value: (
+                present(value) and (low is None or value >= low) and (high is None or value <= high)
+            )
+
+        return lambda value: present(value) and value == condition
@@ -1,31 +1,46 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dataclasses import fields
-from typing import List, Optional
-
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodparser import ShareWoodHtmlParser, get_parser
 from .sharewoodsearchcriteria import ShareWoodSearchCriteria
 from .sharewoodtorrent import ShareWoodTorrent
+from .sharewoodwait import ShareWoodWait
+
+if TYPE_CHECKING:  # pragma: no cover - Selenium is only imported by the browser backend
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 
 class ShareWoodSearch():
     """Searches for torrents on ShareWood.tv"""
+
+    # Next page can be fetched while the current one is consumed
+    supports_prefetch = False
     
-    def __init__(self, browser: WebDriver, search_url: str, timeout: int, ignore_parsing_errors: Optional[bool] = False) -> None:
+    def __init__(
+        self,
+        browser: "WebDriver",
+        search_url: str,
+        timeout: int,
+        ignore_parsing_errors: Optional[bool] = False,
+        parser: Optional[ShareWoodHtmlParser] = None,
+        metrics: Optional[ShareWoodMetrics] = None,
+        wait: Optional[ShareWoodWait] = None,
+    ) -> None:
         """
         Initialize a new session with ShareWood.tv
         
         Args:
             browser: Selenium WebDriver instance
             search_url: URL of ShareWood.tv search page
-            timeout: Timeout for WebDriverWait
+            timeout: Seconds to wait for the search results
             ignore_parsing_errors: Ignore parsing errors (default: False)
+            parser: HTML parser of search results (default: fastest installed)
+            metrics: Timers and counters of the search phases (default: disabled)
+            wait: Wait engine of the browser (default: new engine with timeout)
         """
         
         # Instance of Selenium WebDriver
@@ -34,112 +49,18 @@ class ShareWoodSearch():
         self.search_url = search_url
         # Ignore parsing errors
         self.ignore_parsing_errors = ignore_parsing_errors
-        # Timeout for WebDriverWait
+        # Seconds to wait for the search results
         self.timeout = timeout
-
-    def fill_search_form_from_criteria(self, search_criteria: ShareWoodSearchCriteria) -> None:
-        """
-        Fill search form from search criteria
-        
-        Args:
-            search_criteria: Search criteria for ShareWood.tv
-        """
-        
-        # Navigate to ShareWood.tv
-        self.browser.get(self.search_url)
-
-        # Wait for form to load (form with action="TorrentController@torrents")
-        search_form = WebDriverWait(self.browser, self.timeout).until(
-            EC.presence_of_element_located((By.XPATH, "//form[@action='TorrentController@torrents']"))
-        )
-
-        # Check if search box is visible
-        if search_form.is_displayed():
-
-            # Check if query is provided
-            if search_criteria.query:
-                # Find search input and enter search query
-                search_form.find_element(By.NAME, search_criteria.metadata["name"]).send_keys(search_criteria.query)
-            
-            # Check if description is provided
-            if search_criteria.description:
-                # Find description input and enter description
-                search_form.find_element(By.NAME, search_criteria.metadata["name"]).send_keys(search_criteria.description)
-
-            # Check if uploader is provided
-            if search_criteria.uploader:
-                # Find uploader input and enter uploader
-                search_form.find_element(By.NAME, search_criteria.metadata["name"]).send_keys(search_criteria.uploader)
-
-            # Check if tags are provided
-            if search_criteria.tags:
-                # Find tags input and enter tags
-                search_form.find_element(By.NAME, search_criteria.metadata["name"]).send_keys(search_criteria.tags)
-
-            # Check if categories are provided
-            if search_criteria.categories:
-                # Iterate over categories
-                for category, checked in search_criteria.categories.items():
-                    # Check if category is checked
-                    if checked:
-                        # Find category checkbox and check it
-                        search_form.find_element(By.NAME, category).click()
-
-            # Check if subcategories are provided
-            if search_criteria.subcategories:
-                # Iterate over subcategories
-                for subcategory, checked in search_criteria.subcategories.items():
-                    # Check if subcategory is checked
-                    if checked:
-                        # Find subcategory checkbox and check it
-                        search_form.find_element(By.NAME, subcategory).click()
-
-            # Check if languages are provided
-            if search_criteria.languages:
-                # Iterate over languages
-                for language, checked in search_criteria.languages.items():
-                    # Check if language is checked
-                    if checked:
-                        # Find language checkbox and check it
-                        search_form.find_element(By.NAME, language).click()
-
-    def apply_filters_from_criteria(self, search_criteria: ShareWoodSearchCriteria) -> str:
-        """
-        Apply filters from search criteria
-
-        Args:
-            search_criteria: Search criteria for ShareWood.tv
-        """
-
-        # Wait for form to load (form with action="TorrentController@torrents")
-        search_form = WebDriverWait(self.browser, self.timeout).until(
-            EC.presence_of_element_located((By.XPATH, "//form[@action='TorrentController@torrents']"))
-        )
-
-        # Check if sorting is provided
-        if search_criteria.sorting:
-            # Find sorting select element by name
-            sorting_select_input = search_form.find_element(By.NAME, fields(search_criteria.sorting)[0].metadata['name'])
-            # Select sorting option by value
-            sorting_select_input.select_by_value(search_criteria.sorting)
-
-        # Check if direction is provided
-        if search_criteria.direction:
-            # Find direction select element by name
-            direction_select_input = search_form.find_element(By.NAME, fields(search_criteria.direction)[0].metadata['name'])
-            # Select direction option by value
-            direction_select_input.select_by_value(search_criteria.direction)
-
-        # Check if quantity is provided
-        if search_criteria.quantity:
-            # Find quantity select element by name
-            quantity_select_input = search_form.find_element(By.NAME, fields(search_criteria.quantity)[0].metadata['name'])
-            # Select quantity option by value
-            quantity_select_input.select_by_value(search_criteria.quantity)
+        # HTML parser of search results
+        self.parser = parser or get_parser()
+        # Timers and counters of the search phases
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        # Waits of the search results
+        self.wait = wait if wait is not None else ShareWoodWait(browser, timeout, metrics=self.metrics)
 
     def parse_search_result(self, html_search_result: str) -> List[ShareWoodTorrent]:
         """
-        Parse search results from ShareWood.tv using BeautifulSoup
+        Parse search results from ShareWood.tv using the HTML parser
         
         # Find all torrents div with class="row  table-responsive-line" 
         # Inside each div, find the following elements:
@@ -174,37 +95,15 @@ class ShareWoodSearch():
             Exception: Failed to parse torrent
         """
 
-        # Parse HTML source of search results
-        soup = BeautifulSoup(html_search_result, "html.parser")
-
-        # Find all torrents 
-        torrents = soup.find_all("div", class_="row  table-responsive-line")
-
         # Initialize list of ShareWoodTorrent
         torrents = []
 
-        # Iterate over a copy of torrents
-        for torrent in list(torrents):
-            # Append parsed torrent to list of parsed torrents
-            parsed_torrent = {
-                "url": torrent.find("a", name="torrent")["href"] if torrent.find("a", name="torrent") 
-                else None,
-                "title": torrent.find("a", name="torrent").text if torrent.find("a", name="torrent") 
-                else None,
-                "age": torrent.find("span", class_="age").text if torrent.find("span", class_="age") 
-                else None,
-                "size": torrent.find("span", class_="size").text if torrent.find("span", class_="size") 
-                else None,
-                "comments": torrent.find("span", class_="comments").text if torrent.find("span", class_="comments") 
-                else None,
-                "seeders": torrent.find("span", class_="seeders").text if torrent.find("span", class_="seeders")
-                else None,
-                "leechers": torrent.find("span", class_="leechers").text if torrent.find("span", class_="leechers")
-                else None,
-                "downloads": torrent.find("span", class_="downloads").text if torrent.find("span", class_="downloads")
-                else None
-            }
+        # Parse torrents rows
+        with self.metrics.timer("search.parse"):
+            parsed_torrents = self.parser.parse_search_result(html_search_result)
 
+        # Iterate over parsed torrents rows
+        for parsed_torrent in parsed_torrents:
             # Create ShareWoodTorrent instance
             torrent = ShareWoodTorrent(
                 url=parsed_torrent["url"],
@@ -224,6 +123,8 @@ class ShareWoodSearch():
             # Append torrent to list of torrents
             torrents.append(torrent)
 
+        self.metrics.increment("search.results", len(torrents))
+
         # Return list of ShareWoodTorrent
         return torrents
 
@@ -235,31 +136,102 @@ class ShareWoodSearch():
             search_criteria: Search criteria for ShareWood.tv"
         
         Returns:
-            List of parsed search results as dictionaries containing:
-            - title: Title of torrent
-            - href: Href to torrent
-            - age: Age of torrent
-            - size: Size of torrent
-            - comments: Number of comments
-            - seeders: Number of seeders
-            - leechers: Number of leechers
-            - downloads: Number of downloads
+            List of parsed search results as ShareWoodTorrent
+        """
+
+        return self.fetch_page(search_criteria, 1)
+
+    def fetch_page(self, search_criteria: ShareWoodSearchCriteria, page: int) -> List[ShareWoodTorrent]:
+        """
+        Fetch one page of search results on ShareWood.tv
+
+        Criteria are sent in the listing URL, so a page needs a single
+        navigation instead of typing in the form and clicking every option.
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+            page: Page number, starting at 1
+
+        Returns:
+            List of parsed search results as ShareWoodTorrent
         """
 
-        # Fill search form from search criteria
-        self.fill_search_form_from_criteria(search_criteria)
+        from selenium.webdriver.common.by import By
 
-        # Apply filters from search criteria
-        self.apply_filters_from_criteria(search_criteria)
+        # Listing URL with the criteria as query string
+        with self.metrics.timer("search.navigate"):
+            self.browser.get(search_criteria.to_url(self.search_url, page))
 
-        # No need to submit form, search results are loaded dynamically
         # Wait for search results to load (div with id="result")
-        search_results = WebDriverWait(self.browser, self.timeout).until(
-            EC.presence_of_element_located((By.ID, "result"))
-        )
+        with self.metrics.timer("search.wait"):
+            search_results = self.wait.present((By.ID, "result"), "search.results")
 
         # Get HTML of search results (div with id="result")
-        result = search_results.get_attribute("innerHTML")
+        with self.metrics.timer("search.extract"):
+            result = search_results.get_attribute("innerHTML")
+
+        # Return parsed search results
+        return self.parse_search_result(result)
+
+    def iter_search(self, search_criteria: ShareWoodSearchCriteria, max_results: Optional[int] = None) -> Iterator[ShareWoodTorrent]:
+        """
+        Iterate over search results on ShareWood.tv, page by page
+
+        Pages are fetched only when needed, so stopping the iteration stops
+        fetching. When the search supports it, page k+1 is fetched in the
+        background while page k is consumed. Only the current and next pages
+        are held in memory.
+
+        Args:
+            search_criteria: Search criteria for ShareWood.tv
+            max_results: Maximum number of torrents to yield (default: None, all)
+
+        Yields:
+            ShareWoodTorrent: Search results, in listing order
+        """
 
-        # Return HTML of search results
-        return result
+        # Nothing to yield, not even the first page is fetched
+        if max_results is not None and max_results < 1:
+            return
+
+        # Short pages are the last ones (site default is the smallest quantity)
+        page_size = search_criteria.quantity or min(search_criteria.quantity_values)
+
+        executor = ThreadPoolExecutor(max_workers=1) if self.supports_prefetch else None
+        next_page: Optional[Future] = None
+        previous_urls = None
+        yielded = 0
+        page = 1
+
+        try:
+            while True:
+                # Get current page, prefetched or not
+                torrents = next_page.result() if next_page is not None else self.fetch_page(search_criteria, page)
+                next_page = None
+
+                # Stop when the site serves the same page again (page out of range)
+                urls = [torrent.url for torrent in torrents]
+                if not torrents or urls == previous_urls:
+                    return
+                previous_urls = urls
+
+                # Prefetch next page while this one is consumed
+                has_next_page = len(torrents) >= page_size
+                if has_next_page and executor is not None and (max_results is None or yielded + len(torrents) < max_results):
+                    next_page = executor.submit(self.fetch_page, search_criteria, page + 1)
+
+                for torrent in torrents:
+                    yield torrent
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+
+                if not has_next_page:
+                    return
+                page += 1
+        finally:
+            # Do not wait for a prefetched page nobody will read
+            if next_page is not None:
+                next_page.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dataclasses import dataclass, field
-from typing import Dict, Optional, Set
+import hashlib
+import json
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode
+
+# ShareWoodTorrent field of each listing sort, see ShareWoodSearchCriteria.sorting_values
+SORT_FIELDS = {
+    "created_at": "age",
+    "name": "title",
+    "seeders": "seeders",
+    "leechers": "leechers",
+    "times_Completed": "completed",
+    "Size": "size",
+}
 
 
 @dataclass
@@ -27,11 +40,11 @@ class ShareWoodSearchCriteria:
     )
     uploader: Optional[str] = field(
         default=None, 
-        metadata={"placeholder": "Nom de l'uploader"}
+        metadata={"name": "uploader", "placeholder": "Nom de l'uploader"}
     )
     tags: Optional[str] = field(
         default=None, 
-        metadata={"placeholder": "tags"}
+        metadata={"name": "tags", "placeholder": "tags"}
     )
     categories: Optional[Dict[str, bool]] = field(
         default_factory=lambda: {
@@ -42,7 +55,7 @@ class ShareWoodSearchCriteria:
             "Jeux-Vidéos": False, 
             "Formations": False,
         }, 
-        metadata={"class": "category category-parent"}
+        metadata={"name": "categories[]", "class": "category category-parent"}
     )
     subcategories: Optional[Dict[str, bool]] = field(
         default_factory=lambda: {
@@ -52,7 +65,7 @@ class ShareWoodSearchCriteria:
             "Application Windows": False,
             "GPS": False,
         },
-        metadata={"class": "subcategory"}
+        metadata={"name": "subcategories[]", "class": "subcategory"}
     )
     languages: Optional[Dict[str, bool]] = field(
         default_factory=lambda: {
@@ -65,7 +78,7 @@ class ShareWoodSearchCriteria:
             "Allemand": False,
             "Autre": False,
         },
-        metadata={"class": "subcategory"}
+        metadata={"name": "languages[]", "class": "subcategory"}
     )
     types: Optional[Dict[str, bool]] = field(
         default_factory=lambda: {
@@ -76,7 +89,7 @@ class ShareWoodSearchCriteria:
             "internal": False, 
             "downloaded": False,
         },
-        metadata={"class": "subcategory"}
+        metadata={"name": "types[]", "class": "subcategory"}
     )
     sorting_values: Optional[Set[str]] = field(
         default_factory=lambda: {'created_at', 'name', 'seeders', 'leechers', 'times_Completed', 'Size'},
@@ -102,3 +115,121 @@ class ShareWoodSearchCriteria:
         default=None, 
         metadata={"id": "qty", "name": "qty", "class": "form-control"}
     )
+
+    def to_query_params(self) -> List[Tuple[str, str]]:
+        """
+        Encode search criteria as ShareWood.tv torrents listing query parameters
+
+        Text and select fields are sent under their form input name, checked
+        categories, subcategories, languages and types are sent as repeated
+        array parameters (e.g. "languages[]=Français").
+
+        Returns:
+            list[tuple[str, str]]: Query parameters, in field order
+        """
+
+        params = []
+
+        for criteria_field in fields(self):
+            # Allowed values are not search parameters
+            if criteria_field.name.endswith("_values"):
+                continue
+
+            # Skip criteria not provided
+            value = getattr(self, criteria_field.name)
+            if value is None:
+                continue
+
+            # Parameter name is the form input name
+            name = criteria_field.metadata["name"]
+
+            # Checkboxes: one parameter per checked option
+            if isinstance(value, dict):
+                params.extend((name, option) for option, checked in value.items() if checked)
+            else:
+                params.append((name, str(value)))
+
+        return params
+
+    def to_url(self, search_url: str, page: int = 1) -> str:
+        """
+        Torrents listing URL of the search criteria
+
+        Loading it shows the results without filling the search form.
+
+        Args:
+            search_url: URL of ShareWood.tv torrents listing
+            page: Page number, starting at 1 (default: 1)
+
+        Returns:
+            str: Listing URL with the criteria, and page number after the first page, as query string
+        """
+
+        params = self.to_query_params()
+        if page > 1:
+            params.append(("page", str(page)))
+
+        if not params:
+            return search_url
+
+        return f"{search_url}{'&' if '?' in search_url else '?'}{urlencode(params)}"
+
+    @classmethod
+    def from_query_params(cls, params: Union[str, Iterable[Tuple[str, str]]]) -> "ShareWoodSearchCriteria":
+        """
+        Decode ShareWood.tv torrents listing query parameters as search criteria
+
+        Reverse of to_query_params, parameters which are not search criteria
+        (e.g. "page") are ignored.
+
+        Args:
+            params: Query parameters, or query string
+
+        Returns:
+            ShareWoodSearchCriteria: Search criteria of the listing
+
+        Raises:
+            ValueError: If the quantity is not a number
+        """
+
+        if isinstance(params, str):
+            params = parse_qsl(params.lstrip("?"), keep_blank_values=True)
+
+        criteria = cls()
+        # Criteria field of each form input name
+        criteria_fields = {
+            criteria_field.metadata["name"]: criteria_field
+            for criteria_field in fields(cls)
+            if not criteria_field.name.endswith("_values")
+        }
+
+        for name, value in params:
+            criteria_field = criteria_fields.get(name)
+            if criteria_field is None:
+                continue
+
+            current = getattr(criteria, criteria_field.name)
+            # Checkboxes: every parameter checks one option
+            if isinstance(current, dict):
+                current[value] = True
+            elif criteria_field.name == "quantity":
+                setattr(criteria, criteria_field.name, int(value))
+            else:
+                setattr(criteria, criteria_field.name, value)
+
+        return criteria
+
+    def cache_key(self) -> str:
+        """
+        Canonical hash of the search criteria
+
+        Criteria producing the same listing request have the same key,
+        whatever the order or the unchecked options of their dictionaries.
+
+        Returns:
+            str: SHA-256 hex digest of the sorted query parameters
+        """
+
+        canonical = json.dumps(sorted(self.to_query_params()), ensure_ascii=False)
+
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
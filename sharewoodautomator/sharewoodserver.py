@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, List, Optional
+
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+
+# Seconds a client waits for the server to accept a command
+CONNECT_TIMEOUT = 1.0
+
+
+class ShareWoodServer(socketserver.UnixStreamServer):
+    """ Local Unix socket server running command lines with a long-lived, logged-in automator """
+
+    def __init__(
+        self,
+        path: str,
+        handler: Callable[[List[str]], int],
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new server and bind its socket
+
+        Commands run one at a time, the automator and its browser are not
+        shared between threads.
+
+        Args:
+            path: Path of the Unix socket, replaced if a stale one exists
+            handler: Runs a command line (arguments without program name), printing its output and returning its exit code
+            metrics: Duration and number of the commands served, "server.command" (default: disabled)
+
+        Raises:
+            OSError: If the socket cannot be bound, e.g. another server is running
+        """
+
+        self.path = os.path.expanduser(path)
+        self.handler = handler
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+        # Socket of a server which did not stop cleanly, a running one answers
+        if os.path.exists(self.path):
+            if ShareWoodClient(self.path).is_serving():
+                raise OSError(f"A server is already listening on {self.path}")
+            os.unlink(self.path)
+
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        super().__init__(self.path, ShareWoodServerHandler)
+        # Commands use the server login, only its user may send them
+        os.chmod(self.path, 0o600)
+
+    def run(self, argv: List[str]) -> Dict[str, Any]:
+        """
+        Run a command line, capturing its output
+
+        Args:
+            argv: Command line arguments, without program name
+
+        Returns:
+            dict: Exit code, standard output and standard error of the command
+        """
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.metrics.timer("server.command"), redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                code = self.handler(argv)
+            except SystemExit as e:
+                # Invalid arguments, argparse already printed the usage
+                code = e.code if isinstance(e.code, int) else 2
+            # The server keeps serving, whatever failed the command
+            except Exception as e:
+                print(f"Error: {type(e).__name__}: {e}", file=sys.stderr)
+                code = 1
+
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def server_close(self) -> None:
+        """ Close the socket and remove its file """
+
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ShareWoodServerHandler(socketserver.StreamRequestHandler):
+    """ Reads one command line as a JSON line, and answers its result as a JSON line """
+
+    def handle(self) -> None:
+        """ Run the command line of the connection """
+
+        line = self.rfile.readline()
+        # Connection only probing whether the server listens
+        if not line:
+            return
+
+        try:
+            request = json.loads(line.decode("utf-8"))
+            argv = [str(arg) for arg in request["argv"]]
+        except (ValueError, KeyError, TypeError):
+            response = {"code": 2, "stdout": "", "stderr": "Error: invalid request\n"}
+        else:
+            response = self.server.run(argv)
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ShareWoodClient:
+    """ Sends command lines to a running ShareWoodServer """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize a new client
+
+        Args:
+            path: Path of the server Unix socket
+        """
+
+        self.path = os.path.expanduser(path)
+
+    def _connect(self) -> Optional[socket.socket]:
+        """ Connected socket, None if no server listens """
+
+        if not os.path.exists(self.path):
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(CONNECT_TIMEOUT)
+        try:
+            connection.connect(self.path)
+        except OSError:
+            # Stale socket file, or not a socket
+            connection.close()
+            return None
+
+        return connection
+
+    def is_serving(self) -> bool:
+        """
+        Whether a server listens on the socket
+
+        Returns:
+            bool: True if the socket accepts connections
+        """
+
+        connection = self._connect()
+        if connection is None:
+            return False
+
+        connection.close()
+
+        return True
+
+    def run(self, argv: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Run a command line on the server
+
+        Args:
+            argv: Command line arguments, without program name
+
+        Returns:
+            dict: Exit code, standard output and standard error of the command, None if no server listens
+
+        Raises:
+            ConnectionError: If the server stops before answering, the command may have run partly
+        """
+
+        connection = self._connect()
+        if connection is None:
+            return None
+
+        with connection:
+            # Commands such as crawls may run for long, only connecting is bounded
+            connection.settimeout(None)
+            connection.sendall(json.dumps({"argv": list(argv)}).encode("utf-8") + b"\n")
+            with connection.makefile("rb") as answer:
+                line = answer.readline()
+
+        if not line:
+            raise ConnectionError(f"Server on {self.path} stopped before answering")
+
+        return json.loads(line.decode("utf-8"))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+
+class ShareWoodSessionStore:
+    """ Encrypted on-disk store of ShareWood.tv session cookies """
+
+    # Size of the random salt stored in front of the encrypted cookies
+    SALT_SIZE = 16
+    # PBKDF2 iterations deriving the encryption key from the secret
+    KDF_ITERATIONS = 200_000
+
+    def __init__(self, path: str, secret: str) -> None:
+        """
+        Initialize a new session store
+
+        Args:
+            path: Path of the session file
+            secret: Secret the encryption key is derived from
+        """
+
+        self.path = os.path.expanduser(path)
+        self.secret = secret
+
+    def _fernet(self, salt: bytes) -> Fernet:
+        """
+        Derive the Fernet cipher for a salt
+
+        Args:
+            salt: Random salt of the session file
+
+        Returns:
+            Fernet: Cipher encrypting the session file
+        """
+
+        key = hashlib.pbkdf2_hmac("sha256", self.secret.encode("utf-8"), salt, self.KDF_ITERATIONS)
+
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def save(self, cookies: List[Dict[str, Any]]) -> None:
+        """
+        Encrypt and save session cookies, replacing the session file atomically
+
+        Args:
+            cookies: Cookies as dictionaries (Selenium get_cookies() format)
+        """
+
+        # Encrypt cookies with a fresh salt
+        salt = os.urandom(self.SALT_SIZE)
+        token = self._fernet(salt).encrypt(json.dumps(cookies).encode("utf-8"))
+
+        # Write to a private temporary file, then move it over the session file
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".session-")
+        try:
+            with os.fdopen(fd, "wb") as session_file:
+                session_file.write(salt + token)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load and decrypt session cookies
+
+        Returns:
+            list[dict]: Saved cookies, None if no valid session file exists
+        """
+
+        try:
+            with open(self.path, "rb") as session_file:
+                content = session_file.read()
+        except FileNotFoundError:
+            return None
+
+        # Unreadable file (other secret, truncated, tampered) is ignored
+        salt, token = content[:self.SALT_SIZE], content[self.SALT_SIZE:]
+        try:
+            return json.loads(self._fernet(salt).decrypt(token))
+        except (InvalidToken, ValueError):
+            return None
+
+    def clear(self) -> None:
+        """
+        Delete the session file
+        """
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
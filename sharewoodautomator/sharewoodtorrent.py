@@ -2,123 +2,168 @@
 # -*- coding: utf-8 -*-
 
 import os
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Optional, Type, TypeVar
 from urllib import request
 
+from .sharewoodnormalize import (
+    format_size,
+    normalize_text,
+    parse_age,
+    parse_discounts,
+    parse_flag,
+    parse_float,
+    parse_int,
+    parse_size,
+)
 
+C = TypeVar("C")
+
+
+def add_slots(cls: Type[C]) -> Type[C]:
+    """
+    Recreates a dataclass with __slots__, as dataclass(slots=True) does since Python 3.10
+
+    Instances have no __dict__, which divides their memory footprint.
+
+    Args:
+        cls: Dataclass to recreate
+
+    Returns:
+        type: Same dataclass, with one slot per field
+    """
+
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(cls_field.name for cls_field in fields(cls))
+
+    # Defaults are already held by __init__, class attributes would shadow the slots
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+
+    return slotted_cls
+
+
+@add_slots
 @dataclass
 class ShareWoodTorrent:
-    """ShareWood.tv torrent"""
+    """ShareWood.tv torrent, scraped texts are normalized into typed values"""
 
-    url: str = field(
+    url: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "URL of the torrent page"}
+        metadata={"description": "URL of the torrent page", "normalize": normalize_text}
     )
-    title: str = field(
+    title: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Title of the torrent"}
+        metadata={"description": "Title of the torrent", "normalize": normalize_text}
     )
-    description: str = field(
+    description: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Description of the torrent"}
+        metadata={"description": "Description of the torrent", "normalize": normalize_text}
     )
-    hash: str = field(
+    hash: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Hash of the torrent"}
+        metadata={"description": "Hash of the torrent", "normalize": normalize_text}
     )
-    uploader: str = field(
+    uploader: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Uploader of the torrent"}
+        metadata={"description": "Uploader of the torrent", "normalize": normalize_text}
     )
-    uploader_profile: str = field(
+    uploader_profile: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "URL of the uploader profile"}
+        metadata={"description": "URL of the uploader profile", "normalize": normalize_text}
     )
-    size: str = field(
+    size: Optional[int] = field(
         init=True,
         default=None,
-        metadata={"description": "Size of the torrent"}
+        metadata={"description": "Size of the torrent in bytes", "normalize": parse_size}
     )
-    age: str = field(
+    age: Optional[float] = field(
         init=True,
         default=None,
-        metadata={"description": "Age of the torrent"}
+        metadata={"description": "Upload timestamp of the torrent, in seconds since the epoch", "normalize": parse_age}
     )
-    ratio: str = field(
+    ratio: Optional[float] = field(
         init=True,
         default=None,
-        metadata={"description": "Estimated ratio of the torrent"}
+        metadata={"description": "Estimated ratio of the torrent", "normalize": parse_float}
     )
-    tags: str = field(
+    tags: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Tags of the torrent"}
+        metadata={"description": "Tags of the torrent", "normalize": normalize_text}
     )
-    resolution: str = field(
+    resolution: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Resolution of the torrent"}
+        metadata={"description": "Resolution of the torrent", "normalize": normalize_text}
     )
-    seeders: int = field(
+    seeders: Optional[int] = field(
         init=True,
         default=None,
-        metadata={"description": "Number of seeders"}
+        metadata={"description": "Number of seeders", "normalize": parse_int}
     )
-    leechers: int = field(
+    leechers: Optional[int] = field(
         init=True,
         default=None,
-        metadata={"description": "Number of leechers"}
+        metadata={"description": "Number of leechers", "normalize": parse_int}
     )
-    discounts: str = field(
+    discounts: Optional[bool] = field(
         init=True,
         default=None,
-        metadata={"description": "Discounts value of the torrent"}
+        metadata={"description": "Flag indicating if torrent has a discount (freeleech, double upload...)", "normalize": parse_discounts}
     )
-    fastline_credit_url: str = field(
+    fastline_credit_url: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "URL of the fastline credit"}
+        metadata={"description": "URL of the fastline credit", "normalize": normalize_text}
     )
-    category: str = field(
+    category: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Category of the torrent"}
+        metadata={"description": "Category of the torrent", "normalize": normalize_text}
     )
-    subcategory: str = field(
+    subcategory: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Subcategory of the torrent"}
+        metadata={"description": "Subcategory of the torrent", "normalize": normalize_text}
     )
-    languages: str = field(
+    languages: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"description": "Languages of the torrent"}
+        metadata={"description": "Languages of the torrent", "normalize": normalize_text}
     )
-    three_d_flag: bool = field(
+    three_d_flag: Optional[bool] = field(
         init=True,
         default=None,
-        metadata={"description": "Flag indicating if torrent is 3D"}
+        metadata={"description": "Flag indicating if torrent is 3D", "normalize": parse_flag}
     )
-    completed: int = field(
+    completed: Optional[int] = field(
         init=True,
         default=None,
-        metadata={"description": "Number of completed downloads"}
+        metadata={"description": "Number of completed downloads", "normalize": parse_int}
     )
-    nb_comments: int = field(
+    nb_comments: Optional[int] = field(
         init=True,
         default=None,
-        metadata={"description": "Number of comments"}
+        metadata={"description": "Number of comments", "normalize": parse_int}
     )
-    download_link: str = field(
+    download_link: Optional[str] = field(
         init=True,
         default=None,
-        metadata={"id": "download_link"}
+        metadata={"id": "download_link", "description": "URL of the torrent file", "normalize": normalize_text}
     )
     downloaded: bool = field(
         init=False,
@@ -131,6 +176,48 @@ class ShareWoodTorrent:
         metadata={"description": "Path to downloaded torrent file"}
     )
 
+    def __post_init__(self) -> None:
+        """ Normalize scraped texts given to the constructor """
+
+        # Slots have no class default, __init__ leaves fields without init unset
+        self.downloaded = False
+        self.downloaded_path = None
+
+        for name, normalize in NORMALIZERS:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, normalize(value))
+
+    @staticmethod
+    def normalize(values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize scraped texts by field name
+
+        Args:
+            values: Scraped texts or normalized values by field name
+
+        Returns:
+            dict: Normalized values by field name
+        """
+
+        normalizers = dict(NORMALIZERS)
+
+        return {
+            name: normalizers[name](value) if value is not None and name in normalizers else value
+            for name, value in values.items()
+        }
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """
+        Set fields from scraped texts or normalized values
+
+        Args:
+            values: Scraped texts or normalized values by field name
+        """
+
+        for name, value in self.normalize(values).items():
+            setattr(self, name, value)
+
     def __repr__(self):
         """ String representation of the torrent """
         return f"""
@@ -138,8 +225,8 @@ class ShareWoodTorrent:
             -------------------
             \t Description: {getattr(self, 'description', 'N/A')}
             \t Uploader: {getattr(self, 'uploader', 'N/A')}
-            \t Size: {getattr(self, 'size', 'N/A')}
-            \t Age: {getattr(self, 'age', 'N/A')}
+            \t Size: {format_size(self.size)}
+            \t Uploaded: {time.strftime('%Y-%m-%d %H:%M', time.localtime(self.age)) if self.age is not None else 'N/A'}
             \t Seeders: {getattr(self, 'seeders', 'N/A')}
             \t Leechers: {getattr(self, 'leechers', 'N/A')}
             \t Completed: {getattr(self, 'completed', 'N/A')}
@@ -150,6 +237,39 @@ class ShareWoodTorrent:
         """ String conversion of the torrent """
         return self.__repr__()
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the torrent to a JSON serializable dictionary
+
+        Returns:
+            dict: Fields values by field name
+        """
+
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "ShareWoodTorrent":
+        """
+        Create a torrent from a dictionary made by to_dict()
+
+        Args:
+            values: Fields values by field name, unknown names are ignored
+
+        Returns:
+            ShareWoodTorrent: New torrent instance
+        """
+
+        # Init fields go through the constructor, the others are restored after
+        torrent_fields = [torrent_field for torrent_field in fields(cls) if torrent_field.name in values]
+        torrent = cls(**{
+            torrent_field.name: values[torrent_field.name] for torrent_field in torrent_fields if torrent_field.init
+        })
+        for torrent_field in torrent_fields:
+            if not torrent_field.init:
+                setattr(torrent, torrent_field.name, values[torrent_field.name])
+
+        return torrent
+
     def download(self, download_path: str = ".") -> None:
         """ 
         Download torrent file
@@ -199,3 +319,11 @@ class ShareWoodTorrent:
                 self.downloaded_path = None
             else:
                 raise FileNotFoundError("Downloaded torrent file not found")
+
+
+# Normalizer of each field, from the field metadata
+NORMALIZERS = tuple(
+    (torrent_field.name, torrent_field.metadata["normalize"])
+    for torrent_field in fields(ShareWoodTorrent)
+    if "normalize" in torrent_field.metadata
+)
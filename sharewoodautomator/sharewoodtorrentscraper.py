@@ -1,290 +1,330 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from bs4 import BeautifulSoup
-
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
+from urllib.parse import urljoin
+
+from .exceptions import ShareWoodAuthenticationError
+from .sharewoodcache import ShareWoodDetailCache
+from .sharewooddriverpool import ShareWoodDriverPool
+from .sharewoodhttpsession import ShareWoodHttpSession
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+from .sharewoodparser import ShareWoodHtmlParser, get_parser
 from .sharewoodtorrent import ShareWoodTorrent
 
+if TYPE_CHECKING:  # pragma: no cover - Selenium is only imported by the browser backend
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@dataclass
+class ShareWoodScrapeResult:
+    """Outcome of scraping one torrent page"""
+
+    torrent: ShareWoodTorrent = field(
+        metadata={"description": "Scraped torrent"}
+    )
+    error: Optional[Exception] = field(
+        default=None,
+        metadata={"description": "Error raised while fetching or parsing the page, None on success"}
+    )
+
+    @property
+    def ok(self) -> bool:
+        """ True if the torrent was scraped successfully """
+        return self.error is None
+
+
+def parse_torrent_page(html: str, parser_name: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Parses a torrent page, module level so it can run in worker processes
+
+    Args:
+        html: HTML source of the torrent page
+        parser_name: HTML parser backend name (default: fastest installed)
+
+    Returns:
+        dict: Scraped ShareWoodTorrent fields values
+    """
+
+    return get_parser(parser_name).parse_torrent_page(html)
+
 
 class ShareWoodTorrentScraper:
     """ Scrapes information of torrents from ShareWood.tv """
 
-    def __init__(self, browser):
-        """ Initializes ShareWoodTorrentScraper """
+    # Smaller batches are parsed in the fetching threads, starting processes costs more than parsing them
+    PROCESS_PARSE_MIN_PAGES = 16
+
+    def __init__(
+        self,
+        browser: Optional["WebDriver"],
+        session: Optional[ShareWoodHttpSession] = None,
+        pool: Optional[ShareWoodDriverPool] = None,
+        parser: Optional[ShareWoodHtmlParser] = None,
+        detail_cache: Optional[ShareWoodDetailCache] = None,
+        login_url: Optional[str] = None,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initializes ShareWoodTorrentScraper
 
-        self.browser = browser
+        Torrent pages are fetched with the HTTP session if given, else with
+        the pooled browsers if given, else with the browser. Torrents found
+        in the detail cache with fresh counters are not fetched again.
 
-    def _get_discounts(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets discounts value of a torrent
-        
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Discounts value
+            browser: Selenium WebDriver instance
+            session: Pooled HTTP session logged in to ShareWood.tv (default: None)
+            pool: Pool of logged-in browsers (default: None)
+            parser: HTML parser of torrent pages (default: fastest installed)
+            detail_cache: Cache of torrent pages values (default: None)
+            login_url: URL of ShareWood.tv login page, used to detect expired sessions (default: None)
+            metrics: Timers and counters of the scrape phases (default: disabled)
         """
 
-        discounts = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(1) > td:nth-child(2) > span > i")
+        self.browser = browser
+        self.session = session
+        self.pool = pool
+        self.parser = parser or get_parser()
+        self.detail_cache = detail_cache
+        self.login_url = login_url
+        self.metrics = metrics if metrics is not None else NULL_METRICS
 
-        return discounts.text if discounts else None
-    
-    def _get_fastline_credit_url(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets use fastline credit url of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Use fastline credit url
-        """
+        # Parsing processes, started by the first large batch and reused by the next ones
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        self._parse_workers: Optional[int] = None
 
-        use_fastline_credit = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(2) > td:nth-child(2) > a['href']")
+    def _parse_pool(self, workers: Optional[int]) -> ProcessPoolExecutor:
+        """ Parsing processes of the given size, started on first use """
 
-        return use_fastline_credit.text if use_fastline_credit else None
-    
-    def _get_uploader_profile(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets URL of the uploader profile of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: URL of the uploader profile
-        """
+        if self._parse_executor is None or self._parse_workers != workers:
+            self.close()
+            self._parse_executor = ProcessPoolExecutor(max_workers=workers)
+            self._parse_workers = workers
 
-        uploader_profile = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(3) > td:nth-child(2) > a['href']")
+        return self._parse_executor
 
-        return uploader_profile.text if uploader_profile else None
-    
-    def _get_age(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets age of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Age of the torrent
+    def close(self) -> None:
+        """
+        Stops the parsing processes, if started
         """
 
-        age = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(4) > td:nth-child(2)")
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=True)
+            self._parse_executor = None
 
-        return age.text if age else None
-    
-    def _get_size(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets size of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Size of the torrent
+    def fetch_page(self, url: str) -> str:
         """
+        Fetches HTML source of a torrent page
 
-        size = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(5) > td:nth-child(2)")
-
-        return size.text if size else None
-    
-    def _get_ratio(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets estimated ratio of a torrent
-        
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
+            url: URL of the torrent page
+
         Returns:
-            str: Estimated ratio of the torrent
+            str: HTML source of the torrent page
+
+        Raises:
+            ShareWoodAuthenticationError: If the HTTP session was redirected to the login page
         """
 
-        ratio = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(6) > td:nth-child(2)")
+        self.metrics.increment("scrape.pages")
+
+        # Plain HTTP request, no page rendering
+        if self.session is not None:
+            with self.metrics.timer("scrape.request"):
+                response = self.session.get(url)
+            response.raise_for_status()
+            # Expired session, the login page would be parsed as an empty torrent page
+            if self.login_url and response.url.startswith(self.login_url):
+                raise ShareWoodAuthenticationError("ShareWood.tv session is not logged in")
+            return response.text
+
+        # Borrow a pooled browser
+        if self.pool is not None:
+            with self.pool.driver() as driver:
+                with self.metrics.timer("scrape.navigate"):
+                    driver.get(url)
+                with self.metrics.timer("scrape.extract"):
+                    return driver.page_source
 
-        return ratio.text if ratio else None
-    
-    def _get_category(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets category of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Category of the torrent
-        """
+        # Open torrent page
+        with self.metrics.timer("scrape.navigate"):
+            self.browser.get(url)
 
-        category = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(7) > td:nth-child(2)")
+        # Get page HTML content
+        with self.metrics.timer("scrape.extract"):
+            return self.browser.page_source
 
-        return category.text if category else None
-    
-    def _get_subcategory(self, soup: BeautifulSoup) -> str:
+    def parse(self, html: str) -> Dict[str, Optional[str]]:
         """ 
-        Gets subcategory of a torrent
+        Parses information of a torrent page
         
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
+            html: HTML source of the torrent page
+
         Returns:
-            str: Subcategory of the torrent
+            dict: Scraped ShareWoodTorrent fields values
         """
 
-        subcategory = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(8) > td:nth-child(2)")
+        with self.metrics.timer("scrape.parse"):
+            return self.parser.parse_torrent_page(html)
 
-        return subcategory.text if subcategory else None
-    
-    def _get_tags(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets tags of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Tags of the torrent
+    def _cached(self, torrent: ShareWoodTorrent, refresh: bool) -> Optional[Dict[str, Optional[str]]]:
         """
+        Gets cached values of a torrent page
 
-        tags = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(9) > td:nth-child(2)")
-
-        return tags.text if tags else None
-    
-    def _get_languages(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets languages of a torrent
-        
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
+            torrent: ShareWoodTorrent to scrape information from
+            refresh: Ignore the detail cache
+
         Returns:
-            str: Languages of the torrent
+            dict: Cached ShareWoodTorrent fields values, None if the page must be fetched
         """
 
-        languages = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(10) > td:nth-child(2)")
+        if self.detail_cache is None or refresh:
+            return None
 
-        return languages.text if languages else None
-    
-    def _get_resolution(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets resolution of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Resolution of the torrent
-        """
+        values = self.detail_cache.get(torrent.url)
+        if values is not None:
+            self.metrics.increment("scrape.cache_hits")
 
-        resolution = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(11) > td:nth-child(2)")
+        return values
 
-        return resolution.text if resolution else None
-    
-    def _get_three_d_flag(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets 3D flag of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: 3D flag of the torrent
+    def _apply(self, torrent: ShareWoodTorrent, values: Dict[str, Optional[str]], fetched: bool) -> None:
         """
+        Sets scraped values on a torrent, caching freshly fetched ones normalized
 
-        three_d_flag = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(12) > td:nth-child(2)")
-
-        return three_d_flag.text if three_d_flag else None
-    
-    def _get_hash(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets hash of a torrent
-        
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Hash of the torrent
+            torrent: ShareWoodTorrent to scrape information from
+            values: Scraped ShareWoodTorrent fields values
+            fetched: Values come from the torrent page rather than the detail cache
         """
 
-        torrent_hash = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(13) > td:nth-child(2)")
+        # Download link may be relative to the torrent page
+        if fetched and values.get("download_link"):
+            values["download_link"] = urljoin(torrent.url, values["download_link"])
 
-        return torrent_hash.text if torrent_hash else None
-    
-    def _get_seeders(self, soup: BeautifulSoup) -> str:
+        values = torrent.normalize(values)
+        for name, value in values.items():
+            setattr(torrent, name, value)
+
+        if fetched and self.detail_cache is not None:
+            self.detail_cache.put(torrent.url, values)
+
+    def scrape(self, torrent: ShareWoodTorrent, refresh: bool = False) -> None:
         """ 
-        Gets seeders of a torrent
+        Scrapes information of torrents from ShareWood.tv
         
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Seeders of the torrent
+            torrent: ShareWoodTorrent to scrape information from
+            refresh: Fetch the torrent page even if cached (default: False)
         """
 
-        seeders = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(14) > td:nth-child(2) > span.badge-extra.text-green")
+        # Known torrent with fresh counters, no page load
+        values = self._cached(torrent, refresh)
+        if values is not None:
+            self._apply(torrent, values, fetched=False)
+            return
+
+        # Fetch and parse torrent page
+        self._apply(torrent, self.parse(self.fetch_page(torrent.url)), fetched=True)
 
-        return seeders.text if seeders else None
-    
-    def _get_leechers(self, soup: BeautifulSoup) -> str:
+    def _fetch_and_parse(self, torrent: ShareWoodTorrent, parse_executor: Optional[Executor]) -> Dict[str, Optional[str]]:
         """
-        Gets leechers of a torrent
-        
+        Fetches a torrent page and parses it in the parse executor, if any
+
         Args:
-            soup: BeautifulSoup instance of the torrent page
-        
+            torrent: ShareWoodTorrent to scrape information from
+            parse_executor: Worker pool parsing pages, None parses in the calling thread
+
         Returns:
-            str: Leechers of the torrent
+            dict: Scraped ShareWoodTorrent fields values
         """
 
-        leechers = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(15) > td:nth-child(2) > span.badge-extra.text-red")
+        html = self.fetch_page(torrent.url)
 
-        return leechers.text if leechers else None
-    
-    def _get_completed(self, soup: BeautifulSoup) -> str:
-        """ 
-        Gets completed of a torrent
-        
-        Args:
-            soup: BeautifulSoup instance of the torrent page
-        
-        Returns:
-            str: Completed of the torrent
-        """
+        if parse_executor is None:
+            return self.parse(html)
 
-        completed = soup.select_one("#app > div.row > div > div:nth-child(1) > table > tbody > tr:nth-child(16) > td:nth-child(2) > span.badge-extra.text-info")
+        # Parsing in a worker process, serialization included
+        with self.metrics.timer("scrape.parse"):
+            return parse_executor.submit(parse_torrent_page, html, self.parser.name).result()
 
-        return completed.text if completed else None
+    def scrape_many(
+        self,
+        torrents: Iterable[ShareWoodTorrent],
+        concurrency: Optional[int] = 4,
+        parse_workers: Optional[int] = None,
+        refresh: bool = False,
+    ) -> Iterator[ShareWoodScrapeResult]:
+        """
+        Scrapes information of several torrents concurrently
+
+        Pages are fetched by `concurrency` threads (HTTP session or pooled
+        browsers, a single browser fetches one page at a time) and parsed
+        by a pool of `parse_workers` processes, kept for the next batches
+        until close(). Batches of fewer than PROCESS_PARSE_MIN_PAGES pages
+        are parsed in the fetching threads by default. Results are yielded as soon
+        as each torrent is scraped, errors are reported per torrent instead
+        of being raised. Pending pages are cancelled if the iteration stops early.
+        Torrents served by the detail cache are yielded first, without fetching.
 
-    def scrape(self, torrent: ShareWoodTorrent) -> None:
-        """ 
-        Scrapes information of torrents from ShareWood.tv
-        
         Args:
-            torrent: ShareWoodTorrent to scrape information from
-        """
+            torrents: ShareWoodTorrent to scrape information from
+            concurrency: Number of pages fetched at once (default: 4)
+            parse_workers: Number of parsing processes, 0 parses in the fetching threads (default: CPU count, or 0 for small batches)
+            refresh: Fetch torrent pages even if cached (default: False)
 
-        # Open torrent page
-        self.browser.get(torrent.href)
+        Yields:
+            ShareWoodScrapeResult: Scraped torrent and error, in completion order
+        """
 
-        # Get page HTML content
-        html = self.browser.page_source
-
-        # Parse HTML content using BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Scrape torrent information
-        torrent.discounts = self._get_discounts(soup)
-        torrent.fastline_credit_url = self._get_fastline_credit_url(soup)
-        torrent.uploader_profile = self._get_uploader_profile(soup)
-        torrent.age = self._get_age(soup)
-        torrent.size = self._get_size(soup)
-        torrent.ratio = self._get_ratio(soup)
-        torrent.category = self._get_category(soup)
-        torrent.subcategory = self._get_subcategory(soup)
-        torrent.tags = self._get_tags(soup)
-        torrent.languages = self._get_languages(soup)
-        torrent.resolution = self._get_resolution(soup)
-        torrent.three_d_flag = self._get_three_d_flag(soup)
-        torrent.hash = self._get_hash(soup)
-        torrent.seeders = self._get_seeders(soup)
-        torrent.leechers = self._get_leechers(soup)
-        torrent.completed = self._get_completed(soup)
+        # Serve known torrents from the detail cache
+        to_fetch = []
+        for torrent in torrents:
+            values = self._cached(torrent, refresh)
+            if values is None:
+                to_fetch.append(torrent)
+                continue
+            self._apply(torrent, values, fetched=False)
+            yield ShareWoodScrapeResult(torrent=torrent)
+
+        if not to_fetch:
+            return
+
+        # A single browser cannot load pages concurrently
+        if self.session is None and self.pool is None:
+            concurrency = 1
+
+        parse_executor = None
+        if parse_workers != 0 and (parse_workers is not None or len(to_fetch) >= self.PROCESS_PARSE_MIN_PAGES):
+            parse_executor = self._parse_pool(parse_workers)
+        fetch_executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = {}
+
+        try:
+            futures = {
+                fetch_executor.submit(self._fetch_and_parse, torrent, parse_executor): torrent
+                for torrent in to_fetch
+            }
+
+            for future in as_completed(futures):
+                torrent = futures[future]
+
+                try:
+                    values = future.result()
+                except Exception as e:
+                    # Report error for this torrent only
+                    self.metrics.increment("scrape.errors")
+                    yield ShareWoodScrapeResult(torrent=torrent, error=e)
+                    continue
+
+                self._apply(torrent, values, fetched=True)
+                yield ShareWoodScrapeResult(torrent=torrent)
+        finally:
+            # Do not fetch remaining pages when the caller stops early
+            for future in futures:
+                future.cancel()
+            fetch_executor.shutdown(wait=True)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from .exceptions import ShareWoodPageError
+from .sharewoodmetrics import NULL_METRICS, ShareWoodMetrics
+
+if TYPE_CHECKING:  # pragma: no cover - Selenium is only imported by the browser backend
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+T = TypeVar("T")
+
+# Locator of an element, (By.<strategy>, value)
+Locator = Tuple[str, str]
+
+# Title fragments of the error pages, lowercase, a wait stops as soon as one is loaded
+ERROR_PAGE_TITLES = (
+    "404 not found",
+    "page introuvable",
+    "429 too many requests",
+    "500 internal server error",
+    "502 bad gateway",
+    "503 service",
+    "504 gateway",
+    "just a moment",
+    "attention required",
+    "maintenance",
+)
+
+# Bounds of the polling interval, in seconds
+MIN_POLL_INTERVAL = 0.02
+MAX_POLL_INTERVAL = 0.25
+
+# Number of recent latencies kept per operation
+LATENCY_WINDOW = 100
+
+# Exceptions of a condition meaning "not yet"
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+
+class ShareWoodWait:
+    """ Explicit waits of a browser, polling as fast as the page usually answers """
+
+    def __init__(
+        self,
+        browser: "WebDriver",
+        timeout: float,
+        budgets: Optional[Dict[str, float]] = None,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new wait engine
+
+        Browsers must not have an implicit wait, element lookups of a
+        condition are expected to answer at once.
+
+        Args:
+            browser: Selenium WebDriver instance
+            timeout: Default seconds to wait for a condition
+            budgets: Seconds allowed to each operation, overriding timeout (default: None)
+            metrics: Latency of the waits of each operation, "wait.<operation>" (default: disabled)
+        """
+
+        self.browser = browser
+        self.timeout = timeout
+        self.budgets = dict(budgets or {})
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+
+        # Recent latencies of each operation, polling interval is derived from them
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        # Deadline shared by the waits of the current budget block
+        self._deadline: Optional[float] = None
+
+    def poll_interval(self, operation: str) -> float:
+        """
+        Polling interval of an operation
+
+        A tenth of its median latency, a condition usually met after 300 ms
+        is checked every 30 ms, one met after 3 s every 250 ms.
+
+        Args:
+            operation: Operation name
+
+        Returns:
+            float: Seconds between two checks
+        """
+
+        with self._lock:
+            latencies = list(self._latencies.get(operation, ()))
+
+        if not latencies:
+            return MIN_POLL_INTERVAL
+
+        return min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, statistics.median(latencies) / 10))
+
+    @contextmanager
+    def budget(self, operation: str, seconds: Optional[float] = None) -> Iterator[None]:
+        """
+        Share one deadline between the waits of a multi-step operation
+
+        A missing element fails the whole operation once its budget is
+        spent, instead of each step waiting for the full timeout.
+
+        Args:
+            operation: Operation name, its budget is looked up in budgets
+            seconds: Seconds allowed to the operation (default: budgets entry, else timeout)
+        """
+
+        if seconds is None:
+            seconds = self.budgets.get(operation, self.timeout)
+
+        outer = self._deadline
+        deadline = time.monotonic() + seconds
+        self._deadline = deadline if outer is None else min(outer, deadline)
+        try:
+            yield
+        finally:
+            self._deadline = outer
+
+    def until(self, condition: Callable[["WebDriver"], T], operation: str, timeout: Optional[float] = None) -> T:
+        """
+        Wait for a condition
+
+        Args:
+            condition: Callable given the browser, returning a truthy value once met
+            operation: Operation name, for budgets, polling and statistics
+            timeout: Seconds to wait (default: budgets entry, else timeout)
+
+        Returns:
+            Truthy value returned by the condition
+
+        Raises:
+            TimeoutException: If the condition is not met in time
+            ShareWoodPageError: If an error page is loaded meanwhile
+        """
+
+        if timeout is None:
+            timeout = self.budgets.get(operation, self.timeout)
+
+        start = time.monotonic()
+        deadline = start + timeout
+        if self._deadline is not None:
+            deadline = min(deadline, self._deadline)
+        interval = self.poll_interval(operation)
+
+        while True:
+            try:
+                value = condition(self.browser)
+            except IGNORED_EXCEPTIONS:
+                value = None
+            if value:
+                self._record(operation, time.monotonic() - start)
+                return value
+
+            # Nothing will appear on an error page
+            title = self._error_page_title()
+            if title is not None:
+                self.metrics.increment("wait.error_pages")
+                raise ShareWoodPageError(f"ShareWood.tv answered an error page while waiting for {operation}: {title}")
+
+            now = time.monotonic()
+            if now >= deadline:
+                self.metrics.increment("wait.timeouts")
+                raise TimeoutException(f"Waited {now - start:.1f}s for {operation}")
+            time.sleep(min(interval, deadline - now))
+
+    def present(self, locator: Locator, operation: str, timeout: Optional[float] = None) -> "WebElement":
+        """
+        Wait for an element to be in the page
+
+        Args:
+            locator: Element locator, (By.<strategy>, value)
+            operation: Operation name
+            timeout: Seconds to wait (default: budgets entry, else timeout)
+
+        Returns:
+            WebElement: First matching element
+        """
+
+        def element(browser: "WebDriver") -> Optional["WebElement"]:
+            elements = browser.find_elements(*locator)
+            return elements[0] if elements else None
+
+        return self.until(element, operation, timeout)
+
+    def visible(self, locator: Locator, operation: str, timeout: Optional[float] = None) -> "WebElement":
+        """
+        Wait for an element to be displayed
+
+        Args:
+            locator: Element locator, (By.<strategy>, value)
+            operation: Operation name
+            timeout: Seconds to wait (default: budgets entry, else timeout)
+
+        Returns:
+            WebElement: First matching displayed element
+        """
+
+        def element(browser: "WebDriver") -> Optional["WebElement"]:
+            return next((element for element in browser.find_elements(*locator) if element.is_displayed()), None)
+
+        return self.until(element, operation, timeout)
+
+    def url_contains(self, url: str, operation: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the browser URL to contain a string
+
+        Args:
+            url: Expected part of the URL
+            operation: Operation name
+            timeout: Seconds to wait (default: budgets entry, else timeout)
+
+        Returns:
+            True once the URL matches
+        """
+
+        return self.until(lambda browser: url in browser.current_url, operation, timeout)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency statistics of the recent successful waits of each operation
+
+        Returns:
+            dict: count, p50, p95 and max latency in seconds, per operation
+        """
+
+        with self._lock:
+            windows: Dict[str, List[float]] = {operation: sorted(latencies) for operation, latencies in self._latencies.items()}
+
+        return {
+            operation: {
+                "count": len(latencies),
+                "p50": statistics.median(latencies),
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+            for operation, latencies in windows.items()
+        }
+
+    def _record(self, operation: str, seconds: float) -> None:
+        """ Record the latency of a successful wait """
+
+        with self._lock:
+            latencies = self._latencies.get(operation)
+            if latencies is None:
+                latencies = self._latencies[operation] = deque(maxlen=LATENCY_WINDOW)
+            latencies.append(seconds)
+
+        self.metrics.observe(f"wait.{operation}", seconds)
+
+    def _error_page_title(self) -> Optional[str]:
+        """ Title of the loaded page if it is a known error page """
+
+        try:
+            title = self.browser.title or ""
+        except WebDriverException:
+            return None
+
+        lowered = title.lower()
+
+        return title if any(fragment in lowered for fragment in ERROR_PAGE_TITLES) else None
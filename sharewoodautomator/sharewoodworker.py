@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, TypeVar
+
+from .exceptions import ShareWoodAuthenticationError
+from .sharewoodjobqueue import ShareWoodJob, ShareWoodJobQueue
+from .sharewoodmetrics import ShareWoodMetrics
+from .sharewoodtorrent import ShareWoodTorrent
+
+if TYPE_CHECKING:  # pragma: no cover - the automator imports Selenium and requests
+    from .sharewoodautomator import ShareWoodAutomator
+
+T = TypeVar("T")
+
+
+class ShareWoodWorker:
+    """ Runs the jobs of a ShareWoodJobQueue with its own logged-in automator """
+
+    def __init__(
+        self,
+        queue: ShareWoodJobQueue,
+        automator: "ShareWoodAutomator",
+        name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        refresh: Optional[bool] = False,
+        metrics: Optional[ShareWoodMetrics] = None,
+    ) -> None:
+        """
+        Initialize a new worker
+
+        Results are written by the automator to its index, detail cache and
+        search cache, shared with the other workers when they use the same
+        files. Jobs only keep a summary of their outcome.
+
+        Args:
+            queue: Job queue, possibly shared with workers of other processes and machines
+            automator: Connected automator, owned by this worker
+            name: Name of the worker in the queue (default: "<hostname>:<pid>")
+            batch_size: Jobs leased at once, scrapes of a batch run in parallel (default: automator pool size)
+            refresh: Scrape pages even if their details are cached and fresh (default: False)
+            metrics: Duration of the jobs of each kind, "worker.<kind>", and job counters (default: automator metrics)
+        """
+
+        self.queue = queue
+        self.automator = automator
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size or automator.pool.size
+        self.refresh = refresh
+        self.metrics = metrics if metrics is not None else automator.metrics
+
+        # Jobs of the running batch, their leases are renewed until they are finished
+        self._held: List[ShareWoodJob] = []
+        # A lease is not renewed while its job is being finished
+        self._lease_lock = threading.Lock()
+
+    def run(
+        self,
+        max_jobs: Optional[int] = None,
+        idle_exit: Optional[float] = None,
+        poll_interval: float = 1.0,
+    ) -> int:
+        """
+        Lease and run jobs until stopped
+
+        Leases of the running jobs are renewed in the background, so a long
+        crawl keeps its jobs. Jobs leased but not run when the worker stops
+        (Ctrl+C, SIGTERM) are given back to the queue at once, a killed
+        worker's jobs are retried once their lease expires.
+
+        Args:
+            max_jobs: Stop after this number of jobs (default: None, never)
+            idle_exit: Stop once the queue had no available job for this number of seconds (default: None, never)
+            poll_interval: Seconds between two leases while the queue is empty (default: 1.0)
+
+        Returns:
+            int: Number of jobs run, succeeded or failed
+        """
+
+        done = 0
+        idle_since = time.monotonic()
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop,), daemon=True)
+        heartbeat.start()
+
+        try:
+            while max_jobs is None or done < max_jobs:
+                limit = self.batch_size if max_jobs is None else min(self.batch_size, max_jobs - done)
+                jobs = self.queue.lease(self.name, limit=limit)
+
+                if not jobs:
+                    if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                self._held = jobs
+                try:
+                    done += self.process(jobs)
+                finally:
+                    self._held = []
+                    # Jobs of an interrupted batch, the queue hands them to another worker
+                    for job in jobs:
+                        if job.lease is not None:
+                            self.queue.release(job)
+                idle_since = time.monotonic()
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        return done
+
+    def process(self, jobs: List[ShareWoodJob]) -> int:
+        """
+        Run leased jobs, marking each one done or failed
+
+        Args:
+            jobs: Leased jobs, their lease is cleared once they are finished
+
+        Returns:
+            int: Number of jobs run
+        """
+
+        done = 0
+
+        for job in jobs:
+            if job.kind == "search":
+                self._search(job)
+                done += 1
+
+        scrapes = [job for job in jobs if job.kind == "scrape"]
+        if scrapes:
+            done += self._scrape(scrapes)
+
+        return done
+
+    def _heartbeat(self, stop: threading.Event) -> None:
+        """ Renew the leases of the running jobs, three times per lease """
+
+        while not stop.wait(self.queue.lease_seconds / 3):
+            for job in list(self._held):
+                with self._lease_lock:
+                    if job.lease is not None and not self.queue.renew(job):
+                        self.metrics.increment("worker.lost_leases")
+
+    def _relogin_once(self, func: Callable[[], T]) -> T:
+        """ Run func, logging in again and running it once more if the session expired """
+
+        try:
+            return func()
+        except ShareWoodAuthenticationError:
+            self.metrics.increment("worker.relogins")
+            self.automator.reconnect()
+            return func()
+
+    def _search(self, job: ShareWoodJob) -> None:
+        """ Run a search job over every page of results, a queued search always asks ShareWood.tv """
+
+        try:
+            with self.metrics.timer("worker.search"):
+                torrents = self._relogin_once(lambda: list(self.automator.iter_search(job.search_criteria)))
+        # A job failure must not stop the worker, whatever its cause
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            self._complete(job, {"results": len(torrents), "urls": [torrent.url for torrent in torrents]})
+
+    def _scrape(self, jobs: List[ShareWoodJob], relogin: Optional[bool] = True) -> int:
+        """ Run scrape jobs in parallel, logging in again once for the pages redirected to the login page """
+
+        # Results carry the torrents they were given
+        torrents = [ShareWoodTorrent(url=job.target) for job in jobs]
+        pending: Dict[int, ShareWoodJob] = {id(torrent): job for torrent, job in zip(torrents, jobs)}
+        expired: List[ShareWoodJob] = []
+
+        try:
+            with self.metrics.timer("worker.scrape"):
+                for result in self.automator.scrape_many(torrents, refresh=self.refresh):
+                    job = pending.pop(id(result.torrent))
+                    if result.ok:
+                        self._complete(job, result.torrent.to_dict())
+                    elif relogin and isinstance(result.error, ShareWoodAuthenticationError):
+                        expired.append(job)
+                    else:
+                        self._fail(job, result.error)
+        # Browser or session failure, every page left fails
+        except Exception as e:
+            for job in pending.values():
+                self._fail(job, e)
+
+        if expired:
+            self.metrics.increment("worker.relogins")
+            try:
+                self.automator.reconnect()
+            except Exception as e:
+                for job in expired:
+                    self._fail(job, e)
+            else:
+                self._scrape(expired, relogin=False)
+
+        return len(jobs)
+
+    def _complete(self, job: ShareWoodJob, result: Dict) -> None:
+        """ Mark a job done """
+
+        with self._lease_lock:
+            if not self.queue.complete(job, result):
+                self.metrics.increment("worker.lost_leases")
+            job.lease = None
+        self.metrics.increment("worker.jobs_done")
+
+    def _fail(self, job: ShareWoodJob, error: Exception) -> None:
+        """ Mark a job failed, to be retried """
+
+        with self._lease_lock:
+            if not self.queue.fail(job, f"{type(error).__name__}: {error}"):
+                self.metrics.increment("worker.lost_leases")
+            job.lease = None
+        self.metrics.increment("worker.jobs_failed")
@@ -58,3 +58,16 @@ def ensure_test_dir():
     # Clean up test directories
     for directory in test_dirs:
         os.removedirs(directory)
+
+
+@pytest.fixture
+def standin_server():
+    """Fixture to provide a running local ShareWood.tv stand-in server"""
+    from standin import ShareWoodStandInServer
+
+    server = ShareWoodStandInServer()
+    server.start()
+
+    yield server
+
+    server.stop()
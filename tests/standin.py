@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local stand-in for ShareWood.tv, serving recorded pages so that the HTTP
+backends can be exercised offline.
+
+Run it by hand with ``python tests/standin.py [port]`` and point the
+SHAREWOOD_* URLs of your .env file to http://127.0.0.1:<port>.
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+# Directory of recorded ShareWood.tv pages
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Markup of a torrents listing row
+LISTING_ROW = """
+        <div class="row  table-responsive-line">
+            <div class="col-md-8 col-titre">
+                <div class="type-table"><i class="fa fa-film"></i></div>
+                <div class="titre-table"><a name="torrent" href="{url}">{title}</a></div>
+            </div>
+            <div class="col-md-2 col-detail">
+                <div class="row">
+                    <div class="col-xs-4"><span class="age">{age}</span></div>
+                    <div class="col-xs-4"><span class="size">{size}</span></div>
+                    <div class="col-xs-4"><span class="comments">{comments}</span></div>
+                </div>
+            </div>
+            <div class="col-md-2 col-detail">
+                <div class="row">
+                    <div class="col-xs-4 col-padding"><span class="seeders">{seeders}</span></div>
+                    <div class="col-xs-4 col-padding"><span class="leechers">{leechers}</span></div>
+                    <div class="col-xs-4 col-padding"><span class="downloads">{downloads}</span></div>
+                </div>
+            </div>
+        </div>"""
+
+# Content of the served torrent files, a minimal bencoded dictionary
+TORRENT_FILE = b"d8:announce27:https://tracker.invalid/ann4:infod4:name4:test12:piece lengthi16384e6:pieces0:ee"
+
+# Session cookie set by the stand-in login
+SESSION_COOKIE = "sharewood_session"
+SESSION_VALUE = "standin-session"
+
+# Passkey accepted by the stand-in API
+API_PASSKEY = "standin-passkey"
+
+
+def read_fixture(name: str) -> str:
+    """Read a recorded page from the fixtures directory"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def make_catalogue(size: int, first_id: int = 1) -> List[Dict[str, str]]:
+    """Build a catalogue of fake torrents, newest (highest id) first"""
+    return [
+        {
+            "url": f"https://www.sharewood.tv/torrents/torrent-{torrent_id}.{torrent_id}",
+            "title": f"Torrent {torrent_id}",
+            "age": f"{size - torrent_id + first_id} heures",
+            "size": f"{torrent_id % 900 + 100} MiB",
+            "comments": str(torrent_id % 7),
+            "seeders": str(torrent_id * 37 % 500),
+            "leechers": str(torrent_id * 11 % 40),
+            "downloads": str(torrent_id * 53 % 3000),
+        }
+        for torrent_id in range(first_id + size - 1, first_id - 1, -1)
+    ]
+
+
+def render_listing(torrents: List[Dict[str, str]]) -> str:
+    """Render a torrents listing page"""
+    rows = "".join(LISTING_ROW.format(**torrent) for torrent in torrents)
+    return f"<html><body><div id=\"app\"><div id=\"result\">{rows}\n    </div></div></body></html>"
+
+
+class ShareWoodStandInHandler(BaseHTTPRequestHandler):
+    """Serves recorded ShareWood.tv pages"""
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Keep test output quiet"""
+
+    def _send(
+        self,
+        status: int,
+        body: Union[str, bytes] = "",
+        headers: Tuple[Tuple[str, str], ...] = (),
+        content_type: str = "text/html; charset=utf-8",
+    ) -> None:
+        """Send a response, text/html by default"""
+        payload = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _logged_in(self) -> bool:
+        """Check the session cookie sent by the client"""
+        return f"{SESSION_COOKIE}={SESSION_VALUE}" in self.headers.get("Cookie", "")
+
+    def _listing_page(self, params: Dict[str, str]) -> List[Dict[str, str]]:
+        """Slice the catalogue according to the qty and page parameters"""
+        quantity = int(params.get("qty", 25))
+        page = int(params.get("page", 1))
+        return self.server.catalogue[(page - 1) * quantity:page * quantity]
+
+    def _api(self, path: str, params: List[Tuple[str, str]]) -> None:
+        """Answer the passkey API from the recorded API torrents"""
+        passkey, _, endpoint = path[len("/api/"):].partition("/")
+        if passkey != API_PASSKEY:
+            self._send(401, json.dumps({"error": "Invalid passkey"}), content_type="application/json")
+            return
+
+        items = json.loads(read_fixture("api_torrents.json"))
+        if endpoint.endswith("/download"):
+            self._send(200, TORRENT_FILE, content_type="application/x-bittorrent")
+            return
+        if endpoint == "search":
+            name = dict(params).get("name", "").lower()
+            categories = [int(value) for key, value in params if key == "category"]
+            subcategories = [int(value) for key, value in params if key == "subcategory"]
+            items = [
+                item for item in items
+                if all(word in item["name"].lower() for word in name.split())
+                and (not categories or item["category_id"] in categories)
+                and (not subcategories or item["subcategory_id"] in subcategories)
+            ]
+        elif endpoint == "last-torrents":
+            items = items[:int(dict(params).get("limit", 25))]
+        else:
+            self._send(404, json.dumps({"error": "Not found"}), content_type="application/json")
+            return
+
+        self._send(200, json.dumps(items), content_type="application/json")
+
+    def do_GET(self):  # noqa: N802
+        """Route GET requests"""
+        url = urlsplit(self.path)
+        self.server.requests.append((url.path, parse_qsl(url.query)))
+
+        if url.path.startswith("/api/"):
+            self._api(url.path, parse_qsl(url.query))
+        elif url.path == "/login":
+            self._send(200, "<html><body><form id='login'></form></body></html>")
+        elif url.path == "/do-login":
+            self._send(302, headers=(
+                ("Set-Cookie", f"{SESSION_COOKIE}={SESSION_VALUE}; Path=/"),
+                ("Location", "/"),
+            ))
+        elif not self._logged_in():
+            self._send(302, headers=(("Location", "/login"),))
+        elif url.path == "/":
+            self._send(200, "<html><body><div id='app'>Accueil</div></body></html>")
+        elif url.path == "/torrents" and self.server.catalogue is None:
+            self._send(200, read_fixture("search_results.html"))
+        elif url.path == "/torrents":
+            self._send(200, render_listing(self._listing_page(dict(parse_qsl(url.query)))))
+        elif url.path.startswith("/torrents/"):
+            self._send(200, read_fixture("torrent_detail.html"))
+        elif url.path.startswith("/download/"):
+            self._send(200, TORRENT_FILE, content_type="application/x-bittorrent")
+        elif url.path.startswith("/files/"):
+            # Torrent file served by a CDN, as generic binary content
+            self._send(200, TORRENT_FILE, content_type="application/octet-stream")
+        else:
+            self._send(404, "<html><body>404</body></html>")
+
+
+class ShareWoodStandInServer(ThreadingHTTPServer):
+    """Threaded stand-in server recording the requests it receives"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0)) -> None:
+        super().__init__(address, ShareWoodStandInHandler)
+        # (path, query parameters) of every request received
+        self.requests: List[Tuple[str, List[Tuple[str, str]]]] = []
+        # Torrents served by the listing, None serves the recorded listing
+        self.catalogue: Optional[List[Dict[str, str]]] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the stand-in"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Serve requests in a background thread"""
+        threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    server = ShareWoodStandInServer(("127.0.0.1", port))
+    print(f"ShareWood.tv stand-in listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+from sharewoodautomator.sharewoodindex import ShareWoodIndex
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Prints the heavy modules loaded by a statement
+HEAVY_MODULES = """
+import sys
+{statement}
+print(sorted(name for name in sys.modules if name.startswith(("selenium.webdriver", "webdriver_manager", "bs4"))))
+"""
+
+
+def run_python(statement, env=None):
+    """Run a statement in a fresh interpreter, returning the heavy modules it loaded and its output"""
+    result = subprocess.run(
+        [sys.executable, "-c", HEAVY_MODULES.format(statement=statement)],
+        cwd=ROOT,
+        env=dict(os.environ, **(env or {})),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    *output, modules = result.stdout.splitlines()
+    return modules, output
+
+
+class TestMain:
+    """Tests for the command-line startup, without browser"""
+
+    def test_import_is_lazy(self):
+        """Test importing the package and reading its classes loads neither Selenium nor BeautifulSoup"""
+
+        modules, _ = run_python("import sharewoodautomator\nsharewoodautomator.ShareWoodTorrent")
+
+        assert modules == "[]"
+
+    def test_version(self):
+        """Test --version answers without importing the automator"""
+
+        result = subprocess.run(
+            [sys.executable, "-m", "sharewoodautomator", "--version"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "sharewoodautomator 0.1.0"
+
+    def test_local_commands_skip_browser_and_login(self, tmp_path, mock_env):
+        """Test local searches and cache commands neither start Chrome nor log in"""
+
+        index = ShareWoodIndex(path=str(tmp_path / "index.sqlite"))
+        index.upsert([ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", title="Ubuntu 22.04", seeders=152)])
+        index.close()
+        env = dict(
+            mock_env,
+            SHAREWOOD_PASSKEY="",
+            SESSION_FILE="",
+            SEARCH_CACHE_FILE=str(tmp_path / "search_cache.sqlite"),
+            DETAIL_CACHE_FILE="",
+            CHROMEDRIVER_CACHE_FILE="",
+            INDEX_FILE=str(tmp_path / "index.sqlite"),
+            SERVER_SOCKET="",
+        )
+
+        modules, output = run_python(
+            "from sharewoodautomator.__main__ import main\n"
+            "sys.argv = ['sharewoodautomator', 'search', 'ubuntu', '--local']\n"
+            "assert main() == 0\n"
+            "sys.argv = ['sharewoodautomator', 'cache', 'stats']\n"
+            "assert main() == 0",
+            env=env,
+        )
+
+        assert modules == "[]"
+        assert output[:2] == ["Found 1 results for 'ubuntu'", "1. Ubuntu 22.04 - Seeders: 152, Size: N/A"]
+        assert output[2:] == [
+            f"search: 0 entries ({tmp_path / 'search_cache.sqlite'})",
+            "detail: disabled",
+            f"index: 1 entries ({tmp_path / 'index.sqlite'})",
+        ]
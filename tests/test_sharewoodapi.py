@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from unittest.mock import patch
+
+import pytest
+from standin import API_PASSKEY
+
+from sharewoodautomator.__main__ import main
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError, ShareWoodSearchError
+from sharewoodautomator.sharewoodapi import ShareWoodApi
+from sharewoodautomator.sharewoodautomator import ShareWoodAutomator
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+
+class TestShareWoodApi:
+    """Tests for the ShareWoodApi class against the local stand-in"""
+
+    def _api(self, server, passkey=API_PASSKEY):
+        """Build an API client bound to the stand-in server"""
+        return ShareWoodApi(
+            api_url=f"{server.url}/api/",
+            passkey=passkey,
+            torrents_url="https://www.sharewood.tv/torrents",
+            timeout=5,
+        )
+
+    def test_search(self, standin_server):
+        """Test API torrents are mapped to ShareWoodTorrent, newest first"""
+
+        results = self._api(standin_server).search(ShareWoodSearchCriteria(query="Ubuntu 22.04"))
+
+        assert [torrent.title for torrent in results] == [
+            "Ubuntu 22.04 LTS Raspberry Pi",
+            "Ubuntu 22.04 LTS Server amd64",
+            "Ubuntu 22.04 LTS Desktop amd64",
+        ]
+        desktop = results[2]
+        assert desktop.url == "https://www.sharewood.tv/torrents/ubuntu-2204-lts-desktop-amd64.1001"
+        assert desktop.hash == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0"
+        assert desktop.seeders == 152
+        assert desktop.completed == 1893
+        assert desktop.category == "Applications"
+        assert desktop.subcategory == "Application Linux"
+        assert desktop.download_link == f"{standin_server.url}/api/{API_PASSKEY}/1001/download"
+        assert ("/api/standin-passkey/search", [("name", "Ubuntu 22.04")]) in standin_server.requests
+
+    def test_search_applies_criteria_to_response(self, standin_server):
+        """Test languages, types, sorting and quantity are applied to the API response"""
+
+        api = self._api(standin_server)
+
+        by_seeders = api.search(ShareWoodSearchCriteria(sorting="seeders", direction="desc", quantity=2))
+        freeleech = api.search(ShareWoodSearchCriteria(types={"freeleech": True}))
+        french = api.search(ShareWoodSearchCriteria(languages={"Français": True}))
+
+        assert [torrent.seeders for torrent in by_seeders] == [152, 48]
+        assert [torrent.title for torrent in freeleech] == ["Debian 12 Bookworm netinst amd64", "Ubuntu 22.04 LTS Server amd64"]
+        assert len(french) == 2
+
+    def test_latest(self, standin_server):
+        """Test the last uploaded torrents feed"""
+
+        latest = self._api(standin_server).latest(limit=2)
+
+        assert [torrent.title for torrent in latest] == ["Debian 12 Bookworm netinst amd64", "Ubuntu 22.04 LTS Raspberry Pi"]
+
+    def test_rejected_passkey(self, standin_server):
+        """Test a wrong passkey raises an authentication error"""
+
+        with pytest.raises(ShareWoodAuthenticationError):
+            self._api(standin_server, passkey="wrong").search(ShareWoodSearchCriteria(query="Ubuntu"))
+
+    def test_unsupported_criteria(self, standin_server):
+        """Test a search filtered by uploader is refused rather than answered unfiltered"""
+
+        with pytest.raises(ShareWoodSearchError, match="uploader"):
+            self._api(standin_server).search(ShareWoodSearchCriteria(query="Ubuntu", uploader="linuxfan"))
+        assert standin_server.requests == []
+
+    def _automator_env(self, server, monkeypatch, tmp_path):
+        """Environment of an automator bound to the stand-in server, with a passkey"""
+
+        for name, value in {
+            "SHAREWOOD_URL": server.url,
+            "SHAREWOOD_LOGIN_URL": f"{server.url}/login",
+            "SHAREWOOD_LOGOUT_URL": f"{server.url}/logout",
+            "SHAREWOOD_TORRENTS_URL": f"{server.url}/torrents",
+            "SHAREWOOD_API_URL": f"{server.url}/api/",
+            "SHAREWOOD_PASSKEY": API_PASSKEY,
+            "PSEUDO": "user",
+            "PASSWORD": "password",
+            "SESSION_FILE": "",
+            "SEARCH_CACHE_FILE": "",
+            "DETAIL_CACHE_FILE": "",
+            "CHROMEDRIVER_CACHE_FILE": "",
+            "INDEX_FILE": str(tmp_path / "index.sqlite"),
+        }.items():
+            monkeypatch.setenv(name, value)
+
+    def test_automator_prefers_api_without_browser(self, standin_server, monkeypatch, tmp_path):
+        """Test the automator searches through the API when a passkey is set, never starting Chrome"""
+
+        self._automator_env(standin_server, monkeypatch, tmp_path)
+
+        with patch.object(ShareWoodAutomator, "_init_driver", side_effect=AssertionError("Chrome started")):
+            automator = ShareWoodAutomator()
+            results = automator.search(ShareWoodSearchCriteria(query="Debian"))
+            local = automator.search(ShareWoodSearchCriteria(query="debian"), source="local")
+            automator.index.close()
+
+        assert automator.search_backend == "api"
+        assert [torrent.title for torrent in results] == ["Debian 12 Bookworm netinst amd64"]
+        assert local == results
+
+    def test_download_page_url_without_login(self, standin_server, monkeypatch, tmp_path):
+        """Test a torrent page URL is downloaded through its passkey link, without scraping its page nor logging in"""
+
+        self._automator_env(standin_server, monkeypatch, tmp_path)
+        url = f"{standin_server.url}/torrents/ubuntu-2204-lts-desktop-amd64.1001"
+
+        with patch.object(ShareWoodAutomator, "_init_driver", side_effect=AssertionError("Chrome started")):
+            assert main(["--no-server", "download", url, "-o", str(tmp_path / "torrents")]) == 0
+
+        assert (tmp_path / "torrents").exists() and len(os.listdir(tmp_path / "torrents")) == 1
+        assert all(path.startswith("/api/") for path, _ in standin_server.requests)
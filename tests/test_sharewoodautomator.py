@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from sharewoodautomator.exceptions import ShareWoodConnectionError
+from sharewoodautomator.sharewoodautomator import LEAN_BLOCKED_URLS, ShareWoodAutomator
+from sharewoodautomator.sharewooddriverresolver import ShareWoodDriverResolver
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+from sharewoodautomator.sharewoodtorrentscraper import ShareWoodTorrentScraper
+
+
+@pytest.fixture
+def automator_env(monkeypatch, mock_env):
+    """Environment of an automator without on-disk state"""
+    for name, value in dict(
+        mock_env,
+        SESSION_FILE="",
+        SEARCH_CACHE_FILE="",
+        DETAIL_CACHE_FILE="",
+        INDEX_FILE="",
+        CHROMEDRIVER_CACHE_FILE="",
+    ).items():
+        monkeypatch.setenv(name, value)
+
+
+class TestShareWoodAutomator:
+    """Tests for the ShareWoodAutomator browser startup"""
+
+    def _start(self, mock_chrome_driver, **kwargs):
+        """Start the main browser of a new automator, returning Chrome options and the driver"""
+        automator = ShareWoodAutomator(search_backend="browser", **kwargs)
+        with patch("selenium.webdriver.Chrome", return_value=mock_chrome_driver) as chrome, \
+                patch("selenium.webdriver.chrome.service.Service"), \
+                patch.object(ShareWoodDriverResolver, "resolve", return_value="/usr/bin/chromedriver"):
+            assert automator.browser is mock_chrome_driver
+        return chrome.call_args.kwargs["options"], mock_chrome_driver
+
+    def test_lean_profile(self, automator_env, mock_chrome_driver):
+        """Test the lean profile blocks non-essential resources and stops page loads at DOM ready"""
+
+        options, driver = self._start(mock_chrome_driver)
+
+        assert options.page_load_strategy == "eager"
+        assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+        driver.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": list(LEAN_BLOCKED_URLS)})
+
+    def test_full_profile(self, automator_env, mock_chrome_driver):
+        """Test lean=False loads pages completely"""
+
+        options, driver = self._start(mock_chrome_driver, lean=False)
+
+        assert options.page_load_strategy == "normal"
+        assert "prefs" not in options.experimental_options
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_api_connect_skips_browser(self, automator_env):
+        """Test the api backend connects without starting Chrome nor filling the login form"""
+
+        automator = ShareWoodAutomator()
+        with patch.object(ShareWoodAutomator, "_init_driver") as init_driver:
+            automator.connect()
+
+        assert automator.search_backend == "api"
+        init_driver.assert_not_called()
+
+    def test_pooled_scrape_skips_main_browser(self, automator_env):
+        """Test pages scraped by the browser pool do not start the main browser"""
+
+        automator = ShareWoodAutomator(search_backend="browser")
+        with patch.object(ShareWoodAutomator, "_init_driver") as init_driver, \
+                patch.object(ShareWoodTorrentScraper, "scrape_many", return_value=(result for result in [])) as scrape_many:
+            assert list(automator.scrape_many([ShareWoodTorrent(url="https://www.sharewood.tv/torrents/ubuntu.1")])) == []
+
+        init_driver.assert_not_called()
+        assert scrape_many.call_count == 1
+
+    def test_download_links_skip_scrape(self, automator_env):
+        """Test torrents which all have a download link are downloaded without scraping"""
+
+        automator = ShareWoodAutomator(search_backend="browser")
+        torrent = ShareWoodTorrent(
+            url="https://www.sharewood.tv/torrents/ubuntu.1",
+            download_link="https://www.sharewood.tv/download/1",
+        )
+        with patch.object(ShareWoodAutomator, "scrape_many") as scrape_many, \
+                patch.object(ShareWoodAutomator, "_downloader") as downloader:
+            automator.download_many([torrent])
+
+        scrape_many.assert_not_called()
+        downloader.return_value.download_many.assert_called_once_with([torrent], concurrency=4, overwrite=False)
+
+    def test_cleanup_after_failed_init(self, automator_env):
+        """Test an automator whose constructor failed is garbage collected without error"""
+
+        with pytest.raises(ValueError):
+            ShareWoodAutomator(search_backend="unknown")
+
+        # Constructor failed before setting any attribute
+        ShareWoodAutomator.__new__(ShareWoodAutomator).__del__()
+
+    def test_failed_logout_raises(self, automator_env, tmp_path, monkeypatch):
+        """Test a failed HTTP logout is raised, once the session is forgotten"""
+
+        monkeypatch.setenv("SESSION_FILE", str(tmp_path / "session.bin"))
+        automator = ShareWoodAutomator(search_backend="http", persist_session=True)
+        automator.session.cookies.set("sharewood_session", "expired")
+        automator.session_store.save([{"name": "sharewood_session", "value": "expired"}])
+
+        with patch.object(automator.session, "get", side_effect=requests.ConnectionError("refused")), \
+                pytest.raises(ShareWoodConnectionError, match="Logout failed: refused"):
+            automator.disconnect()
+
+        assert not automator.session.cookies
+        assert automator.session_store.load() is None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from standin import API_PASSKEY
+
+from sharewoodautomator.sharewoodautomator import ShareWoodAutomator
+from sharewoodautomator.sharewoodbatch import ShareWoodBatchResult
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+
+class TestShareWoodBatchResult:
+    """Tests for the ShareWoodBatchResult class"""
+
+    def test_merge_by_hash_and_url(self):
+        """Test a torrent found by several searches is kept once, by info hash or page URL"""
+
+        listed = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", title="A")
+        scraped = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", title="A", hash="ABC")
+        mirror = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a-copy.2", title="A copy", hash="abc")
+        other = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/b.3", title="B")
+        criteria = [ShareWoodSearchCriteria(query="a"), ShareWoodSearchCriteria(query="b")]
+
+        batch = ShareWoodBatchResult.merge(criteria, [[listed, other], [scraped, mirror]])
+
+        assert batch.merged == [listed, other]
+        assert batch[criteria[1]][0] is listed
+        assert batch[criteria[1]] == [listed, listed]
+        assert batch.duplicates == 2
+        assert [len(torrents) for _, torrents in batch] == [2, 2]
+
+
+class TestSearchBatch:
+    """Tests for ShareWoodAutomator.search_batch against the local stand-in"""
+
+    def test_search_batch(self, standin_server, monkeypatch, tmp_path):
+        """Test identical searches are requested once and torrents are shared across searches"""
+
+        for name, value in {
+            "SHAREWOOD_URL": standin_server.url,
+            "SHAREWOOD_LOGIN_URL": f"{standin_server.url}/login",
+            "SHAREWOOD_LOGOUT_URL": f"{standin_server.url}/logout",
+            "SHAREWOOD_TORRENTS_URL": f"{standin_server.url}/torrents",
+            "SHAREWOOD_API_URL": f"{standin_server.url}/api/",
+            "SHAREWOOD_PASSKEY": API_PASSKEY,
+            "PSEUDO": "user",
+            "PASSWORD": "password",
+            "SESSION_FILE": "",
+            "SEARCH_CACHE_FILE": str(tmp_path / "search_cache.sqlite"),
+            "DETAIL_CACHE_FILE": "",
+            "INDEX_FILE": "",
+            "CHROMEDRIVER_CACHE_FILE": "",
+        }.items():
+            monkeypatch.setenv(name, value)
+
+        automator = ShareWoodAutomator()
+        criteria = [
+            ShareWoodSearchCriteria(query="Ubuntu"),
+            ShareWoodSearchCriteria(query="Ubuntu 22.04 LTS Server"),
+            ShareWoodSearchCriteria(query="Ubuntu"),
+        ]
+
+        batch = automator.search_batch(criteria)
+        again = automator.search_batch(criteria[:1])
+        automator.search_cache.close()
+
+        searches = [params for path, params in standin_server.requests if path.endswith("/search")]
+        assert sorted(searches) == [[("name", "Ubuntu")], [("name", "Ubuntu 22.04 LTS Server")]]
+        assert [len(torrents) for torrents in batch.results] == [3, 1, 3]
+        assert len(batch.merged) == 3
+        assert batch.duplicates == 4
+        assert batch[criteria[1]][0] in batch[criteria[0]]
+        assert [torrent.url for torrent in again.merged] == [torrent.url for torrent in batch.results[0]]
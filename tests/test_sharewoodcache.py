@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+import pytest  # noqa: F401
+
+from sharewoodautomator.sharewoodcache import ShareWoodDetailCache, ShareWoodSearchCache
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+TORRENTS = [
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", title="A", seeders="12"),
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/b.2", title="B", size="1.4 GiB"),
+]
+
+
+class TestShareWoodSearchCache:
+    """Tests for the ShareWoodSearchCache class"""
+
+    def test_put_and_get(self, tmp_path):
+        """Test cached results are returned for equivalent criteria"""
+
+        cache = ShareWoodSearchCache(path=str(tmp_path / "cache.sqlite"), ttl=60)
+
+        cache.put(ShareWoodSearchCriteria(query="Ubuntu", languages={"Anglais": True, "Français": True}), TORRENTS)
+
+        # Same request, other dictionary order and unchecked options
+        cached = cache.get(ShareWoodSearchCriteria(query="Ubuntu", languages={"Français": True, "Anglais": True, "Autre": False}))
+        assert cached == TORRENTS
+        assert cache.get(ShareWoodSearchCriteria(query="Debian")) is None
+
+    def test_get_expired(self, tmp_path):
+        """Test results older than the TTL are dropped"""
+
+        cache = ShareWoodSearchCache(path=str(tmp_path / "cache.sqlite"), ttl=60)
+        criteria = ShareWoodSearchCriteria(query="Ubuntu")
+
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1000.0):
+            cache.put(criteria, TORRENTS)
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1059.0):
+            assert cache.get(criteria) == TORRENTS
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1060.0):
+            assert cache.get(criteria) is None
+
+        assert len(cache) == 0
+
+    def test_least_recently_used_are_evicted(self, tmp_path):
+        """Test the cache keeps max_entries searches, evicting the least recently used"""
+
+        cache = ShareWoodSearchCache(path=str(tmp_path / "cache.sqlite"), ttl=60, max_entries=2)
+        first, second, third = (ShareWoodSearchCriteria(query=query) for query in ("a", "b", "c"))
+
+        with patch("sharewoodautomator.sharewoodcache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+            cache.put(first, TORRENTS)
+            cache.put(second, TORRENTS)
+            cache.get(first)
+            cache.put(third, TORRENTS)
+
+            assert len(cache) == 2
+            assert cache.get(second) is None
+            assert cache.get(first) == TORRENTS
+
+    def test_persisted_on_disk(self, tmp_path):
+        """Test cached results survive reopening the cache file"""
+
+        path = str(tmp_path / "cache.sqlite")
+        criteria = ShareWoodSearchCriteria(query="Ubuntu")
+        cache = ShareWoodSearchCache(path=path, ttl=60)
+        cache.put(criteria, TORRENTS)
+        cache.close()
+
+        assert ShareWoodSearchCache(path=path, ttl=60).get(criteria) == TORRENTS
+
+
+class TestShareWoodDetailCache:
+    """Tests for the ShareWoodDetailCache class"""
+
+    URL = "https://www.sharewood.tv/torrents/a.1"
+    VALUES = {"hash": "3b24", "category": "Vidéos", "seeders": 12, "leechers": 3, "completed": 40}
+
+    def test_stale_counters(self, tmp_path):
+        """Test cached values are only served while counters are fresh"""
+
+        cache = ShareWoodDetailCache(path=str(tmp_path / "cache.sqlite"), max_age=60)
+
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1000.0):
+            cache.put(self.URL, self.VALUES)
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1059.0):
+            assert cache.get(self.URL) == self.VALUES
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1060.0):
+            assert cache.get(self.URL) is None
+        assert cache.get("https://www.sharewood.tv/torrents/b.2") is None
+
+    def test_update_counters(self, tmp_path):
+        """Test listed counters refresh cached torrents and keep immutable values"""
+
+        cache = ShareWoodDetailCache(path=str(tmp_path / "cache.sqlite"), max_age=60)
+        listed = ShareWoodTorrent(url=self.URL, seeders="20", leechers="1", completed="45")
+
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1000.0):
+            cache.put(self.URL, self.VALUES)
+        with patch("sharewoodautomator.sharewoodcache.time.time", return_value=1100.0):
+            cache.update_counters([listed, ShareWoodTorrent(url="https://www.sharewood.tv/torrents/b.2", seeders="1")])
+            assert cache.get(self.URL) == {"hash": "3b24", "category": "Vidéos", "seeders": 20, "leechers": 1, "completed": 45}
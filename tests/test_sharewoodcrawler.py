@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from standin import API_PASSKEY, make_catalogue
+
+from sharewoodautomator.sharewoodapi import ShareWoodApi
+from sharewoodautomator.sharewoodcrawler import ShareWoodCrawlState, ShareWoodDeltaCrawler, ShareWoodHighWaterMark
+from sharewoodautomator.sharewoodhttpsearch import ShareWoodHttpSearch
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+
+class TestShareWoodDeltaCrawler:
+    """Tests for the ShareWoodDeltaCrawler class against the local stand-in"""
+
+    def _crawler(self, server, tmp_path):
+        """Build a crawler bound to the stand-in server"""
+        session = ShareWoodHttpSession(timeout=5)
+        session.get(f"{server.url}/do-login")
+        searcher = ShareWoodHttpSearch(session=session, search_url=f"{server.url}/torrents", timeout=5)
+        return ShareWoodDeltaCrawler(searcher=searcher, state=ShareWoodCrawlState(path=str(tmp_path / "crawl.sqlite")))
+
+    def _listing_requests(self, server):
+        """Page parameter of each listing request received"""
+        return [dict(params).get("page", "1") for path, params in server.requests if path == "/torrents"]
+
+    def test_crawl_yields_only_new_torrents(self, standin_server, tmp_path):
+        """Test a crawl stops at the previous crawl mark, fetching only the pages of new torrents"""
+
+        standin_server.catalogue = make_catalogue(100)
+        crawler = self._crawler(standin_server, tmp_path)
+        criteria = ShareWoodSearchCriteria(quantity=25)
+
+        assert len(list(crawler.crawl(criteria, max_results=60))) == 60
+
+        # 30 uploads since the first crawl
+        standin_server.catalogue = make_catalogue(30, first_id=101) + standin_server.catalogue
+        standin_server.requests.clear()
+
+        new = list(crawler.crawl(criteria))
+
+        assert [torrent.title for torrent in new] == [f"Torrent {i}" for i in range(130, 100, -1)]
+        # Pages 1 and 2 hold new torrents, page 3 may have been prefetched
+        assert self._listing_requests(standin_server)[:2] == ["1", "2"]
+        assert len(self._listing_requests(standin_server)) <= 3
+        assert list(crawler.crawl(criteria)) == []
+
+    def test_crawl_stopped_early_keeps_mark(self, standin_server, tmp_path):
+        """Test the mark only moves once the crawl completes"""
+
+        standin_server.catalogue = make_catalogue(10)
+        crawler = self._crawler(standin_server, tmp_path)
+
+        crawl = crawler.crawl()
+        next(crawl)
+        crawl.close()
+
+        assert len(list(crawler.crawl())) == 10
+
+    def test_crawl_with_api(self, standin_server, tmp_path):
+        """Test the passkey API searcher crawls, and the mark is saved once every torrent was yielded"""
+
+        searcher = ShareWoodApi(
+            api_url=f"{standin_server.url}/api/",
+            passkey=API_PASSKEY,
+            torrents_url="https://www.sharewood.tv/torrents",
+            timeout=5,
+        )
+        crawler = ShareWoodDeltaCrawler(searcher=searcher, state=ShareWoodCrawlState(path=str(tmp_path / "crawl.sqlite")))
+
+        assert len(list(crawler.crawl())) == 4
+        assert list(crawler.crawl()) == []
+
+    def test_mark_reached(self):
+        """Test torrents are compared by ID, and by upload date when IDs are unknown"""
+
+        mark = ShareWoodHighWaterMark(url="https://www.sharewood.tv/torrents/a.100", id=100, age=1000000.0)
+
+        assert mark.reached(ShareWoodTorrent(url="https://www.sharewood.tv/torrents/b.99"), slack=3600)
+        assert not mark.reached(ShareWoodTorrent(url="https://www.sharewood.tv/torrents/c.101"), slack=3600)
+        assert mark.reached(ShareWoodTorrent(url="https://www.sharewood.tv/torrents/d", age=990000.0), slack=3600)
+        assert not mark.reached(ShareWoodTorrent(url="https://www.sharewood.tv/torrents/e", age=999000.0), slack=3600)
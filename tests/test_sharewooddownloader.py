@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+from standin import TORRENT_FILE
+
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError, ShareWoodDownloadError
+from sharewoodautomator.sharewooddownloader import ShareWoodTorrentDownloader
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+from sharewoodautomator.sharewoodtorrentscraper import ShareWoodTorrentScraper
+
+
+class TestShareWoodTorrentDownloader:
+    """Tests for the ShareWoodTorrentDownloader class against the local stand-in"""
+
+    def _session(self, server):
+        """Build a session logged in to the stand-in server"""
+        session = ShareWoodHttpSession(timeout=5)
+        session.get(f"{server.url}/do-login")
+        return session
+
+    def test_scraped_download_link(self, standin_server):
+        """Test the download link of a torrent page is resolved against the page URL"""
+
+        torrent = ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu-2204-lts-desktop-amd64.1001")
+
+        ShareWoodTorrentScraper(browser=None, session=self._session(standin_server)).scrape(torrent)
+
+        assert torrent.download_link == f"{standin_server.url}/download/ubuntu-2204-lts-desktop-amd64.1001"
+
+    def test_download_many(self, standin_server, tmp_path):
+        """Test download_many saves every file, skips existing ones and reports errors per torrent"""
+
+        downloader = ShareWoodTorrentDownloader(session=self._session(standin_server), download_path=str(tmp_path))
+        torrents = [
+            ShareWoodTorrent(title=f"Torrent {i}", download_link=f"{standin_server.url}/download/torrent-{i}.{i}")
+            for i in range(5)
+        ]
+        missing = ShareWoodTorrent(title="Missing", download_link=f"{standin_server.url}/nowhere/missing.404")
+        (tmp_path / "Torrent 0.torrent").write_bytes(b"already there")
+
+        report = downloader.download_many(torrents + [missing], concurrency=3)
+
+        assert (report.downloaded, report.skipped, report.failed) == (4, 1, 1)
+        assert report.bytes == 4 * len(TORRENT_FILE)
+        assert (tmp_path / "Torrent 3.torrent").read_bytes() == TORRENT_FILE
+        assert (tmp_path / "Torrent 0.torrent").read_bytes() == b"already there"
+        assert all(torrent.downloaded for torrent in torrents)
+        # Failed download leaves no partial file behind
+        assert sorted(os.listdir(tmp_path)) == [f"Torrent {i}.torrent" for i in range(5)]
+
+    def test_rejects_non_torrent(self, standin_server, tmp_path):
+        """Test a login page or any page other than a torrent file is not saved as a torrent"""
+
+        torrent = ShareWoodTorrent(title="Ubuntu", download_link=f"{standin_server.url}/download/ubuntu.1")
+
+        # Expired session, redirected to the login page
+        downloader = ShareWoodTorrentDownloader(
+            session=ShareWoodHttpSession(timeout=5), download_path=str(tmp_path), login_url=f"{standin_server.url}/login"
+        )
+        with pytest.raises(ShareWoodAuthenticationError):
+            downloader.download(torrent)
+
+        # HTML page served in place of the torrent file
+        torrent.download_link = f"{standin_server.url}/"
+        downloader = ShareWoodTorrentDownloader(session=self._session(standin_server), download_path=str(tmp_path))
+        with pytest.raises(ShareWoodDownloadError, match="HTML page"):
+            downloader.download(torrent)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_generic_content_type(self, standin_server, tmp_path):
+        """Test a torrent file served as application/octet-stream is downloaded"""
+
+        downloader = ShareWoodTorrentDownloader(session=self._session(standin_server), download_path=str(tmp_path))
+        torrent = ShareWoodTorrent(title="Ubuntu", download_link=f"{standin_server.url}/files/ubuntu.1")
+
+        assert downloader.download(torrent).size == len(TORRENT_FILE)
+
+    def test_same_title(self, standin_server, tmp_path):
+        """Test torrents sharing a title are saved to distinct files, named after their ID"""
+
+        downloader = ShareWoodTorrentDownloader(session=self._session(standin_server), download_path=str(tmp_path))
+        torrents = [
+            ShareWoodTorrent(
+                url=f"{standin_server.url}/torrents/ubuntu.{i}",
+                title="Ubuntu",
+                download_link=f"{standin_server.url}/download/ubuntu.{i}",
+            )
+            for i in (1, 2)
+        ]
+
+        report = downloader.download_many(torrents)
+
+        assert (report.downloaded, report.skipped) == (2, 0)
+        assert sorted(os.listdir(tmp_path)) == ["Ubuntu.1.torrent", "Ubuntu.2.torrent"]
+        assert downloader.target_path(ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu.3")).endswith("/ubuntu.3.torrent")
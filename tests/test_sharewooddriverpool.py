@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from sharewoodautomator.exceptions import ShareWoodPoolError
+from sharewoodautomator.sharewooddriverpool import ShareWoodDriverPool
+
+
+class TestShareWoodDriverPool:
+    """Tests for the ShareWoodDriverPool class"""
+
+    def test_checkout_reuses_checked_in_driver(self):
+        """Test a checked in driver is handed out again instead of creating a new one"""
+
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = ShareWoodDriverPool(driver_factory=factory, size=2, health_check=lambda driver: True)
+
+        driver = pool.checkout()
+        pool.checkin(driver)
+
+        assert pool.checkout() is driver
+        assert factory.call_count == 1
+
+    def test_checkout_is_bounded(self):
+        """Test checkout fails once every driver is checked out"""
+
+        pool = ShareWoodDriverPool(driver_factory=MagicMock, size=1, health_check=lambda driver: True)
+
+        pool.checkout()
+
+        with pytest.raises(ShareWoodPoolError):
+            pool.checkout(timeout=0.01)
+
+    def test_unhealthy_driver_is_replaced(self):
+        """Test a driver failing the health check is quit and replaced"""
+
+        unhealthy, healthy = MagicMock(), MagicMock()
+        factory = MagicMock(side_effect=[unhealthy, healthy])
+        pool = ShareWoodDriverPool(
+            driver_factory=factory, size=1, health_check=lambda driver: driver is healthy
+        )
+
+        pool.checkin(pool.checkout())
+
+        assert pool.checkout() is healthy
+        unhealthy.quit.assert_called_once()
+        assert len(pool) == 1
+
+    def test_driver_raising_webdriver_error_is_discarded(self):
+        """Test the driver context manager discards a broken driver"""
+
+        driver = MagicMock()
+        pool = ShareWoodDriverPool(driver_factory=lambda: driver, size=1, health_check=lambda driver: True)
+
+        with pytest.raises(WebDriverException):
+            with pool.driver():
+                raise WebDriverException("browser crashed")
+
+        driver.quit.assert_called_once()
+        assert len(pool) == 0
+
+    def test_close_quits_idle_drivers(self):
+        """Test close quits idle drivers and refuses new checkouts"""
+
+        driver = MagicMock()
+        pool = ShareWoodDriverPool(driver_factory=lambda: driver, size=1, health_check=lambda driver: True)
+        pool.checkin(pool.checkout())
+
+        pool.close()
+
+        driver.quit.assert_called_once()
+        with pytest.raises(ShareWoodPoolError):
+            pool.checkout()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from sharewoodautomator.exceptions import ShareWoodDriverError
+from sharewoodautomator.sharewooddriverresolver import ShareWoodDriverCache, ShareWoodDriverResolver
+from sharewoodautomator.sharewoodmetrics import ShareWoodMetrics
+
+
+def make_driver(directory, name="chromedriver"):
+    """Create an executable file standing for a chromedriver"""
+    path = str(directory / name)
+    with open(path, "w") as driver:
+        driver.write("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+class TestShareWoodDriverResolver:
+    """Tests for the ShareWoodDriverResolver class"""
+
+    def test_cache_skips_install_until_chrome_upgrade(self, tmp_path):
+        """Test the driver is installed once per Chrome version, then reused without network"""
+
+        driver = make_driver(tmp_path)
+        metrics = ShareWoodMetrics()
+        resolver = ShareWoodDriverResolver(cache=ShareWoodDriverCache(path=str(tmp_path / "drivers.sqlite")), metrics=metrics)
+
+        with patch("sharewoodautomator.sharewooddriverresolver.chrome_version", return_value="120.0.6099.109"), \
+                patch.object(ShareWoodDriverResolver, "_install", return_value=driver) as install:
+            assert resolver.resolve() == driver
+            assert resolver.resolve() == driver
+        assert install.call_count == 1
+        assert metrics.snapshot()["counters"]["driver.cache_hits"] == 1
+
+        with patch("sharewoodautomator.sharewooddriverresolver.chrome_version", return_value="121.0.6167.85"), \
+                patch.object(ShareWoodDriverResolver, "_install", return_value=driver) as install:
+            resolver.resolve()
+        assert install.call_count == 1
+
+    def test_override(self, tmp_path):
+        """Test the driver path override is used without detection, and checked"""
+
+        driver = make_driver(tmp_path)
+
+        with patch("sharewoodautomator.sharewooddriverresolver.chrome_version") as version:
+            assert ShareWoodDriverResolver(driver_path=driver).resolve() == driver
+        version.assert_not_called()
+
+        with pytest.raises(ShareWoodDriverError):
+            ShareWoodDriverResolver(driver_path=str(tmp_path / "missing")).resolve()
+
+    def test_offline(self, tmp_path, monkeypatch):
+        """Test offline resolution falls back on the PATH driver, never installing"""
+
+        driver = make_driver(tmp_path)
+        resolver = ShareWoodDriverResolver(cache=ShareWoodDriverCache(path=str(tmp_path / "drivers.sqlite")), offline=True)
+
+        with patch("sharewoodautomator.sharewooddriverresolver.chrome_version", return_value="120.0.6099.109"), \
+                patch.object(ShareWoodDriverResolver, "_install") as install:
+            monkeypatch.setenv("PATH", str(tmp_path))
+            assert resolver.resolve() == driver
+
+            monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+            # Resolved once, the driver no longer needs to be in PATH
+            assert resolver.resolve() == driver
+
+            os.remove(driver)
+            with pytest.raises(ShareWoodDriverError):
+                resolver.resolve()
+        install.assert_not_called()
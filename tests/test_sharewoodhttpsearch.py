@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+from standin import make_catalogue
+
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError
+from sharewoodautomator.sharewoodhttpsearch import ShareWoodHttpSearch
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+
+class TestShareWoodHttpSearch:
+    """Tests for the ShareWoodHttpSearch class against the local stand-in"""
+
+    def _searcher(self, server, logged_in=True):
+        """Build a searcher bound to the stand-in server"""
+        session = ShareWoodHttpSession(timeout=5)
+        if logged_in:
+            session.get(f"{server.url}/do-login")
+        return ShareWoodHttpSearch(
+            session=session,
+            search_url=f"{server.url}/torrents",
+            timeout=5,
+            login_url=f"{server.url}/login",
+        )
+
+    def test_search(self, standin_server):
+        """Test the search method parses the torrents listing"""
+
+        searcher = self._searcher(standin_server)
+
+        results = searcher.search(ShareWoodSearchCriteria(query="Ubuntu 22.04"))
+
+        assert len(results) == 3
+        assert results[0].title == "Ubuntu 22.04 LTS Desktop amd64"
+        assert results[0].url.endswith("/torrents/ubuntu-2204-lts-desktop-amd64.1001")
+        assert results[0].seeders == 152
+        assert results[2].size == 850 * 1024 ** 2
+
+    def test_search_sends_criteria_as_query_parameters(self, standin_server):
+        """Test the criteria are encoded in the listing query string"""
+
+        searcher = self._searcher(standin_server)
+
+        searcher.search(ShareWoodSearchCriteria(
+            query="Ubuntu",
+            languages={"Français": True, "Anglais": False},
+            sorting="seeders",
+            direction="desc",
+            quantity=50,
+        ))
+
+        path, params = standin_server.requests[-1]
+        assert path == "/torrents"
+        assert params == [
+            ("research", "Ubuntu"),
+            ("languages[]", "Français"),
+            ("sort", "seeders"),
+            ("direction", "desc"),
+            ("qty", "50"),
+        ]
+
+    def test_search_without_session(self, standin_server):
+        """Test a missing session is reported as an authentication error"""
+
+        searcher = self._searcher(standin_server, logged_in=False)
+
+        with pytest.raises(ShareWoodAuthenticationError):
+            searcher.search(ShareWoodSearchCriteria(query="Ubuntu"))
+
+    def _listing_requests(self, server):
+        """Page numbers of the listing requests received by the stand-in"""
+        return [dict(params).get("page", "1") for path, params in server.requests if path == "/torrents"]
+
+    def test_iter_search_walks_every_page(self, standin_server):
+        """Test iter_search yields every torrent of every page in order"""
+
+        standin_server.catalogue = make_catalogue(60)
+        searcher = self._searcher(standin_server)
+
+        results = list(searcher.iter_search(ShareWoodSearchCriteria(query="Torrent", quantity=25)))
+
+        assert [torrent.title for torrent in results] == [f"Torrent {i}" for i in range(60, 0, -1)]
+        assert self._listing_requests(standin_server) == ["1", "2", "3"]
+
+    def test_iter_search_max_results(self, standin_server):
+        """Test iter_search does not fetch pages beyond max_results"""
+
+        standin_server.catalogue = make_catalogue(200)
+        searcher = self._searcher(standin_server)
+
+        results = list(searcher.iter_search(ShareWoodSearchCriteria(query="Torrent", quantity=25), max_results=30))
+
+        assert len(results) == 30
+        assert self._listing_requests(standin_server) == ["1", "2"]
+
+        # No torrent wanted, no page fetched
+        assert list(searcher.iter_search(ShareWoodSearchCriteria(query="Torrent"), max_results=0)) == []
+        assert self._listing_requests(standin_server) == ["1", "2"]
+
+    def test_iter_search_stops_early(self, standin_server):
+        """Test stopping the iteration stops fetching pages"""
+
+        standin_server.catalogue = make_catalogue(200)
+        searcher = self._searcher(standin_server)
+
+        results = searcher.iter_search(ShareWoodSearchCriteria(query="Torrent", quantity=25))
+        next(results)
+        results.close()
+
+        # First page and at most the prefetched second one
+        assert self._listing_requests(standin_server) in (["1"], ["1", "2"])
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest  # noqa: F401
+
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+
+
+class TestShareWoodHttpSession:
+    """Tests for the ShareWoodHttpSession class against the local stand-in"""
+
+    def test_is_logged_in_with_restored_cookies(self, standin_server):
+        """Test restored session cookies pass the validity probe"""
+
+        session = ShareWoodHttpSession(timeout=5)
+        session.load_cookies([{"name": "sharewood_session", "value": "standin-session"}])
+
+        assert session.is_logged_in(f"{standin_server.url}/", f"{standin_server.url}/login")
+
+    def test_is_logged_in_without_cookies(self, standin_server):
+        """Test a session without cookies fails the validity probe"""
+
+        session = ShareWoodHttpSession(timeout=5)
+
+        assert not session.is_logged_in(f"{standin_server.url}/", f"{standin_server.url}/login")
+        assert standin_server.requests[-1][0] == "/"
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from sharewoodautomator.sharewoodindex import ShareWoodIndex
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+TORRENTS = [
+    ShareWoodTorrent(
+        url="https://www.sharewood.tv/torrents/a.1",
+        title="Ubuntu 22.04 LTS Desktop",
+        category="Applications",
+        seeders="152",
+        size="4 GiB",
+        age=3000.0,
+    ),
+    ShareWoodTorrent(
+        url="https://www.sharewood.tv/torrents/b.2",
+        title="Débian 12 Bookworm",
+        category="Applications",
+        seeders="12",
+        age=2000.0,
+        discounts="Freeleech",
+    ),
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/c.3", title="Film", category="Vidéos", age=1000.0),
+]
+
+
+def urls(torrents):
+    """URLs of torrents, in order"""
+    return [torrent.url for torrent in torrents]
+
+
+class TestShareWoodIndex:
+    """Tests for the ShareWoodIndex class"""
+
+    def test_upsert_keeps_known_values(self, tmp_path):
+        """Test scraped details complete a listed torrent, and missing values do not erase known ones"""
+
+        index = ShareWoodIndex(path=str(tmp_path / "index.sqlite"))
+        index.upsert(TORRENTS)
+        index.upsert([ShareWoodTorrent(url=TORRENTS[0].url, description="Système Linux", seeders="160")])
+
+        torrent = index.get(TORRENTS[0].url)
+
+        assert len(index) == 3
+        assert torrent.title == "Ubuntu 22.04 LTS Desktop"
+        assert torrent.description == "Système Linux"
+        assert torrent.seeders == 160
+        assert index.get(TORRENTS[1].url).discounts is True
+
+    def test_full_text_search(self, tmp_path):
+        """Test query, description and tags are matched without accents or case"""
+
+        index = ShareWoodIndex(path=str(tmp_path / "index.sqlite"))
+        index.upsert(TORRENTS)
+        index.upsert([ShareWoodTorrent(url=TORRENTS[0].url, description="Système Linux", tags="linux, iso")])
+
+        assert urls(index.search(ShareWoodSearchCriteria(query="debian"))) == [TORRENTS[1].url]
+        assert urls(index.search(ShareWoodSearchCriteria(description="SYSTEME"))) == [TORRENTS[0].url]
+        assert urls(index.search(ShareWoodSearchCriteria(tags="iso"))) == [TORRENTS[0].url]
+        assert index.search(ShareWoodSearchCriteria(query='ubuntu" OR')) == []
+
+    def test_criteria(self, tmp_path):
+        """Test categories, types, sorting and quantity as the listing applies them"""
+
+        index = ShareWoodIndex(path=str(tmp_path / "index.sqlite"))
+        index.upsert(TORRENTS)
+
+        assert urls(index.search(ShareWoodSearchCriteria())) == urls(TORRENTS)
+        assert urls(index.search(ShareWoodSearchCriteria(categories={"Vidéos": True}))) == [TORRENTS[2].url]
+        assert urls(index.search(ShareWoodSearchCriteria(types={"freeleech": True}))) == [TORRENTS[1].url]
+        assert urls(index.search(ShareWoodSearchCriteria(sorting="seeders", direction="asc", quantity=2))) == [
+            TORRENTS[1].url,
+            TORRENTS[0].url,
+        ]
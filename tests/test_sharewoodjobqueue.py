@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import time
+
+from sharewoodautomator.sharewoodjobqueue import ShareWoodJobQueue
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+
+def drain(path, worker):
+    """Lease and complete jobs until the queue is empty, in a separate process"""
+    queue = ShareWoodJobQueue(path)
+    while True:
+        jobs = queue.lease(worker, limit=3)
+        if not jobs:
+            break
+        for job in jobs:
+            assert queue.complete(job, {"worker": worker})
+    queue.close()
+
+
+class TestShareWoodJobQueue:
+    """Tests for the ShareWoodJobQueue class"""
+
+    def test_put_and_lease(self, tmp_path):
+        """Test queued jobs are leased once, oldest first, and the same job is not queued twice"""
+
+        queue = ShareWoodJobQueue(str(tmp_path / "jobs.sqlite"))
+
+        assert queue.put_searches([
+            ShareWoodSearchCriteria(query="Ubuntu", languages={"Français": True, "Anglais": True}),
+            ShareWoodSearchCriteria(query="Ubuntu", languages={"Anglais": True, "Français": True}),
+        ]) == 1
+        assert queue.put_scrapes([ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1"), ShareWoodTorrent()]) == 1
+
+        search, scrape = queue.lease("worker-1", limit=5)
+        assert search.search_criteria.cache_key() == ShareWoodSearchCriteria(query="Ubuntu", languages={"Français": True, "Anglais": True}).cache_key()
+        assert scrape.target == "https://www.sharewood.tv/torrents/a.1"
+        assert queue.lease("worker-2") == []
+
+        assert queue.complete(search, {"results": 3})
+        assert queue.stats() == {"pending": 0, "leased": 1, "done": 1, "failed": 0}
+
+        # Finished jobs can be queued again, pending ones are not duplicated
+        assert queue.put_scrapes([ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1")]) == 0
+        assert queue.put_searches([ShareWoodSearchCriteria(query="Ubuntu", languages={"Français": True, "Anglais": True})]) == 1
+        queue.close()
+
+    def test_retries(self, tmp_path):
+        """Test failed and expired jobs are retried until their last attempt"""
+
+        queue = ShareWoodJobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.05, max_attempts=2, retry_delay=0)
+        queue.put("scrape", ["https://www.sharewood.tv/torrents/a.1"])
+
+        # Failure, then lease expired by a dead worker
+        job, = queue.lease("worker-1")
+        assert queue.fail(job, "TimeoutException: page")
+        job, = queue.lease("worker-1")
+        assert job.attempts == 2
+        time.sleep(0.1)
+
+        # Expired lease of the last attempt, the job is failed for good
+        assert queue.lease("worker-2") == []
+        assert not queue.complete(job)
+        assert queue.stats()["failed"] == 1
+
+        assert queue.retry_failed() == 1
+        job, = queue.lease("worker-2")
+        assert queue.release(job)
+        job, = queue.lease("worker-2")
+        assert job.attempts == 1
+        queue.close()
+
+    def test_processes_share_queue(self, tmp_path):
+        """Test worker processes sharing the queue file run every job exactly once"""
+
+        path = str(tmp_path / "jobs.sqlite")
+        queue = ShareWoodJobQueue(path)
+        queue.put("scrape", [f"https://www.sharewood.tv/torrents/t.{i}" for i in range(200)])
+
+        processes = [multiprocessing.Process(target=drain, args=(path, f"worker-{i}")) for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+        assert queue.stats() == {"pending": 0, "leased": 0, "done": 200, "failed": 0}
+        assert queue._connection.execute("SELECT COUNT(*) FROM jobs WHERE attempts != 1").fetchone()[0] == 0
+        queue.close()
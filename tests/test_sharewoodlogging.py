@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest  # noqa: F401
 
@@ -11,75 +11,56 @@ from sharewoodautomator.sharewoodlogging import ShareWoodLogging
 class TestShareWoodLogging:
     """Tests for the ShareWoodLogging class"""
 
+    def _logging(self, driver):
+        """Build a logging manager bound to a mocked browser"""
+        return ShareWoodLogging(
+            browser=driver,
+            home_url="https://www.sharewood.tv",
+            login_url="https://www.sharewood.tv/login",
+            logout_url="https://www.sharewood.tv/logout",
+            timeout=30,
+        )
+
     def test_connect(self, mock_chrome_driver):
-        """Test the connect method"""        
+        """Test the connect method"""
 
-        # Create mocks for WebDriverWait and expected_conditions
+        # Login page, then home page once the form is submitted
+        mock_chrome_driver.current_url = "https://www.sharewood.tv/login"
         mock_element = MagicMock()
-        mock_element.send_keys = MagicMock()
-
-        with patch('sharewoodautomator.sharewoodlogging.WebDriverWait') as mock_wait:
-            with patch('sharewoodautomator.sharewoodlogging.EC'):
-                # Set up mock WebDriverWait to return our mock element
-                mock_wait.return_value.until.return_value = mock_element
-
-                # Set up mock elements for username, password, and login button
-                mock_chrome_driver.find_element = MagicMock()
-                mock_chrome_driver.find_element.side_effect = [
-                    mock_element,  # username input
-                    mock_element,  # password input
-                    mock_element,  # login button
-                ]
-
-                # Initialize logging
-                logging = ShareWoodLogging(
-                    browser=mock_chrome_driver, 
-                    home_url="https://www.sharewood.tv",
-                    login_url="https://www.sharewood.tv/login",
-                    logout_url="https://www.sharewood.tv/logout",
-                    timeout=30
-                )
-
-                # Execute
-                result = logging.connect("test_user", "test_password")
-
-                # Verify
-                assert mock_chrome_driver.get.called_with("https://www.sharewood.tv/login")
-                assert mock_chrome_driver.title == "ShareWood"
-                assert mock_chrome_driver.find_element.called
-                assert mock_element.send_keys.called
-                assert result is True
+        mock_element.is_displayed.return_value = True
+        mock_element.click.side_effect = lambda: setattr(mock_chrome_driver, "current_url", "https://www.sharewood.tv/")
+        mock_chrome_driver.find_elements = MagicMock(return_value=[mock_element])
+
+        # Execute
+        result = self._logging(mock_chrome_driver).connect("test_user", "test_password")
+
+        # Verify
+        mock_chrome_driver.get.assert_called_with("https://www.sharewood.tv/login")
+        mock_chrome_driver.find_elements.assert_any_call("name", "username")
+        mock_element.send_keys.assert_any_call("test_user")
+        mock_element.send_keys.assert_any_call("test_password")
+        assert mock_element.click.called
+        assert result is True
+
+    def test_connect_fails_fast_on_error_page(self, mock_chrome_driver):
+        """Test a login stops at once on an error page, instead of waiting for the form"""
+
+        mock_chrome_driver.current_url = "https://www.sharewood.tv/login"
+        mock_chrome_driver.title = "502 Bad Gateway"
+        mock_chrome_driver.find_elements = MagicMock(return_value=[])
+
+        assert self._logging(mock_chrome_driver).connect("test_user", "test_password") is False
+        assert mock_chrome_driver.find_elements.call_count == 1
 
     def test_disconnect(self, mock_chrome_driver):
         """Test the disconnect method"""
-        # Setup
-        login_url = "https://www.sharewood.tv/login"
-        logout_url = "https://www.sharewood.tv/logout"
-
-        with patch('sharewoodautomator.sharewoodlogging.WebDriverWait') as mock_wait:
-            with patch('sharewoodautomator.sharewoodlogging.EC') as mock_ec:
-                # Initialize logging
-                logging = ShareWoodLogging(
-                    browser=mock_chrome_driver, 
-                    home_url="https://www.sharewood.tv",
-                    login_url=login_url,
-                    logout_url=logout_url,
-                    timeout=30
-                )
-
-                # Execute
-                result = logging.disconnect()
-
-                # Verify
-                assert mock_chrome_driver.get.called_with(logout_url)
-
-                # Check that WebDriverWait was called
-                mock_wait.assert_called_with(mock_chrome_driver, 30)
-
-                # Check that until was called with url_contains
-                mock_wait.return_value.until.assert_called_with(
-                    mock_ec.url_contains.return_value
-                )
-
-                # Check result
-                assert result is True
+
+        # Logout redirects to the login page
+        mock_chrome_driver.get.side_effect = lambda url: setattr(mock_chrome_driver, "current_url", "https://www.sharewood.tv/login")
+
+        # Execute
+        result = self._logging(mock_chrome_driver).disconnect()
+
+        # Verify
+        mock_chrome_driver.get.assert_called_with("https://www.sharewood.tv/logout")
+        assert result is True
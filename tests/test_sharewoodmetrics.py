@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+from sharewoodautomator.sharewoodhttpsearch import ShareWoodHttpSearch
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+from sharewoodautomator.sharewoodmetrics import (
+    NULL_METRICS,
+    ShareWoodJsonSink,
+    ShareWoodMetrics,
+    ShareWoodPrometheusSink,
+)
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+
+class TestShareWoodMetrics:
+    """Tests for the ShareWoodMetrics class and its sinks"""
+
+    def test_search_phases(self, standin_server):
+        """Test an instrumented search times its phases and counts its results"""
+
+        session = ShareWoodHttpSession(timeout=5)
+        session.get(f"{standin_server.url}/do-login")
+        snapshots = []
+        metrics = ShareWoodMetrics(sinks=[snapshots.append])
+        searcher = ShareWoodHttpSearch(session=session, search_url=f"{standin_server.url}/torrents", timeout=5, metrics=metrics)
+
+        searcher.search(ShareWoodSearchCriteria(query="Ubuntu"))
+        searcher.search(ShareWoodSearchCriteria(query="Ubuntu"))
+        metrics.flush()
+
+        timers = snapshots[0]["timers"]
+        assert set(timers) == {"search.request", "search.parse"}
+        assert timers["search.parse"]["count"] == 2
+        assert 0 < timers["search.parse"]["min"] <= timers["search.parse"]["max"] <= timers["search.parse"]["total"]
+        assert snapshots[0]["counters"] == {"search.results": 6}
+
+    def test_sinks(self, tmp_path):
+        """Test the JSON and Prometheus text file sinks"""
+
+        json_path = tmp_path / "metrics.json"
+        prometheus_path = tmp_path / "sharewood.prom"
+        metrics = ShareWoodMetrics(sinks=[ShareWoodJsonSink(str(json_path)), ShareWoodPrometheusSink(str(prometheus_path))])
+        metrics.observe("scrape.parse", 0.25)
+        metrics.observe("scrape.parse", 0.5)
+        metrics.increment("download.bytes", 2048)
+
+        metrics.flush()
+
+        assert json.loads(json_path.read_text())["timers"]["scrape.parse"] == {
+            "count": 2, "total": 0.75, "min": 0.25, "max": 0.5,
+        }
+        lines = prometheus_path.read_text().splitlines()
+        assert 'sharewood_phase_seconds_count{phase="scrape.parse"} 2' in lines
+        assert 'sharewood_phase_seconds_sum{phase="scrape.parse"} 0.750000' in lines
+        assert 'sharewood_events_total{event="download.bytes"} 2048' in lines
+
+    def test_null_metrics(self):
+        """Test disabled metrics collect nothing"""
+
+        with NULL_METRICS.timer("search.parse"):
+            NULL_METRICS.increment("search.results")
+
+        assert NULL_METRICS.snapshot() == {"timers": {}, "counters": {}}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+from bs4 import BeautifulSoup
+from standin import read_fixture
+
+from sharewoodautomator.sharewoodparser import (
+    PARSERS,
+    ShareWoodHtmlParser,
+    ShareWoodLxmlParser,
+    ShareWoodSoupParser,
+    get_parser,
+)
+
+
+def _reordered_torrent_page() -> str:
+    """Recorded torrent page with the hash row moved first and the 3D row removed"""
+    soup = BeautifulSoup(read_fixture("torrent_detail.html"), "html.parser")
+    rows = soup.find_all("tr")
+    rows[11].decompose()
+    soup.tbody.insert(0, rows[12].extract())
+    return str(soup)
+
+
+def _search_result_fragment() -> str:
+    """Inner HTML of div#result, as returned by the browser backend"""
+    soup = BeautifulSoup(read_fixture("search_results.html"), "html.parser")
+    return soup.find(id="result").decode_contents()
+
+
+class TestShareWoodParser:
+    """Tests for the ShareWood.tv HTML parser backends"""
+
+    def test_get_parser_prefers_lxml(self):
+        """Test the fastest installed backend is selected by default"""
+
+        assert isinstance(get_parser(), ShareWoodLxmlParser)
+        assert isinstance(get_parser("html.parser"), ShareWoodSoupParser)
+
+        with pytest.raises(ValueError):
+            get_parser("unknown")
+
+        # Only backends implementing both pages can be created
+        with pytest.raises(TypeError):
+            ShareWoodHtmlParser()
+
+        # Cells are read by every backend through the same method
+        class PagesOnlyParser(ShareWoodHtmlParser):
+            parse_search_result = ShareWoodSoupParser.parse_search_result
+            parse_torrent_page = ShareWoodSoupParser.parse_torrent_page
+
+        with pytest.raises(TypeError):
+            PagesOnlyParser()
+
+    @pytest.mark.parametrize("html", [
+        read_fixture("search_results.html"),
+        _search_result_fragment(),
+        "",
+    ])
+    def test_parse_search_result_is_identical(self, html):
+        """Test every backend parses search results into the same values"""
+
+        results = [parser().parse_search_result(html) for parser in PARSERS.values()]
+
+        assert all(result == results[0] for result in results)
+
+    def test_parse_search_result(self):
+        """Test the search result values"""
+
+        rows = get_parser().parse_search_result(read_fixture("search_results.html"))
+
+        assert len(rows) == 3
+        assert rows[1] == {
+            "url": "https://www.sharewood.tv/torrents/ubuntu-2204-lts-server-amd64.1002",
+            "title": "Ubuntu 22.04 LTS Server amd64",
+            "age": "1 semaine",
+            "size": "1.4 GiB",
+            "comments": "0",
+            "seeders": "48",
+            "leechers": "2",
+            "downloads": "611",
+        }
+
+    @pytest.mark.parametrize("html", [
+        read_fixture("torrent_detail.html"),
+        _reordered_torrent_page(),
+        "<html><body><div id='app'></div></body></html>",
+        "",
+    ])
+    def test_parse_torrent_page_is_identical(self, html):
+        """Test every backend parses torrent pages into the same values"""
+
+        values = [parser().parse_torrent_page(html) for parser in PARSERS.values()]
+
+        assert all(value == values[0] for value in values)
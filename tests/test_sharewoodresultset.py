@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from sharewoodautomator.sharewoodresultset import ShareWoodResultSet
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+TORRENTS = [
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", category="Films", seeders="12", size="700 MiB"),
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/b.2", category="Séries", seeders="152", size="1.4 GiB"),
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/c.3", category="Films", size="4 GiB"),
+    ShareWoodTorrent(url="https://www.sharewood.tv/torrents/d.4", category="Films", seeders="12", size="350 MiB"),
+]
+
+
+class TestShareWoodResultSet:
+    """Tests for the ShareWoodResultSet class"""
+
+    def test_round_trip(self):
+        """Test torrents are converted to columns and back, missing values included"""
+
+        results = ShareWoodResultSet.from_torrents(TORRENTS)
+
+        assert len(results) == 4
+        assert results.column("seeders") == [12, 152, None, 12]
+        assert results.to_torrents() == TORRENTS
+
+    def test_filter(self):
+        """Test filters on ranges, values and predicates, missing values never matching"""
+
+        results = ShareWoodResultSet.from_torrents(TORRENTS)
+
+        assert results.filter(seeders=(10, None)).column("url") == [TORRENTS[0].url, TORRENTS[1].url, TORRENTS[3].url]
+        assert results.filter(category="Films", size=(None, 1024 ** 3)).column("url") == [TORRENTS[0].url, TORRENTS[3].url]
+        assert len(results.filter(url=lambda url: url.endswith(".3"))) == 1
+        # Missing floats are stored as NaN
+        assert len(results.filter(ratio=(None, None))) == 0
+        assert results.filter(category="Films", seeders=12).column("ratio") == [None, None]
+
+    def test_sort(self):
+        """Test multi-key sorts, missing values last"""
+
+        results = ShareWoodResultSet.from_torrents(TORRENTS)
+
+        assert results.sort("-seeders", "size").column("url") == [TORRENTS[1].url, TORRENTS[3].url, TORRENTS[0].url, TORRENTS[2].url]
+        assert results.sort("seeders").column("seeders") == [12, 12, 152, None]
+
+    def test_top_and_group_by(self):
+        """Test top-k selection and grouping by category"""
+
+        results = ShareWoodResultSet.from_torrents(TORRENTS)
+        groups = results.group_by("category")
+
+        assert results.top(2, "-size").column("url") == [TORRENTS[2].url, TORRENTS[1].url]
+        assert list(groups) == ["Films", "Séries"]
+        assert len(groups["Films"]) == 3
+        assert len(results + groups["Films"]) == 7
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock
+
+from sharewoodautomator.sharewoodsearch import ShareWoodSearch
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+
+class TestShareWoodSearch:
+    """Tests for the ShareWoodSearch class"""
+
+    def test_search_single_navigation(self, mock_chrome_driver):
+        """Test a search loads the listing URL of its criteria, without filling the form"""
+
+        mock_result = MagicMock()
+        mock_result.get_attribute.return_value = ""
+        mock_chrome_driver.find_elements = MagicMock(return_value=[mock_result])
+        criteria = ShareWoodSearchCriteria(query="Ubuntu", languages={"Français": True}, quantity=50)
+
+        searcher = ShareWoodSearch(browser=mock_chrome_driver, search_url="https://www.sharewood.tv/torrents", timeout=30)
+
+        assert searcher.search(criteria) == []
+        mock_chrome_driver.get.assert_called_once_with(criteria.to_url("https://www.sharewood.tv/torrents"))
+        mock_chrome_driver.find_elements.assert_called_once_with("id", "result")
+        assert not mock_result.click.called
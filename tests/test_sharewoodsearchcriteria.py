@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from urllib.parse import parse_qsl, urlsplit
+
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+
+
+class TestShareWoodSearchCriteria:
+    """Tests for the ShareWoodSearchCriteria class"""
+
+    def test_round_trip(self):
+        """Test criteria encoded as a listing URL decode back to the same criteria"""
+
+        criteria = ShareWoodSearchCriteria(
+            query="Ubuntu 22.04",
+            description="desktop",
+            uploader="linuxfan",
+            tags="linux,iso",
+            categories={"Applications": True, "Vidéos": False},
+            subcategories={"Application Linux": True},
+            languages={"Français": True, "Anglais": True},
+            types={"freeleech": True, "internal": True},
+            sorting="seeders",
+            direction="desc",
+            quantity=100,
+        )
+
+        url = criteria.to_url("https://www.sharewood.tv/torrents", page=3)
+        params = parse_qsl(urlsplit(url).query)
+
+        assert ("types[]", "freeleech") in params
+        assert ("sort", "seeders") in params
+        assert ("qty", "100") in params
+        assert ("page", "3") in params
+        assert ShareWoodSearchCriteria.from_query_params(urlsplit(url).query).to_query_params() == criteria.to_query_params()
+        assert ShareWoodSearchCriteria.from_query_params(params).cache_key() == criteria.cache_key()
+
+    def test_default_criteria(self):
+        """Test empty criteria give the plain listing URL, and decode to the defaults"""
+
+        assert ShareWoodSearchCriteria().to_url("https://www.sharewood.tv/torrents") == "https://www.sharewood.tv/torrents"
+        assert ShareWoodSearchCriteria.from_query_params("page=2") == ShareWoodSearchCriteria()
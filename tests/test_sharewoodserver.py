@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import socket
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from sharewoodautomator.__main__ import main, parse_arguments, run_command
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError
+from sharewoodautomator.sharewoodmetrics import ShareWoodMetrics
+from sharewoodautomator.sharewoodserver import ShareWoodClient, ShareWoodServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Fixture to provide a running server echoing the command lines it is sent"""
+
+    def handler(argv):
+        if argv == ["fail"]:
+            print("Error: failed", file=sys.stderr)
+            return 1
+        if argv == ["crash"]:
+            raise RuntimeError("crashed")
+        print(" ".join(argv))
+        return 0
+
+    server = ShareWoodServer(str(tmp_path / "automator.sock"), handler=handler, metrics=ShareWoodMetrics())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestShareWoodServer:
+    """Tests for the ShareWoodServer and ShareWoodClient classes"""
+
+    def test_run(self, server):
+        """Test commands run on the server, answering their output and exit code"""
+
+        client = ShareWoodClient(server.path)
+
+        assert client.is_serving()
+        assert client.run(["search", "Ubuntu"]) == {"code": 0, "stdout": "search Ubuntu\n", "stderr": ""}
+        assert client.run(["fail"]) == {"code": 1, "stdout": "", "stderr": "Error: failed\n"}
+        assert server.metrics.snapshot()["timers"]["server.command"]["count"] == 2
+
+    def test_run_error(self, server):
+        """Test a command raising an unexpected error answers its error, and the server keeps serving"""
+
+        client = ShareWoodClient(server.path)
+
+        assert client.run(["crash"]) == {"code": 1, "stdout": "", "stderr": "Error: RuntimeError: crashed\n"}
+        assert client.run(["search", "Ubuntu"])["code"] == 0
+
+    def test_no_server(self, tmp_path):
+        """Test a missing or stale socket means no server, and a new server replaces the stale socket"""
+
+        path = str(tmp_path / "automator.sock")
+        assert ShareWoodClient(path).run(["search", "Ubuntu"]) is None
+
+        # Socket file left behind by a killed server
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        assert ShareWoodClient(path).run(["search", "Ubuntu"]) is None
+
+        server = ShareWoodServer(path, handler=lambda argv: 0)
+        assert ShareWoodClient(path).is_serving()
+        with pytest.raises(OSError):
+            ShareWoodServer(path, handler=lambda argv: 0)
+        server.server_close()
+
+    def test_main_forwards_to_server(self, server, capsys):
+        """Test the command line is forwarded to a listening server instead of starting an automator"""
+
+        assert main(["--socket", server.path, "search", "Ubuntu", "--quantity", "50"]) == 0
+        assert capsys.readouterr().out == f"--socket {server.path} search Ubuntu --quantity 50\n"
+
+    def test_main_forwards_download_path(self, server, capsys, tmp_path, monkeypatch):
+        """Test a download is saved to the directory of the client, not of the server"""
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("DOWNLOAD_PATH", "torrents")
+        url = "https://www.sharewood.tv/torrents/ubuntu.1"
+
+        assert main(["--socket", server.path, "download", url, "-o", "out"]) == 0
+        assert capsys.readouterr().out.endswith(f"download {url} -o out --output {tmp_path / 'out'}\n")
+
+        assert main(["--socket", server.path, "download", url]) == 0
+        assert capsys.readouterr().out.endswith(f"download {url} --output {tmp_path / 'torrents'}\n")
+
+    def test_relogin(self, capsys):
+        """Test a server command failing on an expired session logs in again and runs once more"""
+
+        automator = MagicMock(search_backend="http")
+        automator.search.side_effect = [ShareWoodAuthenticationError("expired"), []]
+        args = parse_arguments(["search", "Ubuntu"])
+
+        assert run_command(args, automator, relogin=True) == 0
+        automator.reconnect.assert_called_once()
+        assert automator.search.call_count == 2
+
+        # Outside the server, the error is reported
+        automator.search.side_effect = ShareWoodAuthenticationError("expired")
+        assert run_command(args, automator) == 1
+        assert "Error: expired" in capsys.readouterr().err
+        automator.reconnect.assert_called_once()
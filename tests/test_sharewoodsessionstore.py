@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest  # noqa: F401
+
+from sharewoodautomator.sharewoodsessionstore import ShareWoodSessionStore
+
+COOKIES = [
+    {"name": "sharewood_session", "value": "s3cr3t-cookie", "domain": ".sharewood.tv", "path": "/"},
+    {"name": "XSRF-TOKEN", "value": "xsrf", "domain": ".sharewood.tv", "path": "/"},
+]
+
+
+class TestShareWoodSessionStore:
+    """Tests for the ShareWoodSessionStore class"""
+
+    def test_save_and_load(self, tmp_path):
+        """Test saved cookies are loaded back"""
+
+        store = ShareWoodSessionStore(path=str(tmp_path / "session"), secret="password")
+
+        store.save(COOKIES)
+
+        assert store.load() == COOKIES
+
+    def test_saved_cookies_are_encrypted(self, tmp_path):
+        """Test cookies are not readable from the session file"""
+
+        path = tmp_path / "session"
+        ShareWoodSessionStore(path=str(path), secret="password").save(COOKIES)
+
+        assert b"s3cr3t-cookie" not in path.read_bytes()
+
+    def test_load_with_other_secret(self, tmp_path):
+        """Test a session saved with another secret is ignored"""
+
+        path = str(tmp_path / "session")
+        ShareWoodSessionStore(path=path, secret="password").save(COOKIES)
+
+        assert ShareWoodSessionStore(path=path, secret="other").load() is None
+
+    def test_load_missing_and_clear(self, tmp_path):
+        """Test a missing or cleared session loads as None"""
+
+        store = ShareWoodSessionStore(path=str(tmp_path / "session"), secret="password")
+        assert store.load() is None
+
+        store.save(COOKIES)
+        store.clear()
+
+        assert store.load() is None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pickle
+
+from sharewoodautomator.sharewoodnormalize import (
+    format_size,
+    parse_age,
+    parse_discounts,
+    parse_flag,
+    parse_float,
+    parse_int,
+    parse_size,
+)
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+
+
+class TestShareWoodNormalize:
+    """Tests for the normalization of scraped texts"""
+
+    def test_parse_int(self):
+        """Test counters are parsed whatever their thousands separator"""
+
+        assert parse_int(" 152 ") == 152
+        assert parse_int("1 893") == 1893
+        assert parse_int("1,893") == 1893
+        assert parse_int("N/A") is None
+        assert parse_int(7) == 7
+
+    def test_parse_size(self):
+        """Test sizes are parsed into bytes, French and English units"""
+
+        assert parse_size("850 MiB") == 850 * 1024 ** 2
+        assert parse_size("1.4 GiB") == parse_size("1,4 Go") == 1503238554
+        assert parse_size("12 Ko") == 12 * 1024
+        assert parse_size("1,4 Gio") == parse_size("1.4 GiB")
+        assert parse_size("850 Mio") == 850 * 1024 ** 2
+        assert parse_size("unknown") is None
+        assert parse_size(1024) == 1024
+
+    def test_parse_age(self):
+        """Test ages are parsed into upload timestamps relative to now"""
+
+        assert parse_age("3 jours", now=1000000.0) == 1000000.0 - 3 * 86400
+        assert parse_age("1 jour 2 heures", now=1000000.0) == 1000000.0 - 86400 - 2 * 3600
+        assert parse_age("5 minutes ago", now=1000.0) == 700.0
+        assert parse_age("récemment", now=1000.0) is None
+        assert parse_age(700.0, now=1000.0) == 700.0
+
+    def test_parse_flags(self):
+        """Test yes/no flags, discounts and ratios"""
+
+        assert parse_flag("Oui") is True
+        assert parse_flag(" non ") is False
+        assert parse_flag("peut-être") is None
+        assert parse_discounts("Freeleech") is True
+        assert parse_discounts("Aucune") is False
+        assert parse_float("1,25") == 1.25
+
+    def test_format_size(self):
+        """Test sizes are formatted back for display"""
+
+        assert format_size(1503238554) == "1.4 GiB"
+        assert format_size(512) == "512 B"
+        assert format_size(None) == "N/A"
+
+
+class TestShareWoodTorrent:
+    """Tests for the ShareWoodTorrent class"""
+
+    def test_normalizes_scraped_texts(self):
+        """Test texts given to the constructor or update() are normalized"""
+
+        torrent = ShareWoodTorrent(url=" https://www.sharewood.tv/torrents/a.1 ", size="1.4 GiB", seeders="152")
+        torrent.update({"leechers": " 7 ", "three_d_flag": "Non", "discounts": "Freeleech"})
+
+        assert torrent.url == "https://www.sharewood.tv/torrents/a.1"
+        assert torrent.size == 1503238554
+        assert torrent.seeders == 152
+        assert torrent.leechers == 7
+        assert torrent.three_d_flag is False
+        assert torrent.discounts is True
+        assert torrent.downloaded is False
+
+    def test_round_trip(self):
+        """Test normalized values survive to_dict/from_dict and pickling"""
+
+        torrent = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1", age="2 heures", completed="1 893")
+        torrent.downloaded = True
+
+        assert ShareWoodTorrent.from_dict(torrent.to_dict()) == torrent
+        assert ShareWoodTorrent.from_dict(torrent.to_dict()).downloaded is True
+        assert pickle.loads(pickle.dumps(torrent)) == torrent
+
+    def test_slots(self):
+        """Test torrents are stored in slots, without an instance dictionary"""
+
+        torrent = ShareWoodTorrent(url="https://www.sharewood.tv/torrents/a.1")
+
+        assert not hasattr(torrent, "__dict__")
+        assert "seeders" in ShareWoodTorrent.__slots__
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+from bs4 import BeautifulSoup
+from standin import read_fixture
+
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError
+from sharewoodautomator.sharewoodcache import ShareWoodDetailCache
+from sharewoodautomator.sharewoodhttpsession import ShareWoodHttpSession
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+from sharewoodautomator.sharewoodtorrentscraper import ShareWoodTorrentScraper
+
+
+class TestShareWoodTorrentScraper:
+    """Tests for the ShareWoodTorrentScraper class against the local stand-in"""
+
+    def _scraper(self, server):
+        """Build a scraper fetching pages from the stand-in server"""
+        session = ShareWoodHttpSession(timeout=5)
+        session.get(f"{server.url}/do-login")
+        return ShareWoodTorrentScraper(browser=None, session=session)
+
+    def test_scrape(self, standin_server):
+        """Test the scrape method fills the torrent from its page"""
+
+        torrent = ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu-2204-lts-desktop-amd64.1001")
+
+        self._scraper(standin_server).scrape(torrent)
+
+        assert torrent.hash == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0"
+        assert torrent.category == "Applications"
+        assert torrent.uploader_profile == "https://www.sharewood.tv/users/linuxfan.42"
+        assert torrent.leechers == 7
+
+    @pytest.mark.parametrize("parse_workers", [0, 2])
+    def test_scrape_many(self, standin_server, parse_workers):
+        """Test scrape_many scrapes every torrent and reports errors per torrent"""
+
+        torrents = [
+            ShareWoodTorrent(url=f"{standin_server.url}/torrents/torrent-{i}.{i}") for i in range(6)
+        ]
+        missing = ShareWoodTorrent(url=f"{standin_server.url}/nowhere/missing.404")
+
+        results = list(self._scraper(standin_server).scrape_many(
+            torrents + [missing], concurrency=3, parse_workers=parse_workers
+        ))
+
+        assert len(results) == 7
+        failed = [result for result in results if not result.ok]
+        assert [result.torrent for result in failed] == [missing]
+        assert all(torrent.hash == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0" for torrent in torrents)
+
+    def test_parse_processes_reused(self, standin_server):
+        """Test parsing processes are started once per scraper, and not at all for small batches"""
+
+        scraper = self._scraper(standin_server)
+        urls = [f"{standin_server.url}/torrents/torrent-{i}.{i}" for i in range(scraper.PROCESS_PARSE_MIN_PAGES)]
+
+        assert all(result.ok for result in scraper.scrape_many([ShareWoodTorrent(url=urls[0])]))
+        assert scraper._parse_executor is None
+
+        assert all(result.ok for result in scraper.scrape_many([ShareWoodTorrent(url=url) for url in urls]))
+        executor = scraper._parse_executor
+        assert executor is not None
+
+        assert all(result.ok for result in scraper.scrape_many([ShareWoodTorrent(url=url) for url in urls]))
+        assert scraper._parse_executor is executor
+
+        scraper.close()
+        assert scraper._parse_executor is None
+
+    def test_scrape_many_stops_early(self, standin_server):
+        """Test pages left are not fetched when the caller stops iterating"""
+
+        torrents = [
+            ShareWoodTorrent(url=f"{standin_server.url}/torrents/torrent-{i}.{i}") for i in range(50)
+        ]
+
+        results = self._scraper(standin_server).scrape_many(torrents, concurrency=1, parse_workers=0)
+        next(results)
+        results.close()
+
+        assert len(standin_server.requests) < 50
+
+    def test_expired_session(self, standin_server):
+        """Test a page redirected to the login page fails with an authentication error, per torrent"""
+
+        scraper = ShareWoodTorrentScraper(
+            browser=None, session=ShareWoodHttpSession(timeout=5), login_url=f"{standin_server.url}/login"
+        )
+        torrent = ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu.1")
+
+        with pytest.raises(ShareWoodAuthenticationError):
+            scraper.scrape(torrent)
+
+        [result] = scraper.scrape_many([torrent], parse_workers=0)
+        assert isinstance(result.error, ShareWoodAuthenticationError)
+        assert torrent.hash is None
+
+    def test_detail_cache(self, standin_server, tmp_path):
+        """Test known torrents are not fetched again until refreshed"""
+
+        cache = ShareWoodDetailCache(path=str(tmp_path / "details.sqlite"), max_age=60)
+        scraper = self._scraper(standin_server)
+        scraper.detail_cache = cache
+        url = f"{standin_server.url}/torrents/ubuntu.1"
+
+        scraper.scrape(ShareWoodTorrent(url=url))
+        torrent = ShareWoodTorrent(url=url)
+        results = list(scraper.scrape_many([torrent], parse_workers=0))
+        assert results[0].ok
+        assert torrent.hash == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0"
+        assert len([path for path, _ in standin_server.requests if path.startswith("/torrents/")]) == 1
+
+        scraper.scrape(ShareWoodTorrent(url=url), refresh=True)
+        assert len([path for path, _ in standin_server.requests if path.startswith("/torrents/")]) == 2
+
+    def test_parse_matches_rows_by_label(self):
+        """Test information table rows are found by label whatever their order"""
+
+        # Move the hash row to the top of the table
+        soup = BeautifulSoup(read_fixture("torrent_detail.html"), "html.parser")
+        hash_row = soup.find_all("tr")[12].extract()
+        soup.tbody.insert(0, hash_row)
+
+        values = ShareWoodTorrentScraper(browser=None).parse(str(soup))
+
+        assert values["hash"] == "3b245504cf5f11bbdbe1201cea6a6bf45aee1bc0"
+        assert values["discounts"] == "Freeleech"
+        assert values["seeders"].strip() == "152"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from sharewoodautomator.exceptions import ShareWoodPageError
+from sharewoodautomator.sharewoodmetrics import ShareWoodMetrics
+from sharewoodautomator.sharewoodwait import MIN_POLL_INTERVAL, ShareWoodWait
+
+
+class TestShareWoodWait:
+    """Tests for the ShareWoodWait class"""
+
+    def test_until_polls_fast(self, mock_chrome_driver):
+        """Test a condition met after a few checks returns well before the timeout"""
+
+        checks = iter([None, NoSuchElementException(), "element"])
+
+        def condition(browser):
+            value = next(checks)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        metrics = ShareWoodMetrics()
+        wait = ShareWoodWait(mock_chrome_driver, timeout=30, metrics=metrics)
+
+        start = time.monotonic()
+        assert wait.until(condition, "search.results") == "element"
+        assert time.monotonic() - start < 1
+        assert metrics.snapshot()["timers"]["wait.search.results"]["count"] == 1
+        assert wait.stats()["search.results"]["count"] == 1
+
+    def test_error_page_exits_early(self, mock_chrome_driver):
+        """Test a known error page stops the wait at once"""
+
+        mock_chrome_driver.title = "429 Too Many Requests"
+        mock_chrome_driver.find_elements = MagicMock(return_value=[])
+
+        with pytest.raises(ShareWoodPageError):
+            ShareWoodWait(mock_chrome_driver, timeout=30).present(("id", "result"), "search.results")
+        assert mock_chrome_driver.find_elements.call_count == 1
+
+    def test_budget_shared_between_steps(self, mock_chrome_driver):
+        """Test the steps of an operation share its budget instead of each waiting for the timeout"""
+
+        mock_chrome_driver.find_elements = MagicMock(return_value=[])
+        wait = ShareWoodWait(mock_chrome_driver, timeout=30, budgets={"login.form": 0.2})
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutException), wait.budget("login.form"):
+            wait.present(("name", "username"), "login.username")
+            wait.present(("name", "password"), "login.password")
+        assert time.monotonic() - start < 1
+
+    def test_poll_interval_adapts_to_latency(self, mock_chrome_driver):
+        """Test slow operations are polled less often than fast ones"""
+
+        wait = ShareWoodWait(mock_chrome_driver, timeout=30)
+        for _ in range(5):
+            wait._record("login.redirect", 2.0)
+            wait._record("search.form", 0.1)
+
+        assert wait.poll_interval("login.redirect") == pytest.approx(0.2)
+        assert wait.poll_interval("search.form") == MIN_POLL_INTERVAL
+        assert wait.poll_interval("unknown") == MIN_POLL_INTERVAL
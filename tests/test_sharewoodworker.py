@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from unittest.mock import MagicMock, patch
+
+from standin import API_PASSKEY, SESSION_COOKIE, SESSION_VALUE
+
+from sharewoodautomator.exceptions import ShareWoodAuthenticationError
+from sharewoodautomator.sharewoodautomator import ShareWoodAutomator
+from sharewoodautomator.sharewoodjobqueue import ShareWoodJobQueue
+from sharewoodautomator.sharewoodmetrics import ShareWoodMetrics
+from sharewoodautomator.sharewoodsearchcriteria import ShareWoodSearchCriteria
+from sharewoodautomator.sharewoodsessionstore import ShareWoodSessionStore
+from sharewoodautomator.sharewoodtorrent import ShareWoodTorrent
+from sharewoodautomator.sharewoodworker import ShareWoodWorker
+
+
+class TestShareWoodWorker:
+    """Tests for the ShareWoodWorker class against the local stand-in"""
+
+    def _env(self, server, monkeypatch, tmp_path, **overrides):
+        """Environment of an automator bound to the stand-in server"""
+
+        for name, value in dict({
+            "SHAREWOOD_URL": server.url,
+            "SHAREWOOD_LOGIN_URL": f"{server.url}/login",
+            "SHAREWOOD_LOGOUT_URL": f"{server.url}/logout",
+            "SHAREWOOD_TORRENTS_URL": f"{server.url}/torrents",
+            "SHAREWOOD_API_URL": f"{server.url}/api/",
+            "SHAREWOOD_PASSKEY": API_PASSKEY,
+            "PSEUDO": "user",
+            "PASSWORD": "password",
+            "SESSION_FILE": "",
+            "SESSION_KEY": "",
+            "SEARCH_CACHE_FILE": "",
+            "DETAIL_CACHE_FILE": "",
+            "INDEX_FILE": str(tmp_path / "index.sqlite"),
+            "CHROMEDRIVER_CACHE_FILE": "",
+        }, **overrides).items():
+            monkeypatch.setenv(name, value)
+
+    def test_run(self, standin_server, monkeypatch, tmp_path):
+        """Test a worker runs queued searches and scrapes, writing torrents to the shared index"""
+
+        self._env(standin_server, monkeypatch, tmp_path)
+
+        queue = ShareWoodJobQueue(str(tmp_path / "jobs.sqlite"), retry_delay=60)
+        queue.put_searches([ShareWoodSearchCriteria(query="Ubuntu")])
+        queue.put_scrapes([
+            ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu-22-04.1"),
+            ShareWoodTorrent(url=f"{standin_server.url}/missing/2"),
+        ])
+
+        automator = ShareWoodAutomator()
+        automator.session.get(f"{standin_server.url}/do-login")
+        worker = ShareWoodWorker(queue, automator, name="worker-1", batch_size=2)
+
+        assert worker.run(idle_exit=0) == 3
+        assert queue.stats() == {"pending": 1, "leased": 0, "done": 2, "failed": 0}
+        assert automator.index.get(f"{standin_server.url}/torrents/ubuntu-22-04.1").hash
+        assert len(automator.index) == 4
+        queue.close()
+
+    def test_api_scrape_logs_in(self, standin_server, monkeypatch, tmp_path):
+        """Test scrape jobs of an api backend worker log in, the passkey API serving no torrent page"""
+
+        self._env(standin_server, monkeypatch, tmp_path, SESSION_FILE=str(tmp_path / "session.bin"))
+        ShareWoodSessionStore(str(tmp_path / "session.bin"), secret="password").save(
+            [{"name": SESSION_COOKIE, "value": SESSION_VALUE}]
+        )
+
+        queue = ShareWoodJobQueue(str(tmp_path / "jobs.sqlite"), retry_delay=60)
+        queue.put_scrapes([ShareWoodTorrent(url=f"{standin_server.url}/torrents/ubuntu-22-04.1")])
+
+        with patch.object(ShareWoodAutomator, "_init_driver", side_effect=AssertionError("Chrome started")):
+            automator = ShareWoodAutomator()
+            automator.connect()
+            assert not automator.session.cookies
+
+            assert ShareWoodWorker(queue, automator, name="worker-1").run(idle_exit=0) == 1
+
+        assert queue.stats()["done"] == 1
+        assert automator.index.get(f"{standin_server.url}/torrents/ubuntu-22-04.1").hash
+        queue.close()
+
+    def test_long_job_relogin(self, tmp_path):
+        """Test a search outliving its lease keeps it, and an expired session is logged in again once"""
+
+        def iter_search(search_criteria):
+            # Session expired on the first attempt, then three pages
+            if not automator.reconnect.called:
+                raise ShareWoodAuthenticationError()
+            for page in range(3):
+                time.sleep(0.1)
+                yield ShareWoodTorrent(url=f"https://www.sharewood.tv/torrents/t.{page}")
+
+        automator = MagicMock(metrics=ShareWoodMetrics())
+        automator.pool.size = 1
+        automator.iter_search.side_effect = iter_search
+        queue = ShareWoodJobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.15)
+        queue.put_searches([ShareWoodSearchCriteria(query="Ubuntu")])
+
+        worker = ShareWoodWorker(queue, automator, name="worker-1")
+
+        assert worker.run(idle_exit=0) == 1
+        automator.reconnect.assert_called_once()
+        assert queue.stats()["done"] == 1
+        assert "worker.lost_leases" not in automator.metrics.snapshot()["counters"]
+        queue.close()